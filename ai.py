@@ -1,14 +1,20 @@
-import random
-import time
+import numpy as np
+import rng_streams
 from config import *
+import config
 import utils
 from logger import GameLogger
 from economy import PriceManager
+from sim_clock import SimClock
+from resources import RESOURCE_NAMES
 
 class AIFactory:
-    def __init__(self, factory_id, world):
+    def __init__(self, factory_id, world, clock=None, logger=None):
         self.id = factory_id
         self.world = world
+        self.clock = clock or SimClock()
+        # Each factory decides from its own seeded stream
+        self.random = rng_streams.get_random(f'ai_{factory_id}')
         self.money = INITIAL_MONEY
         self.owned_tiles = []
         self.buildings = []
@@ -18,8 +24,8 @@ class AIFactory:
         # and from other AI factories
         self.color = self.generate_unique_color(factory_id)
         
-        # Use AI difficulty settings from config
-        self.difficulty = AI_DIFFICULTY
+        # Use AI difficulty settings from config (read at creation, so runtime changes apply)
+        self.difficulty = config.AI_DIFFICULTY
         difficulty_settings = AI_DIFFICULTY_LEVELS[self.difficulty]
         
         # Apply difficulty settings
@@ -27,17 +33,17 @@ class AIFactory:
         self.expansion_rate = difficulty_settings['expansion_rate']
         self.survey_probability = difficulty_settings['survey_probability']
         
-        self.last_decision_time = time.time()
-        self.next_decision_delay = random.uniform(
+        self.last_decision_time = self.clock.now
+        self.next_decision_delay = self.random.uniform(
             AI_DECISION_MIN_TIME * self.decision_speed_multiplier, 
             AI_DECISION_MAX_TIME * self.decision_speed_multiplier
         )
         self.development_phase = "initial"  # initial, expanding, or advanced
         self.surveyed_tiles = set()
         self.consecutive_failed_decisions = 0  # Counter for failed decisions
-        # Create our own logger instance
-        self.logger = GameLogger()
-        self.log(f"Initialized AI Factory {self.id} with difficulty: {self.difficulty}")
+        # Log through the shared backend when given one (all factories share the game's logger)
+        self.logger = logger or GameLogger(self.clock)
+        self.log("Initialized AI Factory %s with difficulty: %s - Color: RGB%s", self.id, self.difficulty, self.color)
     
     def generate_unique_color(self, factory_id):
         """Generate a unique color for this AI factory"""
@@ -62,33 +68,31 @@ class AIFactory:
         else:
             # Generate a random color that's not too close to BLUE (player color)
             while True:
-                r = random.randint(50, 255)
-                g = random.randint(50, 255)
-                b = random.randint(50, 255)
+                r = self.random.randint(50, 255)
+                g = self.random.randint(50, 255)
+                b = self.random.randint(50, 255)
                 # Make sure it's not too close to blue (player color)
                 if not (b > 200 and r < 100 and g < 100):
                     # Also check it's not too close to WHITE or BLACK
                     if not (r > 200 and g > 200 and b > 200) and not (r < 50 and g < 50 and b < 50):
                         return (r, g, b)
         
-    def log(self, message):
-        """Helper method to log AI actions"""
-        # Include color in initialization message
-        if message.startswith("Initialized AI Factory"):
-            color_info = f"Color: RGB{self.color}"
-            message = f"{message} - {color_info}"
-        self.logger.log(f'AI-{self.id}', 'INFO', message)
+    def log(self, message, *args):
+        """Helper method to log AI actions (message may be a %-format string of args)"""
+        self.logger.log(f'AI-{self.id}', 'INFO', message, *args)
         
+    def get_deposit_resources(self):
+        """Total amount of each resource stored across this factory's deposits"""
+        totals = self.world.deposit_index.total_resources(f'ai_{self.id}')
+        return {RESOURCE_NAMES[i]: int(totals[i]) for i in np.flatnonzero(totals)}
+    
     def update_owned_tiles(self):
-        """Update the list of owned tiles"""
-        self.owned_tiles = []
-        for pos, tile in self.world.tiles.items():
-            if tile.owner == f'ai_{self.id}':
-                self.owned_tiles.append(tile)
+        """Point owned_tiles at the world's live list of tiles owned by this factory"""
+        self.owned_tiles = self.world.get_owned_tiles(f'ai_{self.id}')
     
     def update(self):
         """Update AI factory state"""
-        current_time = time.time()
+        current_time = self.clock.now
         
         # Only make decisions after delay has passed
         if current_time - self.last_decision_time < self.next_decision_delay:
@@ -96,7 +100,7 @@ class AIFactory:
             
         # Reset decision timer and set new delay using difficulty-specific decision speed
         self.last_decision_time = current_time
-        self.next_decision_delay = random.uniform(
+        self.next_decision_delay = self.random.uniform(
             AI_DECISION_MIN_TIME * self.decision_speed_multiplier, 
             AI_DECISION_MAX_TIME * self.decision_speed_multiplier
         )
@@ -105,7 +109,7 @@ class AIFactory:
         prev_phase = self.development_phase
         self._update_development_phase()
         if prev_phase != self.development_phase:
-            self.log(f"Phase changed: {prev_phase} -> {self.development_phase}")
+            self.log("Phase changed: %s -> %s", prev_phase, self.development_phase)
         
         # Manage processing buildings
         self._manage_processing_buildings()
@@ -121,7 +125,7 @@ class AIFactory:
             # Increment counter if no decision was made
             self.consecutive_failed_decisions += 1
             if self.consecutive_failed_decisions >= 3:
-                self.log(f"STUCK: Failed to make decisions {self.consecutive_failed_decisions} times in a row")
+                self.log("STUCK: Failed to make decisions %s times in a row", self.consecutive_failed_decisions)
                 self._log_stuck_reason()
                 
     def _log_stuck_reason(self):
@@ -131,8 +135,8 @@ class AIFactory:
         collection_buildings = sum(1 for tile in self.owned_tiles if tile.building == 'COLLECTION')
         deposit_buildings = sum(1 for tile in self.owned_tiles if tile.building == 'DEPOSIT')
         
-        self.log(f"Status: Money=${self.money}, Tiles={len(self.owned_tiles)}, Empty={empty_tiles}, " +
-                 f"Resources={resource_tiles}, Collections={collection_buildings}, Deposits={deposit_buildings}")
+        self.log("Status: Money=$%s, Tiles=%d, Empty=%d, Resources=%d, Collections=%d, Deposits=%d",
+                 self.money, len(self.owned_tiles), empty_tiles, resource_tiles, collection_buildings, deposit_buildings)
         
         if self.money < min(b['cost'] for b in BUILDINGS.values() if b['cost'] > 0) and self.money < TILE_BASE_COST:
             self.log("STUCK: Not enough money to buy tiles or build")
@@ -170,7 +174,7 @@ class AIFactory:
         Returns True if a decision was made, False otherwise"""
         # Check if we should buy from player commerce stations
         if self._make_commerce_purchase_decisions():
-            self.log(f"Decision: Purchased resources from player commerce station")
+            self.log("Decision: Purchased resources from player commerce station")
             return True
             
         # Try to sell resources first
@@ -178,13 +182,13 @@ class AIFactory:
             return True
             
         # First check if we should survey a tile - use difficulty-specific survey probability
-        if random.random() < self.survey_probability:
+        if self.random.random() < self.survey_probability:
             if self.try_survey_tile():
-                self.log(f"Decision: Survey tile")
+                self.log("Decision: Survey tile")
                 return True
         
         # Then decide between buying a tile or building
-        if random.random() < AI_BUILD_TILE_PROBABILITY:
+        if self.random.random() < AI_BUILD_TILE_PROBABILITY:
             if self.try_buy_tile():
                 return True
             
@@ -198,7 +202,7 @@ class AIFactory:
             
         # If everything else fails, try surveying
         if self.try_survey_tile():
-            self.log(f"Decision: Survey tile (fallback)")
+            self.log("Decision: Survey tile (fallback)")
             return True
             
         # If we reach here, no decision was made
@@ -230,11 +234,11 @@ class AIFactory:
                     
                     # Sell the resources
                     amount_to_sell = amount  # Sell all available resources
-                    resources[resource_type] -= amount_to_sell
+                    tile.building_instance.remove_resource(resource_type, amount_to_sell)
                     earned = amount_to_sell * price
                     self.money += earned
                     
-                    self.log(f"Decision: Sold {amount_to_sell} units of {resource_type} for ${earned}")
+                    self.log("Decision: Sold %s units of %s for $%s", amount_to_sell, resource_type, earned)
                     return True
                     
         return False
@@ -246,32 +250,28 @@ class AIFactory:
         if self.money < min_tile_cost_threshold:
             return False
             
-        # Find adjacent tiles that can be bought
+        # Find adjacent tiles that can be bought (the world tracks our frontier)
         potential_tiles = []
-        for tile in self.owned_tiles:
-            for adj_x, adj_y in utils.get_adjacent_coords(tile.x, tile.y):
-                if (adj_x, adj_y) in self.world.tiles:
-                    adj_tile = self.world.tiles[(adj_x, adj_y)]
-                    if adj_tile.owner is None:
-                        # Prioritize surveyed tiles with resources
-                        if (adj_x, adj_y) in self.surveyed_tiles and adj_tile.resource_type != 'EMPTY':
-                            potential_tiles.insert(0, adj_tile)  # Add to front of list (prioritize)
-                        else:
-                            potential_tiles.append(adj_tile)
+        for pos in sorted(self.world.get_frontier(f'ai_{self.id}')):
+            adj_tile = self.world.tiles[pos]
+            # Prioritize surveyed tiles with resources
+            if pos in self.surveyed_tiles and adj_tile.resource_type != 'EMPTY':
+                potential_tiles.insert(0, adj_tile)  # Add to front of list (prioritize)
+            else:
+                potential_tiles.append(adj_tile)
         
         # Adjust for expansion rate - use the difficulty-specific expansion rate
-        if random.random() > self.expansion_rate and self.development_phase != "initial":
+        if self.random.random() > self.expansion_rate and self.development_phase != "initial":
             return False
         
         if potential_tiles:
-            tile = potential_tiles[0] if len(potential_tiles) > 0 and potential_tiles[0].resource_type != 'EMPTY' else random.choice(potential_tiles)
+            tile = potential_tiles[0] if len(potential_tiles) > 0 and potential_tiles[0].resource_type != 'EMPTY' else self.random.choice(potential_tiles)
             cost = tile.get_tile_cost()
             if self.money >= cost:
                 self.money -= cost
-                tile.owner = f'ai_{self.id}'
+                tile.owner = f'ai_{self.id}'  # Also adds it to owned_tiles via the world's index
                 tile.surveyed = True  # Auto-survey when buying a tile
-                self.owned_tiles.append(tile)
-                self.log(f"Decision: Buy tile at ({tile.x}, {tile.y}) for ${cost}")
+                self.log("Decision: Buy tile at (%s, %s) for $%s", tile.x, tile.y, cost)
                 return True
         
         return False
@@ -304,7 +304,7 @@ class AIFactory:
                         # Use set_building method to properly initialize the building instance
                         tile.set_building('DEPOSIT')
                         self.money -= BUILDINGS['DEPOSIT']['cost']
-                        self.log(f"Decision: Build DEPOSIT (high priority) at ({tile.x}, {tile.y})")
+                        self.log("Decision: Build DEPOSIT (high priority) at (%s, %s)", tile.x, tile.y)
                         return True
         
         # First, build collection on resource tiles
@@ -314,7 +314,7 @@ class AIFactory:
                     # Use set_building method to properly initialize the building instance
                     tile.set_building('COLLECTION')
                     self.money -= BUILDINGS['COLLECTION']['cost']
-                    self.log(f"Decision: Build COLLECTION at ({tile.x}, {tile.y})")
+                    self.log("Decision: Build COLLECTION at (%s, %s)", tile.x, tile.y)
                     return True
         
         # Then build a deposit (if we have space and we're at the original logic)
@@ -325,7 +325,7 @@ class AIFactory:
                         # Use set_building method to properly initialize the building instance
                         tile.set_building('DEPOSIT')
                         self.money -= BUILDINGS['DEPOSIT']['cost']
-                        self.log(f"Decision: Build DEPOSIT at ({tile.x}, {tile.y})")
+                        self.log("Decision: Build DEPOSIT at (%s, %s)", tile.x, tile.y)
                         return True
         return False
     
@@ -342,7 +342,7 @@ class AIFactory:
                         # Use set_building method to properly initialize the building instance
                         tile.set_building('DEPOSIT')
                         self.money -= BUILDINGS['DEPOSIT']['cost']
-                        self.log(f"Decision: Build DEPOSIT (critical) at ({tile.x}, {tile.y})")
+                        self.log("Decision: Build DEPOSIT (critical) at (%s, %s)", tile.x, tile.y)
                         return True
         
         # If we have more collections than deposits, prioritize deposits
@@ -354,7 +354,7 @@ class AIFactory:
                         # Use set_building method to properly initialize the building instance
                         tile.set_building('DEPOSIT')
                         self.money -= BUILDINGS['DEPOSIT']['cost']
-                        self.log(f"Decision: Build DEPOSIT at ({tile.x}, {tile.y})")
+                        self.log("Decision: Build DEPOSIT at (%s, %s)", tile.x, tile.y)
                         return True
                         
             # If we can't find a tile near collection but still need deposits, build one anywhere
@@ -365,7 +365,7 @@ class AIFactory:
                             # Use set_building method to properly initialize the building instance
                             tile.set_building('DEPOSIT')
                             self.money -= BUILDINGS['DEPOSIT']['cost']
-                            self.log(f"Decision: Build DEPOSIT (fallback) at ({tile.x}, {tile.y})")
+                            self.log("Decision: Build DEPOSIT (fallback) at (%s, %s)", tile.x, tile.y)
                             return True
         
         # Otherwise prioritize collection on resources
@@ -375,7 +375,7 @@ class AIFactory:
                     # Use set_building method to properly initialize the building instance
                     tile.set_building('COLLECTION')
                     self.money -= BUILDINGS['COLLECTION']['cost']
-                    self.log(f"Decision: Build COLLECTION at ({tile.x}, {tile.y})")
+                    self.log("Decision: Build COLLECTION at (%s, %s)", tile.x, tile.y)
                     return True
                     
         # If we have enough money, consider a processing building
@@ -385,7 +385,7 @@ class AIFactory:
                     # Use set_building method to properly initialize the building instance
                     tile.set_building('PROCESSING')
                     self.money -= BUILDINGS['PROCESSING']['cost']
-                    self.log(f"Decision: Build PROCESSING at ({tile.x}, {tile.y})")
+                    self.log("Decision: Build PROCESSING at (%s, %s)", tile.x, tile.y)
                     return True
                     
         return False
@@ -399,7 +399,7 @@ class AIFactory:
                     # Use set_building method to properly initialize the building instance
                     tile.set_building('COMMERCE')
                     self.money -= BUILDINGS['COMMERCE']['cost']
-                    self.log(f"Decision: Build COMMERCE at ({tile.x}, {tile.y})")
+                    self.log("Decision: Build COMMERCE at (%s, %s)", tile.x, tile.y)
                     return True
         
         # Then check for processing buildings
@@ -409,7 +409,7 @@ class AIFactory:
                     # Use set_building method to properly initialize the building instance
                     tile.set_building('PROCESSING')
                     self.money -= BUILDINGS['PROCESSING']['cost']
-                    self.log(f"Decision: Build PROCESSING at ({tile.x}, {tile.y})")
+                    self.log("Decision: Build PROCESSING at (%s, %s)", tile.x, tile.y)
                     return True
         
         # Then fallback to basic building strategies
@@ -423,16 +423,11 @@ class AIFactory:
             return False
             
         # Find adjacent tiles that can be surveyed
-        potential_tiles = []
-        for tile in self.owned_tiles:
-            for adj_x, adj_y in utils.get_adjacent_coords(tile.x, tile.y):
-                if (adj_x, adj_y) in self.world.tiles:
-                    adj_tile = self.world.tiles[(adj_x, adj_y)]
-                    if adj_tile.owner is None and (adj_x, adj_y) not in self.surveyed_tiles:
-                        potential_tiles.append((adj_x, adj_y))
+        potential_tiles = [pos for pos in sorted(self.world.get_frontier(f'ai_{self.id}'))
+                           if pos not in self.surveyed_tiles]
         
         if potential_tiles:
-            pos = random.choice(potential_tiles)
+            pos = self.random.choice(potential_tiles)
             self.money -= PriceManager.instance.get_survey_cost()
             self.surveyed_tiles.add(pos)  # Track surveyed tiles
             
@@ -441,9 +436,9 @@ class AIFactory:
             tile.surveyed = True
             
             # Log with current cost
-            self.log(f"Decision: Survey tile at ({tile.x}, {tile.y}) for ${PriceManager.instance.get_survey_cost()}")
+            self.log("Decision: Survey tile at (%s, %s) for $%s", tile.x, tile.y, PriceManager.instance.get_survey_cost())
             
-            self.log(f"Decision: Survey tile at {pos}")
+            self.log("Decision: Survey tile at %s", pos)
             return True
         
         return False
@@ -474,15 +469,7 @@ class AIFactory:
             return
         
         # Check available resources in deposits
-        deposit_resources = {}
-        for tile in self.owned_tiles:
-            if (tile.building == 'DEPOSIT' and 
-                hasattr(tile, 'building_instance') and 
-                tile.building_instance):
-                for resource, amount in tile.building_instance.resources.items():
-                    if resource not in deposit_resources:
-                        deposit_resources[resource] = 0
-                    deposit_resources[resource] += amount
+        deposit_resources = self.get_deposit_resources()
         
         # Process each building
         for tile in processing_buildings:
@@ -530,17 +517,19 @@ class AIFactory:
             # Set the recipe
             if best_recipe:
                 tile.building_instance.selected_recipe = best_recipe
-                self.log(f"Decision: Set processing building at ({tile.x}, {tile.y}) to recipe {best_recipe}")
+                self.log("Decision: Set processing building at (%s, %s) to recipe %s", tile.x, tile.y, best_recipe)
                 
                 # Make sure the building is active after setting a recipe
                 tile.building_instance.is_inactive = False
-                self.log(f"Decision: Activated processing building at ({tile.x}, {tile.y})")
+                tile.building_instance.wake()
+                self.log("Decision: Activated processing building at (%s, %s)", tile.x, tile.y)
             else:
-                self.log(f"Decision: No suitable recipe found for processing building at ({tile.x}, {tile.y})")
+                self.log("Decision: No suitable recipe found for processing building at (%s, %s)", tile.x, tile.y)
                 
                 # Set to inactive if no recipe is found
                 tile.building_instance.is_inactive = True
-                self.log(f"Decision: Deactivated processing building at ({tile.x}, {tile.y}) due to no suitable recipe")
+                tile.building_instance.wake()
+                self.log("Decision: Deactivated processing building at (%s, %s) due to no suitable recipe", tile.x, tile.y)
                 
     def _manage_commerce_buildings(self):
         """Configure and manage commerce buildings"""
@@ -559,15 +548,7 @@ class AIFactory:
             return
         
         # Check available resources in deposits for potential trade
-        deposit_resources = {}
-        for tile in self.owned_tiles:
-            if (tile.building == 'DEPOSIT' and 
-                hasattr(tile, 'building_instance') and 
-                tile.building_instance):
-                for resource, amount in tile.building_instance.resources.items():
-                    if resource not in deposit_resources:
-                        deposit_resources[resource] = 0
-                    deposit_resources[resource] += amount
+        deposit_resources = self.get_deposit_resources()
         
         # Process each commerce building
         for tile in commerce_buildings:
@@ -607,9 +588,9 @@ class AIFactory:
                     # Set price slightly higher than market for valuable resources,
                     # slightly lower for common resources to attract buyers
                     if market_price > 50:
-                        best_price = market_price * (1.0 + random.uniform(0.05, 0.2))  # 5-20% higher
+                        best_price = market_price * (1.0 + self.random.uniform(0.05, 0.2))  # 5-20% higher
                     else:
-                        best_price = market_price * (1.0 - random.uniform(0.05, 0.1))  # 5-10% lower
+                        best_price = market_price * (1.0 - self.random.uniform(0.05, 0.1))  # 5-10% lower
             
             # If we found a good resource to sell, set up commerce
             if best_resource and best_amount > 0:
@@ -628,7 +609,7 @@ class AIFactory:
                         take_amount = min(available, remaining_amount)
                         
                         if take_amount > 0:
-                            deposit.resources[best_resource] -= take_amount
+                            deposit.remove_resource(best_resource, take_amount)
                             remaining_amount -= take_amount
                 
                 # Set up the commerce trade
@@ -638,15 +619,15 @@ class AIFactory:
                     tile.building_instance.commerce_amount = actual_amount
                     tile.building_instance.commerce_price = round(best_price, 2)
                     
-                    self.log(f"Commerce: Set up trade for {actual_amount} {best_resource} at ${tile.building_instance.commerce_price} each")
+                    self.log("Commerce: Set up trade for %s %s at $%s each", actual_amount, best_resource, tile.building_instance.commerce_price)
                     
             # If no good resource found, log the issue
             else:
-                self.log(f"Commerce: No suitable resources to sell in commerce building at ({tile.x}, {tile.y})")
+                self.log("Commerce: No suitable resources to sell in commerce building at (%s, %s)", tile.x, tile.y)
                 
     def _make_commerce_purchase_decisions(self):
         """Check for player commerce stations and decide if we should buy anything"""
-        from game import Game
+        from simulation import Simulation
         
         # Check if we have enough money to consider purchases
         if self.money < 100:  # Arbitrary minimum to consider buying
@@ -654,11 +635,8 @@ class AIFactory:
             
         # Find all player commerce stations
         player_commerce = []
-        for pos, tile in self.world.tiles.items():
-            if (tile.owner == 'player' and 
-                tile.building == 'COMMERCE' and
-                hasattr(tile, 'building_instance') and 
-                tile.building_instance and
+        for tile in self.world.get_building_tiles('player', 'COMMERCE'):
+            if (tile.building_instance and
                 tile.building_instance.commerce_resource and
                 tile.building_instance.commerce_amount > 0):
                 player_commerce.append(tile)
@@ -667,8 +645,8 @@ class AIFactory:
             return False
             
         # Pick a random commerce station to evaluate
-        if random.random() < 0.3:  # Only check occasionally
-            tile = random.choice(player_commerce)
+        if self.random.random() < 0.3:  # Only check occasionally
+            tile = self.random.choice(player_commerce)
             building = tile.building_instance
             
             # Use the AI decides to buy method to evaluate the offer
@@ -684,14 +662,14 @@ class AIFactory:
                     self.money -= total_cost
                     
                     # Add money to player
-                    Game.instance.player.money += total_cost
+                    Simulation.instance.player.money += total_cost
                     
                     # Add resource to AI's deposits
                     if building.commerce_resource not in self.deposit_resources:
                         self.deposit_resources[building.commerce_resource] = 0
                     self.deposit_resources[building.commerce_resource] += amount_to_buy
                     
-                    self.log(f"Decision: Bought {amount_to_buy} units of {building.commerce_resource} from player for ${total_cost}")
+                    self.log("Decision: Bought %s units of %s from player for $%s", amount_to_buy, building.commerce_resource, total_cost)
                     return True
                     
         return False
\ No newline at end of file
@@ -0,0 +1,197 @@
+"""Performance benchmarks for the simulation core
+
+Usage:
+    python benchmark.py memory [--width 200] [--height 200] [--buildings 2000]
+    python benchmark.py worldgen [--sizes 250 500 1000 2000] [--repeat 3]
+    python benchmark.py startup [--repeat 5]
+    python benchmark.py frames [--frames 600]
+"""
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import config
+
+
+def measure(func):
+    """Run func and return (result, bytes still allocated by it)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def object_size(obj):
+    """Shallow size of an object including its instance __dict__, if it has one"""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def bench_memory(args):
+    """Report bytes per tile and per building on a large world"""
+    config.WORLD_SIZE = {'width': args.width, 'height': args.height}
+    from world import World, Tile
+
+    world, world_bytes = measure(World)
+    num_tiles = world.width * world.height
+    tile = world.tiles[(0, 0)]
+    print(f"World {world.width}x{world.height} ({num_tiles} tiles)")
+    print(f"  world storage:      {world_bytes / num_tiles:8.1f} bytes/tile")
+    print(f"  Tile object:        {object_size(tile):8d} bytes")
+
+    # Materialise a Tile for every cell, as whole-map scans do
+    _, views_bytes = measure(lambda: [Tile(world, x, y) for x in range(world.width) for y in range(world.height)])
+    print(f"  all Tile objects:   {views_bytes / num_tiles:8.1f} bytes/tile")
+
+    # Buildings of each type on distinct tiles
+    positions = [(x, y) for x in range(world.width) for y in range(world.height)]
+    for x, y in positions[:args.buildings * 4]:
+        world.tiles[(x, y)].owner = 'player'
+    for i, building_type in enumerate(['COLLECTION', 'DEPOSIT', 'PROCESSING', 'COMMERCE']):
+        batch = positions[i * args.buildings:(i + 1) * args.buildings]
+
+        def build():
+            for pos in batch:
+                world.tiles[pos].set_building(building_type)
+
+        _, building_bytes = measure(build)
+        instance = world.tiles[batch[0]].building_instance
+        print(f"  {building_type:<11} object: {object_size(instance):8d} bytes, "
+              f"{building_bytes / len(batch):8.1f} bytes/building allocated")
+
+
+def best_time(func, repeat):
+    """Fastest of `repeat` runs of func, in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_worldgen(args):
+    """Report world generation time against world size"""
+    from world import World
+
+    print(f"{'size':>11} {'tiles':>10} {'world':>9} {'prices':>9} {'propagate':>10} {'per tile':>10}")
+    for size in args.sizes:
+        config.WORLD_SIZE = {'width': size, 'height': size}
+        num_tiles = size * size
+        world_time = best_time(World, args.repeat)
+
+        # Generation phases, rerun on one world
+        world = World()
+        prices_time = best_time(world.initialize_tile_prices, args.repeat)
+        propagate_time = best_time(world.propagate_tile_prices, args.repeat)
+        print(f"{size:>5}x{size:<5} {num_tiles:>10} {world_time:8.3f}s {prices_time:8.3f}s "
+              f"{propagate_time:9.3f}s {world_time / num_tiles * 1e9:8.1f}ns")
+
+
+# Run in a fresh interpreter: what `python main.py` does up to the first configuration screen frame
+STARTUP_PROBE = """
+import sys
+import pygame
+import main
+from config import SCREEN_WIDTH, SCREEN_HEIGHT
+pygame.init()
+screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+main.ConfigurationScreen(screen).draw()
+print('matplotlib' in sys.modules)
+"""
+
+
+def bench_startup(args):
+    """Report time from launching the game to the first configuration screen frame"""
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    root = os.path.dirname(os.path.abspath(__file__))
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', STARTUP_PROBE], cwd=root, env=env,
+                                capture_output=True, text=True, check=True)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    print(f"Startup to first configuration frame ({args.repeat} runs): "
+          f"best {times[0]:.3f}s, median {times[len(times) // 2]:.3f}s")
+    print(f"  matplotlib imported at startup: {result.stdout.strip().splitlines()[-1]}")
+
+
+def bench_frames(args):
+    """Report rendered frame time and how often text comes from the text cache"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import contextlib
+    import io
+    import pygame
+    import utils
+    from game import Game
+
+    pygame.init()
+    pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    cwd = os.getcwd()
+    # The game writes a session directory; keep it out of the working tree
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        os.chdir(directory)
+        try:
+            game = Game()
+            game.draw()  # First frame fills the caches
+            utils.text_cache.hits = utils.text_cache.misses = 0
+            start = time.perf_counter()
+            for _ in range(args.frames):
+                game.update(1 / 60)
+                game.draw()
+            elapsed = time.perf_counter() - start
+            game.session_saver.close()
+        finally:
+            os.chdir(cwd)
+
+    cache = utils.text_cache
+    lookups = cache.hits + cache.misses
+    print(f"{args.frames} frames: {elapsed / args.frames * 1000:.2f}ms/frame")
+    print(f"  text cache: {cache.hits} hits, {cache.misses} misses "
+          f"({cache.hits / max(1, lookups):.1%} hit rate), {len(cache.surfaces)} surfaces cached")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Factory Management Game benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    memory = subparsers.add_parser('memory', help="bytes per tile and per building")
+    memory.add_argument('--width', type=int, default=200)
+    memory.add_argument('--height', type=int, default=200)
+    memory.add_argument('--buildings', type=int, default=2000, help="buildings of each type to create")
+    memory.set_defaults(func=bench_memory)
+
+    worldgen = subparsers.add_parser('worldgen', help="world generation time versus world size")
+    worldgen.add_argument('--sizes', type=int, nargs='+', default=[250, 500, 1000, 2000],
+                          help="world side lengths in tiles")
+    worldgen.add_argument('--repeat', type=int, default=3, help="runs per measurement (best is reported)")
+    worldgen.set_defaults(func=bench_worldgen)
+
+    startup = subparsers.add_parser('startup', help="time from launch to the first configuration screen frame")
+    startup.add_argument('--repeat', type=int, default=5)
+    startup.set_defaults(func=bench_startup)
+
+    frames = subparsers.add_parser('frames', help="rendered frame time and text cache hit rate")
+    frames.add_argument('--frames', type=int, default=600)
+    frames.set_defaults(func=bench_frames)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -19,6 +19,8 @@ TILE_SIZE = 50
 GRID_WIDTH = 30
 GRID_HEIGHT = 20
 UI_PANEL_WIDTH = 300
+WORLD_CHUNK_SIZE = 16  # tiles per side of a cached world render chunk
+TEXT_CACHE_SIZE = 512  # rendered text surfaces kept in the LRU text cache
 
 # World settings
 WORLD_SIZE_SMALL = {'width': 30, 'height': 20}
@@ -132,6 +134,7 @@ WIN_CONDITION = 10000
 SURVEY_BASE_COST = 50
 TILE_BASE_COST = 100
 TILE_COST_MULTIPLIER = 0.8
+PRICE_PROPAGATION_BAND = 64  # Rows of tiles per band when propagating tile prices at world generation
 
 # Dynamic pricing configuration
 PRICE_UPDATE_INTERVAL = 60  # Seconds between price adjustments (more frequent updates)
@@ -153,6 +156,7 @@ COLLECTION_DURATION = 5  # seconds between resource collection
 TRANSPORT_DURATION_PER_UNIT_OF_DISTANCE = 0.5  # seconds per tile distance
 DEPOSIT_SIZE = 100  # maximum resources per deposit
 MAX_RESOURCE_TYPES_PER_DEPOSIT = 3  # maximum different types of resources in a deposit
+DEPOSIT_INDEX_CELL_SIZE = 8  # tiles per grid cell in the deposit routing index
 AUTOSELL_DURATION = 10  # seconds between auto-selling
 
 # AI settings
@@ -176,9 +180,28 @@ MARKET_UPDATE_INTERVAL = 10  # Seconds between market price updates
 MARKET_PRICE_ADJUSTMENT_FACTOR = 0.05  # Maximum percentage change in price per update
 MARKET_MAX_PRICE_MULTIPLIER = 2.5  # Maximum multiplier from base price
 MARKET_MIN_PRICE_MULTIPLIER = 0.4  # Minimum multiplier from base price (lower for more volatility)
+MARKET_SHOCK_PROBABILITY = 0.01  # Chance of a market shock on each market update
+MARKET_HISTORY_CHUNK_SIZE = 256  # Market history samples buffered before they are written to disk
+
+# Random number settings
+MASTER_SEED = None  # Seed for every subsystem's random stream (None for a new random seed per game)
+
+# Simulation clock settings
+SIM_TIME_SCALE = 1.0  # Simulated seconds per real second
+SIM_MIN_TIME_SCALE = 1.0
+SIM_MAX_TIME_SCALE = 1000.0
+SIM_TIME_SCALE_STEPS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]  # Speeds selectable in game
+SIM_FIXED_STEP = None  # Seconds per simulation step (None for variable steps)
+SIM_MAX_STEP = 0.1  # Longest single simulation step in variable-step mode
+SIM_MAX_STEPS_PER_TICK = 2000  # Cap on simulation steps run per rendered frame
 
 # Debug settings
 DEBUG_LOGGER = False  # Whether to show the in-game log UI
 LOGGER_SHOW_PLAYER = True  # Whether to show player-related logs (PLAYER source)
 LOGGER_SHOW_AI = True      # Whether to show AI-related logs (AI-x source)
 LOGGER_SHOW_BUILDING = True  # Whether to show building-related logs (DEPOSIT, PROCESSING, COLLECTION, COMMERCE sources)
+LOG_LEVEL = 'INFO'  # Minimum severity logged: 'DEBUG', 'INFO', 'WARNING' or 'ERROR'
+LOG_CONSOLE_LEVEL = 'WARNING'  # Minimum severity also printed to the console (None for no console output)
+LOG_RATE_LIMIT_INTERVAL = 10.0  # Simulated seconds between repeats of a log at the same location
+LOG_FLUSH_INTERVAL = 1.0  # Seconds between flushes of the session log files
+LOG_QUEUE_SIZE = 10000  # Log lines waiting for the session log writer before logging blocks
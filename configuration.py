@@ -1,6 +1,7 @@
 import pygame
 import sys
 from config import *
+import utils
 
 class ConfigurationScreen:
     def __init__(self, screen):
@@ -10,9 +11,9 @@ class ConfigurationScreen:
         self.confirmed = False
         
         # Fonts
-        self.font_large = pygame.font.SysFont('Arial', 28)
-        self.font = pygame.font.SysFont('Arial', 18)
-        self.font_small = pygame.font.SysFont('Arial', 14)
+        self.font_large = utils.get_font('Arial', 28)
+        self.font = utils.get_font('Arial', 18)
+        self.font_small = utils.get_font('Arial', 14)
         
         # Button tracking
         self.settings_buttons = {}
@@ -25,8 +26,7 @@ class ConfigurationScreen:
         
     def draw_text(self, surface, text, position, font, color=WHITE):
         """Helper function to draw text"""
-        text_surface = font.render(text, True, color)
-        surface.blit(text_surface, position)
+        utils.draw_text(surface, text, position, font, color)
     
     def run(self):
         """Run the configuration screen"""
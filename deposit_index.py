@@ -0,0 +1,174 @@
+import numpy as np
+from config import DEPOSIT_SIZE, MAX_RESOURCE_TYPES_PER_DEPOSIT, DEPOSIT_INDEX_CELL_SIZE
+from resources import NUM_RESOURCES
+
+# Below this many candidates a plain scan is cheaper than walking grid rings
+LINEAR_SCAN_LIMIT = 16
+
+class OwnerDeposits:
+    """Deposits of a single owner, bucketed on a coarse grid and grouped by what they can do"""
+    def __init__(self):
+        self.cells = {}  # (cell_x, cell_y) -> set of deposit buildings
+        self.with_space = set()  # Total below DEPOSIT_SIZE
+        self.open_slots = set()  # Has space and room for another resource type
+        self.holding = {}  # Resource -> deposits that list it and still have space
+        self.stocked = {}  # Resource -> deposits with at least one unit of it
+        self.flags = {}  # Deposit -> (has_space, has_open_slot, listed resources, stocked resources)
+
+class DepositIndex:
+    """Per-owner spatial index of deposit buildings for routing collectors and processors
+
+    Deposits call `update` whenever their storage changes, so "nearest deposit with
+    space for X" or "nearest deposit holding X" only looks at matching deposits near
+    the query point instead of every tile on the map.
+    """
+    def __init__(self, world_width, world_height, cell_size=DEPOSIT_INDEX_CELL_SIZE):
+        self.cell_size = cell_size
+        # Largest ring ever needed to cover the whole map from any cell
+        self.max_ring = max(world_width, world_height) // cell_size + 1
+        self.owners = {}  # Owner name -> OwnerDeposits
+
+    def _cell(self, x, y):
+        return (x // self.cell_size, y // self.cell_size)
+
+    def add(self, deposit):
+        """Start tracking a newly built deposit"""
+        owner = self.owners.setdefault(deposit.tile.owner, OwnerDeposits())
+        owner.cells.setdefault(self._cell(deposit.tile.x, deposit.tile.y), set()).add(deposit)
+        owner.flags[deposit] = (False, False, (), ())
+        self.update(deposit)
+
+    def remove(self, deposit):
+        """Stop tracking a deposit (demolished or replaced)"""
+        owner = self.owners.get(deposit.tile.owner)
+        if not owner or deposit not in owner.flags:
+            return
+        self._unlink(owner, deposit)
+        del owner.flags[deposit]
+        cell = self._cell(deposit.tile.x, deposit.tile.y)
+        owner.cells[cell].discard(deposit)
+        if not owner.cells[cell]:
+            del owner.cells[cell]
+
+    def update(self, deposit):
+        """Re-file a deposit after its stored resources changed"""
+        owner = self.owners.get(deposit.tile.owner)
+        if not owner or deposit not in owner.flags:
+            return
+        resources = deposit.resources
+        has_space = resources.total < DEPOSIT_SIZE
+        flags = (has_space,
+                 has_space and len(resources) < MAX_RESOURCE_TYPES_PER_DEPOSIT,
+                 tuple(resources.keys()) if has_space else (),
+                 tuple(resources.stocked()))
+        if flags == owner.flags[deposit]:
+            return
+        self._unlink(owner, deposit)
+        owner.flags[deposit] = flags
+        if flags[0]:
+            owner.with_space.add(deposit)
+        if flags[1]:
+            owner.open_slots.add(deposit)
+        for resource in flags[2]:
+            owner.holding.setdefault(resource, set()).add(deposit)
+        for resource in flags[3]:
+            owner.stocked.setdefault(resource, set()).add(deposit)
+
+    def _unlink(self, owner, deposit):
+        """Remove a deposit from every capability set it is currently filed under"""
+        has_space, has_open_slot, listed, stocked = owner.flags[deposit]
+        if has_space:
+            owner.with_space.discard(deposit)
+        if has_open_slot:
+            owner.open_slots.discard(deposit)
+        for resource in listed:
+            owner.holding[resource].discard(deposit)
+        for resource in stocked:
+            owner.stocked[resource].discard(deposit)
+
+    def total_resources(self, owner_name):
+        """Vector (indexed by resource id) of everything stored in the owner's deposits"""
+        owner = self.owners.get(owner_name)
+        if not owner or not owner.flags:
+            return np.zeros(NUM_RESOURCES, dtype=np.int64)
+        return np.sum([deposit.resources.amounts for deposit in owner.flags], axis=0)
+
+    def nearest_with_space(self, owner_name, x, y, resource_type=None, prefer_holding=False):
+        """Nearest deposit that can take more of resource_type (or anything, if None)
+
+        With prefer_holding, a deposit that already lists the resource wins over a
+        closer one that would have to open a new resource slot for it.
+        """
+        owner = self.owners.get(owner_name)
+        if not owner:
+            return None
+        if not resource_type:
+            return self._nearest(owner, x, y, (owner.with_space,))
+        holding = owner.holding.get(resource_type, ())
+        if prefer_holding and holding:
+            return self._nearest(owner, x, y, (holding,))
+        return self._nearest(owner, x, y, (holding, owner.open_slots))
+
+    def nearest_with_resource(self, owner_name, x, y, resource_type, amount=1):
+        """Nearest deposit storing at least `amount` of resource_type"""
+        owner = self.owners.get(owner_name)
+        if not owner:
+            return None
+        stocked = owner.stocked.get(resource_type, ())
+        if amount <= 1:
+            return self._nearest(owner, x, y, (stocked,))
+        return self._nearest(owner, x, y, (stocked,),
+                             lambda deposit: deposit.resources.get(resource_type, 0) >= amount)
+
+    def _nearest(self, owner, x, y, pools, accept=None):
+        """Closest deposit (Manhattan distance, ties broken by position) found in any of the pools"""
+        candidates = sum(len(pool) for pool in pools)
+        if not candidates:
+            return None
+
+        best = None
+        best_key = None
+
+        # Few candidates: check them directly
+        if candidates <= LINEAR_SCAN_LIMIT:
+            for pool in pools:
+                for deposit in pool:
+                    if accept and not accept(deposit):
+                        continue
+                    key = (abs(deposit.tile.x - x) + abs(deposit.tile.y - y), deposit.tile.x, deposit.tile.y)
+                    if best_key is None or key < best_key:
+                        best, best_key = deposit, key
+            return best
+
+        # Many candidates: walk square rings of grid cells outwards from the query point
+        size = self.cell_size
+        cx, cy = self._cell(x, y)
+        for ring in range(self.max_ring + 1):
+            # Every tile in this ring is at least this far away
+            if best_key is not None and (ring - 1) * size + 1 > best_key[0]:
+                break
+            for cell in self._ring_cells(cx, cy, ring):
+                bucket = owner.cells.get(cell)
+                if not bucket:
+                    continue
+                for deposit in bucket:
+                    if not any(deposit in pool for pool in pools):
+                        continue
+                    if accept and not accept(deposit):
+                        continue
+                    key = (abs(deposit.tile.x - x) + abs(deposit.tile.y - y), deposit.tile.x, deposit.tile.y)
+                    if best_key is None or key < best_key:
+                        best, best_key = deposit, key
+        return best
+
+    def _ring_cells(self, cx, cy, ring):
+        """Cells whose Chebyshev distance from (cx, cy) is exactly `ring`"""
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for dx in range(-ring, ring + 1):
+            yield (cx + dx, cy - ring)
+            yield (cx + dx, cy + ring)
+        for dy in range(-ring + 1, ring):
+            yield (cx - ring, cy + dy)
+            yield (cx + ring, cy + dy)
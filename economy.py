@@ -1,13 +1,17 @@
-import random
-import time
+import numpy as np
+import rng_streams
 from config import *
+import config
+from resources import RESOURCE_NAMES, NUM_RESOURCES, ResourceMap
+from sim_clock import SimClock
 
 class PriceManager:
     instance = None  # Class variable for global access
     
-    def __init__(self):
+    def __init__(self, clock=None):
         PriceManager.instance = self  # Set this instance as the global one
-        self.last_update_time = time.time()
+        self.clock = clock or SimClock()
+        self.last_update_time = self.clock.now
         self.time_elapsed = 0
         self.update_count = 0
         
@@ -23,7 +27,7 @@ class PriceManager:
         """Update prices based on game progress and time"""
         self.time_elapsed += dt
         
-        current_time = time.time()
+        current_time = self.clock.now
         if current_time - self.last_update_time < PRICE_UPDATE_INTERVAL:
             return
         
@@ -38,10 +42,10 @@ class PriceManager:
     
     def _calculate_price_adjustments(self):
         """Calculate price adjustments based on game state"""
-        from game import Game
+        from simulation import Simulation
         
         # Get game difficulty scaling
-        difficulty = AI_DIFFICULTY  # From config
+        difficulty = config.AI_DIFFICULTY  # From config
         difficulty_scale = DIFFICULTY_SCALING.get(difficulty, 1.0)
         
         # Base time-based increase (now includes time elapsed in-game)
@@ -53,14 +57,14 @@ class PriceManager:
         base_increase *= difficulty_scale
         
         # Get economic statistics
-        total_economy = Game.instance.stats.total_money_generated
-        num_buildings = Game.instance.stats.num_buildings
-        tiles_owned = Game.instance.stats.tiles_owned
-        tiles_surveyed = Game.instance.stats.tiles_surveyed
+        total_economy = Simulation.instance.stats.total_money_generated
+        num_buildings = Simulation.instance.stats.num_buildings
+        tiles_owned = Simulation.instance.stats.tiles_owned
+        tiles_surveyed = Simulation.instance.stats.tiles_surveyed
         
         # Calculate total AI economy to add to economic pressure
         ai_economy = 0
-        for ai in Game.instance.ai_factories:
+        for ai in Simulation.instance.ai_factories:
             ai_economy += ai.money
             
         total_economy += ai_economy
@@ -88,8 +92,8 @@ class PriceManager:
         self.building_cost_multiplier = max(MIN_PRICE_MULTIPLIER, min(self.building_cost_multiplier, MAX_PRICE_MULTIPLIER))
         
         # Log significant price changes
-        if self.update_count % 5 == 0 and Game.instance.logger:
-            Game.instance.logger.log('ECONOMY', 'PRICES', 
+        if self.update_count % 5 == 0 and Simulation.instance.logger:
+            Simulation.instance.logger.log('ECONOMY', 'PRICES', 
                                    f"Price levels - Survey: {self.survey_cost_multiplier:.2f}x, " +
                                    f"Tiles: {self.tile_cost_multiplier:.2f}x, " +
                                    f"Buildings: {self.building_cost_multiplier:.2f}x")
@@ -117,145 +121,166 @@ class PriceManager:
         """Return the current cost for a building type"""
         return BUILDINGS[building_type]['cost']
 
+def step_markets(prices, base_prices, supply, demand, sell_volume, buy_volume, rng,
+                 adjustment_factor=MARKET_PRICE_ADJUSTMENT_FACTOR,
+                 min_multiplier=MARKET_MIN_PRICE_MULTIPLIER,
+                 max_multiplier=MARKET_MAX_PRICE_MULTIPLIER):
+    """Apply one price update to one or many markets at once, in place
+
+    All arrays have shape (..., num_resources); any leading axes index independent
+    markets, each with its own market-wide volatility and random events.
+    Trading volumes are reset and supply/demand drift randomly afterwards.
+    """
+    market_shape = prices.shape[:-1]
+    
+    # Add a volatile market factor (varies between updates)
+    market_volatility = rng.uniform(0.8, 1.5, market_shape)[..., None]
+    
+    # Occasionally trigger a market-wide fluctuation (10% chance)
+    market_event = rng.random(market_shape) < 0.10
+    global_modifier = np.where(market_event, rng.uniform(0.9, 1.1, market_shape), 1.0)[..., None]
+    
+    # Supply/demand ratio: above 1 pushes prices up, below 1 pushes them down
+    ratio = np.maximum(demand, 1) / np.maximum(supply, 1)
+    adjustment = adjustment_factor * market_volatility
+    supply_demand_change = np.where(ratio > 1,
+                                    np.minimum(adjustment, ratio - 1),
+                                    np.maximum(-adjustment, ratio - 1))
+    
+    # Trading pressure between -1 (all selling) and 1 (all buying)
+    total_volume = sell_volume + buy_volume
+    trading_pressure = np.divide(buy_volume - sell_volume, total_volume,
+                                 out=np.zeros_like(prices), where=total_volume > 0)
+    trading_change = trading_pressure * adjustment
+    
+    # Combined change (average of factors + resource-specific randomness)
+    resource_randomness = rng.uniform(-0.02, 0.02, prices.shape)
+    change = ((supply_demand_change + trading_change) / 2 + resource_randomness) * global_modifier
+    
+    # Apply change but keep within reasonable bounds
+    np.clip(prices * (1 + change),
+            base_prices * min_multiplier,
+            base_prices * max_multiplier,
+            out=prices)
+    
+    # Reset trading activity and randomly drift supply and demand to keep markets dynamic
+    sell_volume.fill(0)
+    buy_volume.fill(0)
+    np.maximum(supply + rng.uniform(-10, 10, prices.shape), 5, out=supply)
+    np.maximum(demand + rng.uniform(-10, 10, prices.shape), 5, out=demand)
+
+def shock_markets(prices, base_prices, shocked, rng,
+                  min_multiplier=MARKET_MIN_PRICE_MULTIPLIER,
+                  max_multiplier=MARKET_MAX_PRICE_MULTIPLIER):
+    """Hit 1-3 random resources of each shocked market with a 10-30% price jump or drop, in place
+
+    `shocked` is a bool array over the leading (market) axes of `prices`.
+    Returns a bool mask of the affected prices.
+    """
+    shape = prices.shape
+    num_affected = rng.integers(1, 4, shape[:-1])[..., None]
+    
+    # Distinct resources per market: those holding the lowest random keys
+    ranks = rng.random(shape).argsort(axis=-1).argsort(axis=-1)
+    affected = (ranks < num_affected) & shocked[..., None]
+    
+    # Positive or negative shock of 10%-30%, kept within the price bounds
+    is_positive = rng.random(shape) > 0.5
+    shock_magnitude = rng.uniform(0.1, 0.3, shape)
+    shocked_prices = np.where(is_positive,
+                              np.minimum(prices * (1 + shock_magnitude), base_prices * max_multiplier),
+                              np.maximum(prices * (1 - shock_magnitude), base_prices * min_multiplier))
+    np.copyto(prices, shocked_prices, where=affected)
+    return affected
+
+class MarketBatch:
+    """State of many independent markets as (num_markets, num_resources) arrays
+
+    Resources are indexed by their id from resources.RESOURCE_IDS. Each market starts
+    from the same randomized conditions as a game Market, and `step` advances all of
+    them with a single vectorized update.
+    """
+    def __init__(self, num_markets=1, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        shape = (num_markets, NUM_RESOURCES)
+        
+        # Raw resources start closer to their base price and with more supply/demand
+        raw = np.arange(NUM_RESOURCES) < len(RESOURCE_TYPES)
+        values = [(RESOURCE_TYPES.get(r) or PROCESSED_RESOURCES[r])['value'] for r in RESOURCE_NAMES]
+        self.base_prices = np.broadcast_to(np.array(values, dtype=float), shape).copy()
+        spread = np.where(raw, 0.1, 0.15)
+        self.prices = self.base_prices * self.rng.uniform(1 - spread, 1 + spread, shape)
+        low = np.where(raw, 5, 2)
+        high = np.where(raw, 150, 75)
+        self.supply = self.rng.integers(low, high + 1, shape).astype(float)
+        self.demand = self.rng.integers(low, high + 1, shape).astype(float)
+        self.sell_volume = np.zeros(shape)
+        self.buy_volume = np.zeros(shape)
+        
+        # Tuning knobs (default to the game's settings)
+        self.adjustment_factor = MARKET_PRICE_ADJUSTMENT_FACTOR
+        self.min_multiplier = MARKET_MIN_PRICE_MULTIPLIER
+        self.max_multiplier = MARKET_MAX_PRICE_MULTIPLIER
+        self.shock_probability = MARKET_SHOCK_PROBABILITY
+    
+    def step(self):
+        """Advance every market by one price update"""
+        step_markets(self.prices, self.base_prices, self.supply, self.demand,
+                     self.sell_volume, self.buy_volume, self.rng,
+                     self.adjustment_factor, self.min_multiplier, self.max_multiplier)
+    
+    def shock(self, shocked=None):
+        """Apply market shocks; by default each market is shocked with shock_probability
+
+        Returns a (num_markets, num_resources) bool mask of the affected prices.
+        """
+        if shocked is None:
+            shocked = self.rng.random(self.prices.shape[0]) < self.shock_probability
+        affected = np.zeros(self.prices.shape, dtype=bool)
+        
+        # Only the shocked markets need random draws
+        rows = np.flatnonzero(shocked)
+        if len(rows):
+            prices = self.prices[rows]
+            affected[rows] = shock_markets(prices, self.base_prices[rows], np.ones(len(rows), dtype=bool),
+                                           self.rng, self.min_multiplier, self.max_multiplier)
+            self.prices[rows] = prices
+        return affected
+
 class Market:
     instance = None  # Class variable for global access
-    def __init__(self):
+    def __init__(self, clock=None):
         Market.instance = self  # Set this instance as the global one
-        self.prices = {}
-        self.supply = {}
-        self.demand = {}
-        self.last_update_time = time.time()
-        self.trading_activity = {}  # Track resource trading activity
+        self.clock = clock or SimClock()
+        self.last_update_time = self.clock.now
         self.time_elapsed = 0  # Track time elapsed since game start for long-term market changes
         self.cycle_count = 0  # Track number of price updates for pattern detection
         self.initialize_market()
         
     def initialize_market(self):
         """Set up initial market conditions"""
-        # Set base prices for resources with some initial randomness
-        for resource, details in RESOURCE_TYPES.items():
-            base_price = details['value']
-            # Start with a slightly randomized price
-            initial_price = base_price * random.uniform(0.9, 1.1)
-            self.prices[resource] = initial_price
-            
-            # More variable supply and demand
-            self.supply[resource] = random.randint(5, 150)
-            self.demand[resource] = random.randint(5, 150)
-            self.trading_activity[resource] = {
-                'sell_volume': 0,
-                'buy_volume': 0,
-                'base_price': base_price,
-                'trend_direction': random.choice([-1, 1]),  # Random initial trend
-                'trend_duration': random.randint(3, 10)  # How long the trend will last
-            }
-            # Start with a slightly randomized price
-            initial_price = base_price * random.uniform(0.9, 1.1)
-            self.prices[resource] = initial_price
-            
-            # More variable supply and demand
-            self.supply[resource] = random.randint(5, 150)
-            self.demand[resource] = random.randint(5, 150)
-            self.trading_activity[resource] = {
-                'sell_volume': 0,
-                'buy_volume': 0,
-                'base_price': base_price
-            }
+        # A batch of one market, drawing from the market's seeded stream
+        self.state = MarketBatch(1, rng_streams.get_generator('market'))
         
-        # Set prices for processed goods with more initial variability
-        for resource, details in PROCESSED_RESOURCES.items():
-            base_price = details['value']
-            # Start with a more randomized price for processed goods
-            initial_price = base_price * random.uniform(0.85, 1.15)
-            self.prices[resource] = initial_price
-            
-            self.supply[resource] = random.randint(2, 75)
-            self.demand[resource] = random.randint(2, 75)
-            self.trading_activity[resource] = {
-                'sell_volume': 0,
-                'buy_volume': 0,
-                'base_price': base_price
-            }
+        # Name-keyed views of the market's rows (reads and writes go to the arrays)
+        self.prices = ResourceMap(self.state.prices[0])
+        self.base_prices = ResourceMap(self.state.base_prices[0])
+        self.supply = ResourceMap(self.state.supply[0])
+        self.demand = ResourceMap(self.state.demand[0])
+        self.sell_volume = ResourceMap(self.state.sell_volume[0])
+        self.buy_volume = ResourceMap(self.state.buy_volume[0])
     
     def update_prices(self):
-        """Update market prices based on supply and demand and trading activity with randomness"""
-        # Check if we should update prices based on the elapsed time
-        current_time = time.time()
+        """Update market prices based on supply and demand and trading activity with randomness
+        Returns True if prices were updated, False if the update interval has not passed yet"""
+        # Check if we should update prices based on the elapsed simulated time
+        current_time = self.clock.now
         if current_time - self.last_update_time < MARKET_UPDATE_INTERVAL:
-            return
+            return False
             
         self.last_update_time = current_time
-        
-        # Add a volatile market factor (varies between updates)
-        market_volatility = random.uniform(0.8, 1.5)
-        
-        # Add random events that might affect all market prices
-        market_event = random.random()
-        global_modifier = 1.0
-        
-        # Occasionally trigger market events (10% chance)
-        if market_event < 0.10:
-            # Random market-wide fluctuation
-            global_modifier = random.uniform(0.9, 1.1)
-        
-        for resource in self.prices:
-            supply = max(1, self.supply.get(resource, 10))
-            demand = max(1, self.demand.get(resource, 10))
-            
-            # Calculate price change based on supply/demand ratio
-            ratio = demand / supply
-            
-            # Get trading activity for this resource
-            trading = self.trading_activity[resource]
-            sell_volume = trading['sell_volume']
-            buy_volume = trading['buy_volume']
-            base_price = trading['base_price']
-            
-            # Add resource-specific randomness
-            resource_randomness = random.uniform(-0.02, 0.02)
-            
-            # Trading activity affects price:
-            # - More selling pressure lowers prices
-            # - More buying pressure raises prices
-            trading_pressure = 0
-            total_volume = sell_volume + buy_volume
-            
-            if total_volume > 0:
-                # Calculate trading pressure between -1 (all selling) and 1 (all buying)
-                trading_pressure = (buy_volume - sell_volume) / total_volume
-                
-            # Combine supply/demand ratio with trading pressure
-            # Apply volatility to adjustment factor
-            adjustment = MARKET_PRICE_ADJUSTMENT_FACTOR * market_volatility
-            
-            if ratio > 1:  # Demand exceeds supply, price goes up
-                supply_demand_change = min(adjustment, ratio - 1)
-            else:  # Supply exceeds demand, price goes down
-                supply_demand_change = max(-adjustment, ratio - 1)
-                
-            # Trading pressure change (scaled by adjustment factor)
-            trading_change = trading_pressure * adjustment
-            
-            # Combined change (average of factors + randomness)
-            change = ((supply_demand_change + trading_change) / 2 + resource_randomness) * global_modifier
-                
-            # Apply change but keep within reasonable bounds
-            self.prices[resource] = max(
-                base_price * MARKET_MIN_PRICE_MULTIPLIER,
-                min(base_price * MARKET_MAX_PRICE_MULTIPLIER, self.prices[resource] * (1 + change))
-            )
-        # Reset trading activity counters after price update and introduce supply/demand changes
-        for resource in self.trading_activity:
-            self.trading_activity[resource]['sell_volume'] = 0
-            self.trading_activity[resource]['buy_volume'] = 0
-            
-            # Randomly adjust supply and demand values to keep market dynamic
-            supply_change = random.uniform(-10, 10)
-            demand_change = random.uniform(-10, 10)
-            
-            # Apply changes but ensure values stay positive
-            self.supply[resource] = max(5, self.supply.get(resource, 10) + supply_change)
-            self.demand[resource] = max(5, self.demand.get(resource, 10) + demand_change)
+        self.state.step()
+        return True
             
     def sell(self, resource, amount):
         """Handle resource selling to the market"""
@@ -263,12 +288,11 @@ class Market:
             return 0
             
         price = self.prices[resource]
-        self.supply[resource] = self.supply.get(resource, 0) + amount
+        self.supply[resource] += amount
         
         # Track selling activity for price adjustment
-        if resource in self.trading_activity:
-            self.trading_activity[resource]['sell_volume'] += amount
-            return price * amount
+        self.sell_volume[resource] += amount
+        return price * amount
         
     def buy(self, resource, amount):
         """Handle resource buying from the market"""
@@ -276,16 +300,15 @@ class Market:
             return 0
             
         price = self.prices[resource]
-        available = self.supply.get(resource, 0)
+        available = self.supply[resource]
         actual_amount = min(amount, available)
         
         if actual_amount > 0:
             self.supply[resource] = available - actual_amount
-            self.demand[resource] = self.demand.get(resource, 0) + actual_amount
+            self.demand[resource] += actual_amount
             
             # Track buying activity for price adjustment
-            if resource in self.trading_activity:
-                self.trading_activity[resource]['buy_volume'] += actual_amount
+            self.buy_volume[resource] += actual_amount
             
         return price * actual_amount, actual_amount
 
@@ -295,34 +318,8 @@ class Market:
 
     def create_market_shock(self):
         """Create a significant market event affecting multiple resources"""
-        # Choose how many resources will be affected (between 1 and 3)
-        num_affected = random.randint(1, 3)
-        
-        # Get a list of resources and randomly choose which ones to affect
-        resources = list(self.prices.keys())
-        affected_resources = random.sample(resources, min(num_affected, len(resources)))
-        
-        for resource in affected_resources:
-            # Determine if it's a positive or negative shock
-            is_positive = random.random() > 0.5
-            
-            # Create a significant price change (10%-30%)
-            shock_magnitude = random.uniform(0.1, 0.3)
-            
-            if is_positive:
-                # Price increase
-                self.prices[resource] = min(
-                    self.prices[resource] * (1 + shock_magnitude),
-                    self.trading_activity[resource]['base_price'] * MARKET_MAX_PRICE_MULTIPLIER
-                )
-            else:
-                # Price decrease
-                self.prices[resource] = max(
-                    self.prices[resource] * (1 - shock_magnitude),
-                    self.trading_activity[resource]['base_price'] * MARKET_MIN_PRICE_MULTIPLIER
-                )
-                
-        return affected_resources
+        affected = self.state.shock(np.ones(1, dtype=bool))[0]
+        return [RESOURCE_NAMES[i] for i in np.flatnonzero(affected)]
 
 class TradeOffer:
     def __init__(self, sender, receiver, offer_resource, offer_amount, request_resource, request_amount):
@@ -1,55 +1,139 @@
-import pygame
 from config import *
-import random
+import rng_streams
+from resources import Inventory
+from logger import DEBUG, WARNING
 
 class Building:
+    """State shared by every building: its tile, stored resources and scheduling info"""
+    __slots__ = ('tile', 'type', 'resources', 'last_error_log_time', 'error_log_cooldown', 'last_update_time')
+    
     def __init__(self, tile, building_type):
         self.tile = tile
         self.type = building_type
-        self.resources = {}
-        self.processing_time = 0
-        self.processing_resource = None
-        self.collection_time = 0
-        self.transport_time = 0
-        self.target_deposit = None
-        self.autosell = {}  # Resource type -> bool dictionary
-        self.last_autosell_time = 0
+        self.resources = Inventory()  # Resource -> amount, backed by a vector indexed by resource id
         # Add error logging cooldown to prevent spam
         self.last_error_log_time = 0
         self.error_log_cooldown = 10.0  # Only log an error once every 10 seconds
+        
+        # Simulated time of the last update (buildings are run by the world's scheduler)
+        self.last_update_time = 0
+    
+    def update(self, dt):
+        """Update building state by dt seconds
+        Returns the delay until the building's next event, or None to sleep until woken"""
+        return None
+    
+    def wake(self):
+        """Run this building on the next simulation step (after its settings change)"""
+        self.tile.world.scheduler.schedule(self, 0)
+    
+    def get_deposit_building(self, target):
+        """Helper method to get the Building object from a target, whether it's a Tile or Building"""
+        if hasattr(target, 'building_instance') and target.building_instance:
+            # Target is a Tile, return its building_instance
+            return target.building_instance
+        # Target is already a Building
+        return target
+    
+    def has_resource_in_deposit(self, deposit, resource_type, amount=1):
+        """Check if a deposit has enough of the specified resource"""
+        if hasattr(deposit, 'resources'):
+            return deposit.resources.get(resource_type, 0) >= amount
+        return False
+    
+    def get_distance_to(self, other_tile):
+        """Calculate Manhattan distance to another tile"""
+        return abs(self.tile.x - other_tile.x) + abs(self.tile.y - other_tile.y)
+    
+    def get_total_resources(self):
+        """Get total amount of resources stored"""
+        return self.resources.total
+    
+    def add_resource(self, resource_type, amount):
+        """Store more of a resource in this building"""
+        self.resources.add(resource_type, amount)
+        self._storage_changed()
+    
+    def remove_resource(self, resource_type, amount):
+        """Take some of a resource out (the type stays listed, even at zero)"""
+        self.resources[resource_type] -= amount
+        self._storage_changed()
+    
+    def clear_resource(self, resource_type):
+        """Remove a resource type entirely, freeing its slot"""
+        if resource_type in self.resources:
+            del self.resources[resource_type]
+            self._storage_changed()
+    
+    def _storage_changed(self):
+        """Keep the world's deposit index in sync and wake buildings waiting on deposits"""
+        if self.type == 'DEPOSIT':
+            self.tile.world.deposit_index.update(self)
+            self.tile.world.wake_deposit_waiters(self.tile.owner)
+    
+    def can_accept_resource(self, resource_type, amount):
+        """Check if deposit can accept more of a resource"""
+        from config import DEPOSIT_SIZE, MAX_RESOURCE_TYPES_PER_DEPOSIT
+        from simulation import Simulation
+        
+        # Check if we have enough space in total
+        current_total = self.get_total_resources()
+        if current_total + amount > DEPOSIT_SIZE:
+            if Simulation.instance:
+                Simulation.instance.logger.log('DEPOSIT', 'CAPACITY', 
+                    "Deposit at (%d, %d) is at capacity: %d/%d, cannot add %d more",
+                    self.tile.x, self.tile.y, current_total, DEPOSIT_SIZE, amount,
+                    level=WARNING, location=(self.tile.x, self.tile.y))
+            return False
+            
+        # Resource is new to this deposit - check if we're at the type limit
+        if resource_type not in self.resources:
+            current_unique_resources = len(self.resources)
+            if current_unique_resources >= MAX_RESOURCE_TYPES_PER_DEPOSIT:
+                if Simulation.instance:
+                    Simulation.instance.logger.log('DEPOSIT', 'LIMIT', 
+                        "Deposit at (%d, %d) reached the limit of %d different resource types",
+                        self.tile.x, self.tile.y, MAX_RESOURCE_TYPES_PER_DEPOSIT,
+                        level=WARNING, location=(self.tile.x, self.tile.y))
+                return False
+        
+        # Either this resource is already in the deposit, or we have space for a new type
+        return True
+    
+    def transfer_resources(self, target_building):
+        """Transfer resources to another building"""
+        for resource, amount in list(self.resources.items()):
+            target_building.add_resource(resource, amount)
+            self.remove_resource(resource, amount)
+
+class CollectionBuilding(Building):
+    """Gathers the resource under its tile and carries it to a deposit"""
+    __slots__ = ('collection_time', 'transport_time', 'target_deposit', 'deposit_find_cooldown', 'deposit_find_interval')
+    
+    def __init__(self, tile, building_type='COLLECTION'):
+        super().__init__(tile, building_type)
+        self.collection_time = 0
+        self.transport_time = 0
+        self.target_deposit = None
         # Add deposit finding cooldown
         self.deposit_find_cooldown = 0
         self.deposit_find_interval = 5.0  # Only search for deposits every 5 seconds when none found
-        
-        # Processing building attributes
-        self.selected_recipe = None
-        self.processing_state = "idle"  # idle, requesting_resources, processing, delivering_output
-        self.resource_requests = {}  # Resource -> amount needed
-        self.processing_progress = 0
-        self.input_transport_time = 0
-        self.output_transport_time = 0
-        self.resource_source = None  # Source deposit for input resources
-        self.output_target = None  # Target deposit for output
-        self.is_inactive = True  # Whether the processing building is inactive (default to inactive)
-        
-        # Commerce building attributes
-        self.commerce_resource = None  # Resource type being traded
-        self.commerce_price = 0  # Price per unit
-        self.commerce_amount = 0  # Amount of resource available for trade
-        self.commerce_last_check_time = 0  # Time since last AI check
-        self.commerce_check_interval = 3.0  # Seconds between AI checks
     
     def update(self, dt):
-        """Update building state"""
-        if self.type == 'COLLECTION':
-            self.update_collection(dt)
-        elif self.type == 'PROCESSING':
-            self.update_processing(dt)
-        elif self.type == 'DEPOSIT':
-            self.update_deposit(dt)
-        elif self.type == 'COMMERCE':
-            self.update_commerce(dt)
-            
+        """Update building state by dt seconds
+        Returns the delay until the building's next event, or None to sleep until woken"""
+        self.update_collection(dt)
+        return self.next_collection_event()
+    
+    def next_collection_event(self):
+        """Delay until the collector's next deposit search, delivery or collection"""
+        from config import DEPOSIT_SIZE
+        if not self.target_deposit or self.get_deposit_building(self.target_deposit).get_total_resources() >= DEPOSIT_SIZE:
+            return max(0, self.deposit_find_cooldown)
+        if self.transport_time > 0:
+            return self.transport_time
+        return max(0, self.collection_time)
+    
     def update_collection(self, dt):
         """Handle resource collection and transport"""
         from config import COLLECTION_DURATION, TRANSPORT_DURATION_PER_UNIT_OF_DISTANCE, DEPOSIT_SIZE
@@ -67,13 +151,14 @@ class Building:
                 self.deposit_find_cooldown = self.deposit_find_interval
                 if not self.target_deposit and ai_id:
                     # Log issue finding deposit
-                    from game import Game
-                    if Game.instance and hasattr(Game.instance, 'ai_factories'):
-                        for ai in Game.instance.ai_factories:
+                    from simulation import Simulation
+                    if Simulation.instance and hasattr(Simulation.instance, 'ai_factories'):
+                        for ai in Simulation.instance.ai_factories:
                             if str(ai.id) == ai_id:
-                                current_time = pygame.time.get_ticks() / 1000.0
+                                current_time = self.tile.world.clock.now
                                 if current_time - self.last_error_log_time >= self.error_log_cooldown:
-                                    ai.logger.log('COLLECTOR', 'ERROR', f"No deposit found for collection at ({self.tile.x}, {self.tile.y})")
+                                    ai.logger.log('COLLECTOR', 'ERROR', "No deposit found for collection at (%d, %d)",
+                                                      self.tile.x, self.tile.y, location=(self.tile.x, self.tile.y))
                                     self.last_error_log_time = current_time
                                 break
             return
@@ -87,13 +172,14 @@ class Building:
                 self.deposit_find_cooldown = self.deposit_find_interval
                 if not self.target_deposit and previous_target and ai_id:
                     # Log issue with deposit being full
-                    from game import Game
-                    if Game.instance and hasattr(Game.instance, 'ai_factories'):
-                        for ai in Game.instance.ai_factories:
+                    from simulation import Simulation
+                    if Simulation.instance and hasattr(Simulation.instance, 'ai_factories'):
+                        for ai in Simulation.instance.ai_factories:
                             if str(ai.id) == ai_id:
-                                current_time = pygame.time.get_ticks() / 1000.0
+                                current_time = self.tile.world.clock.now
                                 if current_time - self.last_error_log_time >= self.error_log_cooldown:
-                                    ai.logger.log('COLLECTOR', 'ERROR', f"Deposit full or unavailable at ({self.tile.x}, {self.tile.y})")
+                                    ai.logger.log('COLLECTOR', 'ERROR', "Deposit full or unavailable at (%d, %d)",
+                                                      self.tile.x, self.tile.y, location=(self.tile.x, self.tile.y))
                                     self.last_error_log_time = current_time
                                 break
             return
@@ -106,15 +192,15 @@ class Building:
                 deposit_building = self.get_deposit_building(self.target_deposit)
                 for resource, amount in list(self.resources.items()):
                     if deposit_building.can_accept_resource(resource, amount):
-                        deposit_building.resources[resource] = deposit_building.resources.get(resource, 0) + amount
+                        deposit_building.add_resource(resource, amount)
                         self.resources[resource] = 0
                         if ai_id:
-                            # Log successful delivery
-                            from game import Game
-                            if Game.instance and hasattr(Game.instance, 'ai_factories'):
-                                for ai in Game.instance.ai_factories:
+                            # Log successful delivery (debug only; skip the AI lookup otherwise)
+                            from simulation import Simulation
+                            if Simulation.instance and hasattr(Simulation.instance, 'ai_factories') and Simulation.instance.logger.is_enabled(DEBUG):
+                                for ai in Simulation.instance.ai_factories:
                                     if str(ai.id) == ai_id:
-                                        ai.logger.log('COLLECTOR', 'TRANSFER', f"Delivered {amount} {resource} to deposit")
+                                        ai.logger.log('COLLECTOR', 'TRANSFER', "Delivered %d %s to deposit", amount, resource, level=DEBUG)
                                         break
         else:
             
@@ -134,30 +220,23 @@ class Building:
                         self.tile.resource_type = 'EMPTY'
                         
                         # Remove the collection building when resource is depleted
-                        self.tile.building = None
-                        self.tile.building_instance = None
+                        self.tile.set_building(None)
                         
-                        # Log resource depletion
-                        from game import Game
-                        if Game.instance:
-                            Game.instance.logger.log('COLLECTOR', 'DEPLETED', f"{resource_type} depleted at ({self.tile.x}, {self.tile.y})")
-                        # If there was an AI owner, notify the AI
-                        if ai_id:
-                            if Game.instance and hasattr(Game.instance, 'ai_factories'):
-                                for ai in Game.instance.ai_factories:
-                                    if str(ai.id) == ai_id:
-                                        ai.logger.log('COLLECTOR', 'DEPLETED', f"{resource_type} depleted at ({self.tile.x}, {self.tile.y})")
-                                        break
+                        # Log resource depletion (AI factories share the game's logger, so once is enough)
+                        from simulation import Simulation
+                        if Simulation.instance:
+                            Simulation.instance.logger.log('COLLECTOR', 'DEPLETED', "%s depleted at (%d, %d)",
+                                                          resource_type, self.tile.x, self.tile.y)
                         return
                     
                     if ai_id:
-                        # Log successful collection
-                        from game import Game
-                        if Game.instance and hasattr(Game.instance, 'ai_factories'):
-                            for ai in Game.instance.ai_factories:
+                        # Log successful collection (debug only; skip the AI lookup otherwise)
+                        from simulation import Simulation
+                        if Simulation.instance and hasattr(Simulation.instance, 'ai_factories') and Simulation.instance.logger.is_enabled(DEBUG):
+                            for ai in Simulation.instance.ai_factories:
                                 if str(ai.id) == ai_id:
-                                    ai.logger.log('COLLECTOR', 'GATHER', 
-                                                 f"Collected 1 {self.tile.resource_type} (Remaining: {self.tile.durability})")
+                                    ai.logger.log('COLLECTOR', 'GATHER', "Collected 1 %s (Remaining: %d)",
+                                                  self.tile.resource_type, self.tile.durability, level=DEBUG)
                                     break
                     
                     # Start transport
@@ -167,12 +246,151 @@ class Building:
                         target_tile = self.target_deposit.tile
                     distance = self.get_distance_to(target_tile)
                     self.transport_time = distance * TRANSPORT_DURATION_PER_UNIT_OF_DISTANCE
-                    
+    
+    def find_closest_deposit(self):
+        """Find the closest deposit building that can accept resources"""
+        # Only consider deposits that already hold this tile's resource type or have a free type slot
+        resource_type = self.tile.resource_type if hasattr(self, 'tile') and hasattr(self.tile, 'resource_type') else None
+        deposit = self.tile.world.deposit_index.nearest_with_space(self.tile.owner, self.tile.x, self.tile.y, resource_type)
+        return deposit.tile if deposit else None
+    
+    def find_best_deposit(self):
+        """Find the best deposit based on the improved logic:
+        1. If resource exists in deposit and not full, send to that deposit
+        2. If resource exists but deposit full, send to nearest deposit with space
+        3. If resource doesn't exist in any deposit, send to closest deposit with free space
+        4. If all deposits are full and/or have filled resource types, don't send the resource
+        """
+        resource_type = self.tile.resource_type if hasattr(self, 'tile') and hasattr(self.tile, 'resource_type') else None
+        
+        # If we don't know what resource type we're looking for, fall back to old method
+        if not resource_type:
+            return self.find_closest_deposit()
+        
+        deposit = self.tile.world.deposit_index.nearest_with_space(self.tile.owner, self.tile.x, self.tile.y,
+                                                                   resource_type, prefer_holding=True)
+        return deposit.tile if deposit else None
+
+class DepositBuilding(Building):
+    """Stores resources and optionally sells them automatically"""
+    __slots__ = ('autosell', 'last_autosell_time')
+    
+    def __init__(self, tile, building_type='DEPOSIT'):
+        super().__init__(tile, building_type)
+        self.autosell = {}  # Resource type -> bool dictionary
+        self.last_autosell_time = 0
+    
+    def update(self, dt):
+        """Update building state by dt seconds
+        Returns the delay until the building's next event, or None to sleep until woken"""
+        self.update_deposit(dt)
+        return self.next_deposit_event()
+    
+    def next_deposit_event(self):
+        """Delay until the next autosell tick, or None if nothing is set to autosell"""
+        if (self.tile.owner and self.tile.owner.startswith('ai_')) or any(self.autosell.values()):
+            return max(0, self.last_autosell_time)
+        return None
+    
+    def update_deposit(self, dt):
+        """Handle deposit autoselling"""
+        from config import AUTOSELL_DURATION
+        
+        self.last_autosell_time -= dt
+        if self.last_autosell_time <= 0:
+            self.last_autosell_time = AUTOSELL_DURATION
+            for resource, should_autosell in self.autosell.items():
+                if should_autosell and resource in self.resources and self.resources[resource] > 0:
+                    # Trigger autosell
+                    amount = self.resources[resource]
+                    if self.tile.owner == 'player':
+                        from simulation import Simulation
+                        price = Simulation.instance.market.prices[resource]
+                        if Simulation.instance.player.sell_resources(self, resource, amount, price):
+                            Simulation.instance.logger.log('DEPOSIT', 'AUTOSELL', "Auto-sold %s %s for $%s",
+                                                          amount, resource, amount * price)
+            
+            # Handle AI-owned deposit autoselling
+            if self.tile.owner and self.tile.owner.startswith('ai_'):
+                ai_id = self.tile.owner.split('_')[1]
+                # Check if there are resources to sell
+                for resource, amount in list(self.resources.items()):
+                    if amount >= 10:  # Only sell if we have at least 10 units
+                        from economy import Market
+                        # Get current market price
+                        price = Market.instance.get_price(resource)
+                        
+                        # Sell the resources
+                        earned = amount * price
+                        self.remove_resource(resource, amount)  # Clear out the resource
+                        
+                        # Find the corresponding AI and add money to it
+                        from simulation import Simulation
+                        if Simulation.instance and hasattr(Simulation.instance, 'ai_factories'):
+                            for ai in Simulation.instance.ai_factories:
+                                if str(ai.id) == ai_id:
+                                    ai.money += earned
+                                    ai.logger.log('DEPOSIT', 'AUTOSELL', "Sold %s units of %s for $%s", amount, resource, earned)
+                                    break
+
+class ProcessingBuilding(Building):
+    """Turns deposit resources into goods following the selected recipe"""
+    __slots__ = ('selected_recipe', 'processing_state', 'resource_requests', 'processing_progress',
+                 'input_transport_time', 'output_transport_time', 'resource_source', 'output_target',
+                 'is_inactive', 'resource_sources', 'input_transport_times', 'processing_time', 'processing_resource')
+    
+    def __init__(self, tile, building_type='PROCESSING'):
+        super().__init__(tile, building_type)
+        self.selected_recipe = None
+        self.processing_state = "idle"  # idle, requesting_resources, processing, delivering_output
+        self.resource_requests = {}  # Resource -> amount needed
+        self.processing_progress = 0
+        self.input_transport_time = 0
+        self.output_transport_time = 0
+        self.resource_source = None  # Source deposit for input resources
+        self.output_target = None  # Target deposit for output
+        self.is_inactive = True  # Whether the processing building is inactive (default to inactive)
+        self.resource_sources = {}  # Input resource -> deposit it is taken from
+        self.input_transport_times = {}  # Input resource -> remaining transport time
+        self.processing_time = 0
+        self.processing_resource = None
+    
+    def update(self, dt):
+        """Update building state by dt seconds
+        Returns the delay until the building's next event, or None to sleep until woken"""
+        was_idle = self.processing_state == "idle"
+        self.update_processing(dt)
+        return self.next_processing_event(was_idle)
+    
+    def next_processing_event(self, was_idle):
+        """Delay until the processor's next state change, or None while it waits"""
+        from config import RECIPES
+        if self.is_inactive:
+            # Inactive processors sleep once reset; set_active/UI toggles wake them
+            return 0 if self.processing_state != "idle" else None
+        recipe = RECIPES.get(self.selected_recipe) if self.selected_recipe else None
+        if not recipe:
+            return None
+        if self.processing_state == "idle":
+            if was_idle:
+                # Could not start: nothing changes until a deposit is built, filled or drained
+                self.tile.world.wait_for_deposits(self)
+                return None
+            # Just finished a cycle, start the next one on the next step
+            return 0
+        if self.processing_state == "requesting_resources":
+            # Also wake if a deposit changes, to re-check the inputs are still there
+            self.tile.world.wait_for_deposits(self)
+            remaining = [t for t in self.input_transport_times.values() if t > 0]
+            return max(remaining) if remaining else 0
+        if self.processing_state == "processing":
+            return max(0, recipe['duration'] - self.processing_progress)
+        return max(0, self.output_transport_time)
+    
     def update_processing(self, dt):
         """Handle processing building functionality"""
         from config import RECIPES, TRANSPORT_DURATION_PER_UNIT_OF_DISTANCE, DEPOSIT_SIZE, MAX_RESOURCE_TYPES_PER_DEPOSIT
-        from game import Game
-        import pygame
+        from simulation import Simulation
         
         # Check if the station just became inactive while in the middle of a process
         # This should void any in-progress recipe
@@ -180,11 +398,12 @@ class Building:
             # If we were in the middle of processing something, reset and void the recipe
             if self.processing_state == "processing":
                 # Log the voided process
-                if Game.instance:
-                    current_time = pygame.time.get_ticks() / 1000.0
+                if Simulation.instance:
+                    current_time = self.tile.world.clock.now
                     if current_time - self.last_error_log_time >= self.error_log_cooldown:
-                        Game.instance.logger.log('PROCESSING', 'VOID', 
-                                              f"Process voided due to deactivation: {self.selected_recipe} at ({self.tile.x}, {self.tile.y})")
+                        Simulation.instance.logger.log('PROCESSING', 'VOID', 
+                                              "Process voided due to deactivation: %s at (%d, %d)",
+                                              self.selected_recipe, self.tile.x, self.tile.y)
                         self.last_error_log_time = current_time
             
             # Reset to idle state and clear all processing data
@@ -229,11 +448,12 @@ class Building:
             # Verify the output target can accept the new resource (this checks both space and resource type limits)
             if not self.output_target or not self.output_target.can_accept_resource(output_resource, output_amount):
                 # Log no suitable output deposit
-                if Game.instance:
-                    current_time = pygame.time.get_ticks() / 1000.0
+                if Simulation.instance:
+                    current_time = self.tile.world.clock.now
                     if current_time - self.last_error_log_time >= self.error_log_cooldown:
-                        Game.instance.logger.log('PROCESSING', 'ERROR', 
-                                              f"No deposit has space for output at ({self.tile.x}, {self.tile.y})")
+                        Simulation.instance.logger.log('PROCESSING', 'ERROR', 
+                                              "No deposit has space for output at (%d, %d)",
+                                              self.tile.x, self.tile.y, location=(self.tile.x, self.tile.y))
                         self.last_error_log_time = current_time
                 return
             
@@ -243,11 +463,13 @@ class Building:
                     deposit = self.find_closest_deposit_with_resources(input_resource, 1)
                     if not deposit:
                         # Log resource shortage for this specific input
-                        if Game.instance:
-                            current_time = pygame.time.get_ticks() / 1000.0
+                        if Simulation.instance:
+                            current_time = self.tile.world.clock.now
                             if current_time - self.last_error_log_time >= self.error_log_cooldown:
-                                Game.instance.logger.log('PROCESSING', 'ERROR', 
-                                                       f"No deposit found with {input_resource} for {self.selected_recipe} at ({self.tile.x}, {self.tile.y})")
+                                Simulation.instance.logger.log('PROCESSING', 'ERROR', 
+                                                       "No deposit found with %s for %s at (%d, %d)",
+                                                       input_resource, self.selected_recipe, self.tile.x, self.tile.y,
+                                                       location=(self.tile.x, self.tile.y))
                                 self.last_error_log_time = current_time
                         return
                     
@@ -266,12 +488,14 @@ class Building:
             self.processing_state = "requesting_resources"
             
             # Log resource request
-            if Game.instance:
+            if Simulation.instance:
                 resource_list = f"{recipe['input1']}"
                 if recipe['input2']:
                     resource_list += f", {recipe['input2']}"
-                Game.instance.logger.log('PROCESSING', 'REQUEST', 
-                                        f"Requesting {resource_list} for {self.selected_recipe} at ({self.tile.x}, {self.tile.y})")
+                Simulation.instance.logger.log('PROCESSING', 'REQUEST', 
+                                        "Requesting %s for %s at (%d, %d)",
+                                        resource_list, self.selected_recipe, self.tile.x, self.tile.y,
+                                        location=(self.tile.x, self.tile.y))
             
         elif self.processing_state == "requesting_resources":
             # Update transport times for each input resource
@@ -295,16 +519,17 @@ class Building:
                 self.resource_sources = {}
                 
                 # Log resource shortage
-                if Game.instance:
-                    Game.instance.logger.log('PROCESSING', 'ERROR', 
-                                          f"Resources no longer available at source deposits for {self.selected_recipe}")
+                if Simulation.instance:
+                    Simulation.instance.logger.log('PROCESSING', 'ERROR', 
+                                          "Resources no longer available at source deposits for %s",
+                                          self.selected_recipe, location=(self.tile.x, self.tile.y))
                 return
                 
             if all_resources_arrived:
                 # When all resources have arrived, take them from deposits and start processing
                 for resource, deposit in self.resource_sources.items():
                     # Take resources from deposits
-                    deposit.resources[resource] -= 1
+                    deposit.remove_resource(resource, 1)
                     self.resources[resource] = self.resources.get(resource, 0) + 1
                 
                 # Start processing
@@ -312,9 +537,9 @@ class Building:
                 self.processing_progress = 0
                 
                 # Log processing start
-                if Game.instance:
-                    Game.instance.logger.log('PROCESSING', 'START', 
-                                          f"Started processing {self.selected_recipe} at ({self.tile.x}, {self.tile.y})")
+                if Simulation.instance:
+                    Simulation.instance.logger.log('PROCESSING', 'START', 
+                                          "Started processing %s at (%d, %d)", self.selected_recipe, self.tile.x, self.tile.y)
             
         elif self.processing_state == "processing":
             # Process the resources
@@ -337,9 +562,10 @@ class Building:
                 self.processing_state = "delivering_output"
                 
                 # Log processing complete
-                if Game.instance:
-                    Game.instance.logger.log('PROCESSING', 'COMPLETE', 
-                                           f"Completed processing {output_amount} {output_resource} at ({self.tile.x}, {self.tile.y})")
+                if Simulation.instance:
+                    Simulation.instance.logger.log('PROCESSING', 'COMPLETE', 
+                                           "Completed processing %d %s at (%d, %d)",
+                                           output_amount, output_resource, self.tile.x, self.tile.y)
             
         elif self.processing_state == "delivering_output":
             # Wait for output to be delivered
@@ -352,13 +578,14 @@ class Building:
                 # Check if target deposit can accept the resource (checks both total capacity and resource type limit)
                 if self.output_target.can_accept_resource(output_resource, output_amount):
                     # Deliver the output
-                    self.output_target.resources[output_resource] = self.output_target.resources.get(output_resource, 0) + output_amount
+                    self.output_target.add_resource(output_resource, output_amount)
                     self.resources[output_resource] = 0
                     
                     # Log delivery
-                    if Game.instance:
-                        Game.instance.logger.log('PROCESSING', 'DELIVERY', 
-                                               f"Delivered {output_amount} {output_resource} to deposit at ({self.output_target.tile.x}, {self.output_target.tile.y})")
+                    if Simulation.instance:
+                        Simulation.instance.logger.log('PROCESSING', 'DELIVERY', 
+                                               "Delivered %d %s to deposit at (%d, %d)", output_amount, output_resource,
+                                               self.output_target.tile.x, self.output_target.tile.y)
                 else:
                     # Target deposit is full or can't accept the resource type, find a new one
                     new_target = self.find_closest_deposit_with_space()
@@ -369,126 +596,29 @@ class Building:
                         self.output_transport_time = distance * TRANSPORT_DURATION_PER_UNIT_OF_DISTANCE
                         
                         # Log rerouting
-                        if Game.instance:
-                            Game.instance.logger.log('PROCESSING', 'REROUTE', 
-                                                  f"Rerouting output delivery to deposit at ({new_target.tile.x}, {new_target.tile.y})")
+                        if Simulation.instance:
+                            Simulation.instance.logger.log('PROCESSING', 'REROUTE', 
+                                                  "Rerouting output delivery to deposit at (%d, %d)", new_target.tile.x, new_target.tile.y)
                         return
                     else:
                         # No available deposit with space, keep output in processor
                         # Log storage
-                        if Game.instance:
-                            Game.instance.logger.log('PROCESSING', 'STORAGE', 
-                                                  f"Storing {output_amount} {output_resource} in processor - no available deposits with space")
+                        if Simulation.instance:
+                            Simulation.instance.logger.log('PROCESSING', 'STORAGE', 
+                                                  "Storing %d %s in processor - no available deposits with space",
+                                                  output_amount, output_resource, location=(self.tile.x, self.tile.y))
                 
                 # Reset to idle state to start a new processing cycle
                 self.processing_state = "idle"
                 self.resource_sources = {}  # Clear resource sources for next cycle
                 self.output_target = None   # Will be re-checked in next cycle
     
-    def get_deposit_building(self, target):
-        """Helper method to get the Building object from a target, whether it's a Tile or Building"""
-        if hasattr(target, 'building_instance') and target.building_instance:
-            # Target is a Tile, return its building_instance
-            return target.building_instance
-        # Target is already a Building
-        return target
-
-    def update_deposit(self, dt):
-        """Handle deposit autoselling"""
-        from config import AUTOSELL_DURATION
-        
-        self.last_autosell_time -= dt
-        if self.last_autosell_time <= 0:
-            self.last_autosell_time = AUTOSELL_DURATION
-            for resource, should_autosell in self.autosell.items():
-                if should_autosell and resource in self.resources and self.resources[resource] > 0:
-                    # Trigger autosell
-                    amount = self.resources[resource]
-                    if self.tile.owner == 'player':
-                        from game import Game
-                        price = Game.instance.market.prices[resource]
-                        if Game.instance.player.sell_resources(self, resource, amount, price):
-                            Game.instance.logger.log('DEPOSIT', 'AUTOSELL', f'Auto-sold {amount} {resource} for ${amount * price}')
-            
-            # Handle AI-owned deposit autoselling
-            if self.tile.owner and self.tile.owner.startswith('ai_'):
-                ai_id = self.tile.owner.split('_')[1]
-                # Check if there are resources to sell
-                for resource, amount in list(self.resources.items()):
-                    if amount >= 10:  # Only sell if we have at least 10 units
-                        from economy import Market
-                        # Get current market price
-                        price = Market.instance.get_price(resource)
-                        
-                        # Sell the resources
-                        earned = amount * price
-                        self.resources[resource] = 0  # Clear out the resource
-                        
-                        # Find the corresponding AI and add money to it
-                        from game import Game
-                        if Game.instance and hasattr(Game.instance, 'ai_factories'):
-                            for ai in Game.instance.ai_factories:
-                                if str(ai.id) == ai_id:
-                                    ai.money += earned
-                                    ai.logger.log('DEPOSIT', 'AUTOSELL', f"Sold {amount} units of {resource} for ${earned}")
-                                    break
-
-    def find_closest_deposit(self):
-        """Find the closest deposit building that can accept resources"""
-        from config import DEPOSIT_SIZE, MAX_RESOURCE_TYPES_PER_DEPOSIT
-        closest = None
-        min_distance = float('inf')
-        
-        # First try to find a deposit that already contains this resource type
-        for pos, tile in self.tile.world.tiles.items():
-            if (tile.owner == self.tile.owner and 
-                tile.building == 'DEPOSIT' and 
-                hasattr(tile, 'building_instance') and 
-                tile.building_instance and
-                tile.building_instance.get_total_resources() < DEPOSIT_SIZE):
-                
-                # Check if this deposit already has the resource type or has space for a new type
-                deposit_can_accept = False
-                resource_type = self.tile.resource_type if hasattr(self, 'tile') and hasattr(self.tile, 'resource_type') else None
-                
-                if resource_type:
-                    # Check if the deposit already has this resource type
-                    if resource_type in tile.building_instance.resources:
-                        deposit_can_accept = True
-                    # Or check if it has room for a new resource type
-                    elif len(tile.building_instance.resources.keys()) < MAX_RESOURCE_TYPES_PER_DEPOSIT:
-                        deposit_can_accept = True
-                else:
-                    # If we don't know the resource type, assume it can accept it
-                    deposit_can_accept = True
-                
-                if deposit_can_accept:
-                    distance = self.get_distance_to(tile)
-                    if distance < min_distance:
-                        min_distance = distance
-                        closest = tile
-        return closest
-    
     def find_closest_deposit_with_resources(self, resource_type, amount=1):
         """Find the closest deposit that contains the required resource"""
-        closest = None
-        min_distance = float('inf')
-        
-        for pos, tile in self.tile.world.tiles.items():
-            if (tile.owner == self.tile.owner and 
-                tile.building == 'DEPOSIT' and
-                tile.building_instance):
-                if self.has_resource_in_deposit(tile.building_instance, resource_type, amount):
-                    distance = self.get_distance_to(tile)
-                    if distance < min_distance:
-                        min_distance = distance
-                        closest = tile.building_instance
-        return closest
+        return self.tile.world.deposit_index.nearest_with_resource(self.tile.owner, self.tile.x, self.tile.y, resource_type, amount)
     
     def find_closest_deposit_with_space(self):
         """Find the closest deposit with available space, using improved logic"""
-        from config import DEPOSIT_SIZE, MAX_RESOURCE_TYPES_PER_DEPOSIT
-        
         # The resource type we're looking to store (for processing buildings)
         output_resource = None
         if self.type == 'PROCESSING' and self.selected_recipe:
@@ -496,105 +626,11 @@ class Building:
             if self.selected_recipe in RECIPES:
                 output_resource = RECIPES[self.selected_recipe]['output']
         
-        # If we don't know what resource type we're looking for, fall back to finding any deposit with space
-        if not output_resource:
-            closest = None
-            min_distance = float('inf')
-            
-            for pos, tile in self.tile.world.tiles.items():
-                if (tile.owner == self.tile.owner and 
-                    tile.building == 'DEPOSIT' and
-                    tile.building_instance and
-                    tile.building_instance.get_total_resources() < DEPOSIT_SIZE):
-                    
-                    distance = self.get_distance_to(tile)
-                    if distance < min_distance:
-                        min_distance = distance
-                        closest = tile.building_instance
-            return closest
-        
-        # Step 1: Find deposits that already have this resource and aren't full
-        deposit_with_resource = None
-        min_distance_with_resource = float('inf')
-        
-        # Step 2: Find deposits that have space for this resource
-        closest_with_space = None
-        min_distance_with_space = float('inf')
-        
-        for pos, tile in self.tile.world.tiles.items():
-            if (tile.owner == self.tile.owner and 
-                tile.building == 'DEPOSIT' and 
-                tile.building_instance):
-                
-                deposit = tile.building_instance
-                distance = self.get_distance_to(tile)
-                total_resources = deposit.get_total_resources()
-                
-                # Check if this deposit has our resource type
-                has_resource = output_resource in deposit.resources
-                
-                # Check if the deposit has space for more resources in total
-                has_total_space = total_resources < DEPOSIT_SIZE
-                
-                # Check if the deposit can accept a new resource type
-                can_accept_new_type = len(deposit.resources.keys()) < MAX_RESOURCE_TYPES_PER_DEPOSIT
-                
-                # Step 1: Deposit has this resource and isn't full
-                if has_resource and has_total_space and distance < min_distance_with_resource:
-                    deposit_with_resource = deposit
-                    min_distance_with_resource = distance
-                
-                # Step 2: Deposit has space for a new resource type
-                if has_total_space and (has_resource or can_accept_new_type) and distance < min_distance_with_space:
-                    closest_with_space = deposit
-                    min_distance_with_space = distance
-        
-        # Prioritize deposit that already has this resource
-        if deposit_with_resource:
-            return deposit_with_resource
-        
-        # Otherwise use closest deposit with space
-        return closest_with_space
+        # Prioritize deposits that already have this resource, otherwise use the closest one with space
+        # (without a known resource type, any deposit with space will do)
+        return self.tile.world.deposit_index.nearest_with_space(self.tile.owner, self.tile.x, self.tile.y,
+                                                                output_resource, prefer_holding=True)
     
-    def has_resource_in_deposit(self, deposit, resource_type, amount=1):
-        """Check if a deposit has enough of the specified resource"""
-        if hasattr(deposit, 'resources'):
-            return deposit.resources.get(resource_type, 0) >= amount
-        return False
-    
-    def get_distance_to(self, other_tile):
-        """Calculate Manhattan distance to another tile"""
-        return abs(self.tile.x - other_tile.x) + abs(self.tile.y - other_tile.y)
-    
-    def get_total_resources(self):
-        """Get total amount of resources stored"""
-        return sum(self.resources.values())
-    
-    def can_accept_resource(self, resource_type, amount):
-        """Check if deposit can accept more of a resource"""
-        from config import DEPOSIT_SIZE, MAX_RESOURCE_TYPES_PER_DEPOSIT
-        from game import Game
-        
-        # Check if we have enough space in total
-        current_total = self.get_total_resources()
-        if current_total + amount > DEPOSIT_SIZE:
-            if Game.instance:
-                Game.instance.logger.log('DEPOSIT', 'CAPACITY', 
-                    f"Deposit at ({self.tile.x}, {self.tile.y}) is at capacity: {current_total}/{DEPOSIT_SIZE}, cannot add {amount} more")
-            return False
-            
-        # Resource is new to this deposit - check if we're at the type limit
-        if resource_type not in self.resources:
-            current_unique_resources = len(self.resources.keys())
-            if current_unique_resources >= MAX_RESOURCE_TYPES_PER_DEPOSIT:
-                if Game.instance:
-                    Game.instance.logger.log('DEPOSIT', 'LIMIT', 
-                        f"Deposit at ({self.tile.x}, {self.tile.y}) reached the limit of {MAX_RESOURCE_TYPES_PER_DEPOSIT} different resource types")
-                return False
-        
-        # Either this resource is already in the deposit, or we have space for a new type
-        return True
-
     def process_resources(self):
         """Process raw resources into refined goods"""
         if self.processing_resource:
@@ -615,17 +651,35 @@ class Building:
                     self.processing_time = details['time']
                     break
 
-    def transfer_resources(self, target_building):
-        """Transfer resources to another building"""
-        for resource, amount in list(self.resources.items()):
-            if resource not in target_building.resources:
-                target_building.resources[resource] = 0
-            target_building.resources[resource] += amount
-            self.resources[resource] = 0
-
+class CommerceBuilding(Building):
+    """Offers a stock of one resource for sale to other factories"""
+    __slots__ = ('commerce_resource', 'commerce_price', 'commerce_amount', 'commerce_last_check_time', 'commerce_check_interval')
+    
+    def __init__(self, tile, building_type='COMMERCE'):
+        super().__init__(tile, building_type)
+        self.commerce_resource = None  # Resource type being traded
+        self.commerce_price = 0  # Price per unit
+        self.commerce_amount = 0  # Amount of resource available for trade
+        self.commerce_last_check_time = 0  # Time since last AI check
+        self.commerce_check_interval = 3.0  # Seconds between AI checks
+    
+    def update(self, dt):
+        """Update building state by dt seconds
+        Returns the delay until the building's next event, or None to sleep until woken"""
+        self.update_commerce(dt)
+        return self.next_commerce_event()
+    
+    def next_commerce_event(self):
+        """Delay until AIs next look at this station's trade, or None without an open player trade"""
+        if not self.commerce_resource or self.commerce_amount <= 0:
+            return None
+        if self.tile.owner and self.tile.owner.startswith('ai_'):
+            return None  # AI selling logic is handled by the AI class
+        return max(0, self.commerce_check_interval - self.commerce_last_check_time)
+    
     def update_commerce(self, dt):
         """Handle commerce station behavior - check if AI should buy resources"""
-        from game import Game
+        from simulation import Simulation
         
         # Skip if no resource is being traded
         if not self.commerce_resource or self.commerce_amount <= 0:
@@ -641,8 +695,8 @@ class Building:
             self.commerce_last_check_time = 0
             
             # Check if any AI wants to buy
-            if Game.instance and hasattr(Game.instance, 'ai_factories'):
-                for ai in Game.instance.ai_factories:
+            if Simulation.instance and hasattr(Simulation.instance, 'ai_factories'):
+                for ai in Simulation.instance.ai_factories:
                     # AI decides whether to buy based on price and need
                     if self._ai_decides_to_buy(ai):
                         amount_to_buy = min(self.commerce_amount, 10)  # Buy up to 10 units at a time
@@ -655,25 +709,26 @@ class Building:
                             ai.money -= total_cost
                             
                             # Add money to player
-                            Game.instance.player.money += total_cost
+                            Simulation.instance.player.money += total_cost
                             
                             # Add resource to AI's deposits
                             self._add_resource_to_ai_deposit(ai, self.commerce_resource, amount_to_buy)
                             
                             # Notify player of sale
-                            Game.instance.logger.log('COMMERCE', 'SOLD', 
-                                f"AI-{ai.id} bought {amount_to_buy} units of {self.commerce_resource} for ${total_cost}")
+                            Simulation.instance.logger.log('COMMERCE', 'SOLD', 
+                                "AI-%s bought %s units of %s for $%s", ai.id, amount_to_buy, self.commerce_resource, total_cost)
                             
                             # Reset commerce station if sold out
                             if self.commerce_amount <= 0:
                                 self.commerce_resource = None
                                 self.commerce_price = 0
                                 break
-                                
+    
     def _ai_decides_to_buy(self, ai):
         """AI decision logic for purchasing from commerce stations"""
         from economy import Market
         from config import RECIPES, PROCESSED_RESOURCES
+        rng = rng_streams.get_random('commerce')
         
         # Skip if AI can't afford minimum purchase
         if ai.money < self.commerce_price:
@@ -692,10 +747,10 @@ class Building:
             
         # 2. Buy with decreasing probability as price increases
         if price_ratio < 1.1:  # Up to 10% more expensive than market
-            return random.random() < 0.7  # 70% chance
+            return rng.random() < 0.7  # 70% chance
         
         if price_ratio < 1.3:  # Up to 30% more expensive than market
-            return random.random() < 0.3  # 30% chance
+            return rng.random() < 0.3  # 30% chance
             
         # 3. Additional logic for resources needed by processing buildings
         for tile in ai.owned_tiles:
@@ -709,11 +764,11 @@ class Building:
                     if (recipe['input1'] == self.commerce_resource or 
                         recipe['input2'] == self.commerce_resource):
                         # More eager to buy resources needed for processing
-                        return random.random() < 0.5  # 50% chance regardless of price
+                        return rng.random() < 0.5  # 50% chance regardless of price
                         
         # Default: unlikely to buy at high prices
-        return random.random() < 0.1  # 10% chance
-        
+        return rng.random() < 0.1  # 10% chance
+    
     def _add_resource_to_ai_deposit(self, ai, resource_type, amount):
         """Add purchased resources to an AI's deposit"""
         # Find a deposit with space
@@ -724,28 +779,28 @@ class Building:
                 
                 deposit = tile.building_instance
                 if deposit.can_accept_resource(resource_type, amount):
-                    deposit.resources[resource_type] = deposit.resources.get(resource_type, 0) + amount
+                    deposit.add_resource(resource_type, amount)
                     ai.logger.log('COMMERCE', 'BUY', 
-                        f"Added {amount} {resource_type} from commerce purchase to deposit at ({tile.x}, {tile.y})")
+                        "Added %s %s from commerce purchase to deposit at (%s, %s)", amount, resource_type, tile.x, tile.y)
                     return True
                     
         # If no deposit has enough space, create/add to resources in commerce building itself
         self.resources[resource_type] = self.resources.get(resource_type, 0) + amount
         ai.logger.log('COMMERCE', 'BUY', 
-            f"No deposit available, stored {amount} {resource_type} in commerce building at ({self.tile.x}, {self.tile.y})")
+            "No deposit available, stored %s %s in commerce building at (%s, %s)", amount, resource_type, self.tile.x, self.tile.y)
         return False
-
+    
     def setup_commerce_trade(self, resource_type, amount, price):
         """Set up a commerce station to trade a specific resource"""
         # Check if we have enough of the resource across all deposits
         if self.tile.owner == 'player':
-            from game import Game
+            from simulation import Simulation
             
             # First count total resources available across all deposits
             total_available = 0
             deposits_with_resource = []
             
-            for tile in Game.instance.player.owned_tiles:
+            for tile in Simulation.instance.player.owned_tiles:
                 if (tile.building == 'DEPOSIT' and 
                     hasattr(tile, 'building_instance') and 
                     tile.building_instance):
@@ -764,7 +819,7 @@ class Building:
                 
                 for deposit, available in deposits_with_resource:
                     take_amount = min(available, remaining_to_take)
-                    deposit.resources[resource_type] -= take_amount
+                    deposit.remove_resource(resource_type, take_amount)
                     remaining_to_take -= take_amount
                     
                     if remaining_to_take <= 0:
@@ -774,13 +829,14 @@ class Building:
                 self.commerce_resource = resource_type
                 self.commerce_amount = amount
                 self.commerce_price = price
+                self.wake()
                 
-                Game.instance.logger.log('COMMERCE', 'SETUP', 
-                    f"Set up trade for {amount} {resource_type} at ${price} per unit")
+                Simulation.instance.logger.log('COMMERCE', 'SETUP', 
+                    "Set up trade for %s %s at $%s per unit", amount, resource_type, price)
                 return True
             
-            Game.instance.logger.log('COMMERCE', 'ERROR', 
-                f"Not enough {resource_type} across all deposits ({total_available}/{amount} needed) to set up commerce station")
+            Simulation.instance.logger.log('COMMERCE', 'ERROR', 
+                "Not enough %s across all deposits (%s/%s needed) to set up commerce station", resource_type, total_available, amount)
             return False
         
         # For AI, assume resources are available
@@ -788,7 +844,7 @@ class Building:
         self.commerce_amount = amount
         self.commerce_price = price
         return True
-        
+    
     def buy_from_commerce(self, buyer_type, amount=None):
         """Player or AI buys from this commerce station"""
         if not self.commerce_resource or self.commerce_amount <= 0:
@@ -807,34 +863,34 @@ class Building:
         
         # Handle player buying from AI commerce station
         if buyer_type == 'player' and self.tile.owner and self.tile.owner.startswith('ai_'):
-            from game import Game
+            from simulation import Simulation
             
             # Check if player can afford
-            if Game.instance.player.money < total_cost:
-                Game.instance.logger.log('COMMERCE', 'ERROR', 
-                    f"Not enough money to buy {amount} {self.commerce_resource} for ${total_cost}")
+            if Simulation.instance.player.money < total_cost:
+                Simulation.instance.logger.log('COMMERCE', 'ERROR', 
+                    "Not enough money to buy %s %s for $%s", amount, self.commerce_resource, total_cost)
                 return False
                 
             # Process transaction
-            Game.instance.player.money -= total_cost
+            Simulation.instance.player.money -= total_cost
             
             # Find player deposit to add resources to
-            for tile in Game.instance.player.owned_tiles:
+            for tile in Simulation.instance.player.owned_tiles:
                 if (tile.building == 'DEPOSIT' and 
                     hasattr(tile, 'building_instance') and 
                     tile.building_instance and
                     tile.building_instance.can_accept_resource(self.commerce_resource, amount)):
                     
                     deposit = tile.building_instance
-                    deposit.resources[self.commerce_resource] = deposit.resources.get(self.commerce_resource, 0) + amount
+                    deposit.add_resource(self.commerce_resource, amount)
                     
                     # Update AI owner's money
                     ai_id = self.tile.owner.split('_')[1]
-                    for ai in Game.instance.ai_factories:
+                    for ai in Simulation.instance.ai_factories:
                         if str(ai.id) == ai_id:
                             ai.money += total_cost
                             ai.logger.log('COMMERCE', 'SOLD', 
-                                f"Player bought {amount} {self.commerce_resource} for ${total_cost}")
+                                "Player bought %s %s for $%s", amount, self.commerce_resource, total_cost)
                             break
                     
                     # Update commerce station
@@ -843,71 +899,24 @@ class Building:
                         self.commerce_resource = None
                         self.commerce_price = 0
                         
-                    Game.instance.logger.log('COMMERCE', 'BUY', 
-                        f"Bought {amount} {self.commerce_resource} from AI-{ai_id} for ${total_cost}")
+                    Simulation.instance.logger.log('COMMERCE', 'BUY', 
+                        "Bought %s %s from AI-%s for $%s", amount, self.commerce_resource, ai_id, total_cost)
                     return True
                     
-            Game.instance.logger.log('COMMERCE', 'ERROR', 
-                f"No deposit with enough space to store {amount} {self.commerce_resource}")
+            Simulation.instance.logger.log('COMMERCE', 'ERROR', 
+                "No deposit with enough space to store %s %s", amount, self.commerce_resource)
             return False
             
         return False
 
-    def find_best_deposit(self):
-        """Find the best deposit based on the improved logic:
-        1. If resource exists in deposit and not full, send to that deposit
-        2. If resource exists but deposit full, send to nearest deposit with space
-        3. If resource doesn't exist in any deposit, send to closest deposit with free space
-        4. If all deposits are full and/or have filled resource types, don't send the resource
-        """
-        from config import DEPOSIT_SIZE, MAX_RESOURCE_TYPES_PER_DEPOSIT
-        
-        resource_type = self.tile.resource_type if hasattr(self, 'tile') and hasattr(self.tile, 'resource_type') else None
-        
-        # If we don't know what resource type we're looking for, fall back to old method
-        if not resource_type:
-            return self.find_closest_deposit()
-            
-        # Step 1: Find deposits that already have this resource and aren't full
-        deposit_with_resource = None
-        min_distance_with_resource = float('inf')
-        
-        # Step 2 & 3: Find deposits that have space (either for new resource type or for more of existing)
-        closest_with_space = None
-        min_distance_with_space = float('inf')
-        
-        for pos, tile in self.tile.world.tiles.items():
-            if (tile.owner == self.tile.owner and 
-                tile.building == 'DEPOSIT' and 
-                hasattr(tile, 'building_instance') and 
-                tile.building_instance):
-                
-                deposit = tile.building_instance
-                distance = self.get_distance_to(tile)
-                total_resources = deposit.get_total_resources()
-                
-                # Check if this deposit has our resource type
-                has_resource = resource_type in deposit.resources
-                
-                # Check if the deposit has space for more resources in total
-                has_total_space = total_resources < DEPOSIT_SIZE
-                
-                # Check if the deposit can accept a new resource type
-                can_accept_new_type = len(deposit.resources.keys()) < MAX_RESOURCE_TYPES_PER_DEPOSIT
-                
-                # Step 1: Deposit has this resource and isn't full
-                if has_resource and has_total_space and distance < min_distance_with_resource:
-                    deposit_with_resource = tile
-                    min_distance_with_resource = distance
-                
-                # Step 2 & 3: Deposit has space (either already has resource, or has space for new type)
-                if has_total_space and (has_resource or can_accept_new_type) and distance < min_distance_with_space:
-                    closest_with_space = tile
-                    min_distance_with_space = distance
-        
-        # Prioritize deposit that already has this resource
-        if deposit_with_resource:
-            return deposit_with_resource
-        
-        # Otherwise use closest deposit with space
-        return closest_with_space
+# Building class for each building type (types without behaviour, like CENTRAL, use the base class)
+BUILDING_CLASSES = {
+    'COLLECTION': CollectionBuilding,
+    'DEPOSIT': DepositBuilding,
+    'PROCESSING': ProcessingBuilding,
+    'COMMERCE': CommerceBuilding,
+}
+
+def create_building(tile, building_type):
+    """Create the building instance for a building type"""
+    return BUILDING_CLASSES.get(building_type, Building)(tile, building_type)
@@ -1,14 +1,10 @@
 import pygame
 import sys
-import random
 from config import *
-from world import World
-from player import Player
-from economy import Market
-from ai import AIFactory
+from simulation import Simulation
 from ui import UI
-from logger import GameLogger
-from stats import GameStats
+from world_renderer import WorldRenderer
+import utils
 from session_saver import SessionSaver
 
 class Camera:
@@ -61,6 +57,14 @@ class Camera:
         """Get camera offset for rendering"""
         return (self.x, self.y, self.zoom_level)
     
+    def get_tile_size(self):
+        """Size of a tile on screen in pixels at the current zoom"""
+        return max(1, round(TILE_SIZE * self.zoom_level))
+    
+    def get_visible_tile_range(self, world):
+        """Return (x0, y0, x1, y1), the half-open range of tiles inside the viewport at the current zoom"""
+        return world.get_visible_tile_range((self.x, self.y), self.width / self.zoom_level, self.height / self.zoom_level)
+    
     def screen_to_world(self, screen_pos):
         """Convert screen position to world position"""
         # Apply zoom factor to screen coordinates
@@ -107,6 +111,8 @@ class Camera:
             self.zoom_level = min(self.max_zoom, self.zoom_level + self.zoom_speed)
         else:  # Zoom out
             self.zoom_level = max(self.min_zoom, self.zoom_level - self.zoom_speed)
+        # Snap to a whole number of pixels per tile so tiles are drawn at an exact size
+        self.zoom_level = self.get_tile_size() / TILE_SIZE
             
         # If mouse position is provided, adjust camera position to zoom towards that point
         if mouse_pos:
@@ -144,24 +150,15 @@ class Game:
         self.running = True
         self.restart_game = False  # Flag to indicate when game should restart
         
-        # Game objects
-        from config import WORLD_SIZE, NUM_AI_PLAYERS
-        from economy import PriceManager, Market
-        self.world = World()  # World now uses WORLD_SIZE from config
-        self.player = Player()
-        self.market = Market()
-        self.price_manager = PriceManager()  # Initialize the price manager
-        self.logger = GameLogger()
-        self.stats = GameStats()  # Initialize stats tracker
-        
-        # Set up player starting area
-        self.world.setup_player_start(self.player)
-        
-        # Set up AI factories
-        self.ai_factories = []
-        self.world.setup_ai_factories()  # Uses NUM_AI_PLAYERS from config
-        for i in range(NUM_AI_PLAYERS):
-            self.ai_factories.append(AIFactory(i, self.world))
+        # Headless simulation core; the game is a rendering/input shell on top of it
+        self.simulation = Simulation()
+        self.world = self.simulation.world
+        self.player = self.simulation.player
+        self.market = self.simulation.market
+        self.price_manager = self.simulation.price_manager
+        self.logger = self.simulation.logger
+        self.stats = self.simulation.stats
+        self.ai_factories = self.simulation.ai_factories
         
         # Camera and UI
         self.camera = Camera(SCREEN_WIDTH - UI_PANEL_WIDTH, SCREEN_HEIGHT, self.world.width, self.world.height)
@@ -171,14 +168,13 @@ class Game:
         self.camera.y = max(0, (center_y * TILE_SIZE) - (self.camera.height // 2))
         self.ui = UI(SCREEN_WIDTH, SCREEN_HEIGHT)
         
-        # Game state
-        self.game_over = False
-        self.time_since_update = 0
-        
-        # Create session saver and connect it to logger
-        self.session_saver = SessionSaver(self)
-        self.logger.set_session_saver(self.session_saver)
+        # Cached chunk renderer for the world
+        self.world_renderer = WorldRenderer(self.world)
         
+        # Create session saver and connect it to the simulation
+        self.session_saver = SessionSaver(self.simulation)
+        self.simulation.set_session_saver(self.session_saver)
+    
     def handle_events(self):
         """Process game events"""
         for event in pygame.event.get():
@@ -187,7 +183,7 @@ class Game:
             
             elif event.type == pygame.KEYDOWN:                
                 # Game over state controls
-                if self.game_over:
+                if self.simulation.game_over:
                     if event.key == pygame.K_ESCAPE:
                         self.running = False
                     return  # Skip other inputs when game is over
@@ -209,6 +205,13 @@ class Game:
                 # Cancel building selection with Escape
                 elif event.key == pygame.K_ESCAPE:
                     self.ui.selected_building_type = None
+                # Simulation speed controls
+                elif event.key == pygame.K_p:
+                    self.simulation.clock.toggle_pause()
+                elif event.key == pygame.K_RIGHTBRACKET:
+                    self.change_time_scale(1)
+                elif event.key == pygame.K_LEFTBRACKET:
+                    self.change_time_scale(-1)
             
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 # Start camera drag with middle mouse button
@@ -248,122 +251,80 @@ class Game:
                     zoom_direction = event.y
                     self.camera.zoom(zoom_direction, mouse_pos)
     
-    def update(self, dt):
-        """Update game state"""
-        if self.game_over:
-            return
-            
-        # Update price manager continuously
-        self.price_manager.update(dt)
-            
-        # Update market prices periodically
-        self.time_since_update += dt
-        if self.time_since_update >= MARKET_UPDATE_INTERVAL:
-            self.time_since_update = 0
-            self.market.update_prices()
-            
-            # Occasionally create market shocks (1% chance per update)
-            if random.random() < 0.01:
-                affected_resources = self.market.create_market_shock()
-                # Log the market shock event if logger is available
-                if hasattr(self, 'logger'):
-                    resources_str = ', '.join(affected_resources)
-                    self.logger.log("MARKET", "SHOCK", f"Market shock affecting: {resources_str}")
-            
-            # Update AI factories
-            for ai in self.ai_factories:
-                ai.update()
-                
-            # Update session saver to record market data
-            if hasattr(self, 'session_saver'):
-                self.session_saver.update(dt)
-        
-        # Update world (includes buildings)
-        self.world.update(dt)        # Check win condition
-        if self.player.money >= WIN_CONDITION:
-            self.game_over = True
-            # Stop the timer when the game ends
-            self.stats.stop_timer()
-            
-            # Log win message with time
-            time_played_str = self.stats.format_time(self.stats.time_played)
-            win_message = f"You've reached the goal of $1,000,000! Time: {time_played_str}"
-            
-            # Check if this is a new personal best
-            if self.stats.is_personal_best():
-                win_message += " (New Personal Best!)"
-                self.logger.log('GAME', 'WIN', win_message)
-            else:
-                self.logger.log('GAME', 'WIN', win_message)
-            
-            # Save session data when game ends
-            if hasattr(self, 'session_saver'):
-                self.session_saver.save_session()
+    def change_time_scale(self, direction):
+        """Step the simulation speed up or down through SIM_TIME_SCALE_STEPS"""
+        clock = self.simulation.clock
+        if direction > 0:
+            faster = [s for s in SIM_TIME_SCALE_STEPS if s > clock.time_scale]
+            if faster:
+                clock.set_time_scale(faster[0])
+        else:
+            slower = [s for s in SIM_TIME_SCALE_STEPS if s < clock.time_scale]
+            if slower:
+                clock.set_time_scale(slower[-1])
+        self.logger.log('GAME', 'SPEED', f"Simulation speed set to {clock.time_scale:g}x")
+    
+    def update(self, real_dt):
+        """Update game state for a frame that took real_dt seconds"""
+        # The simulation clock turns real frame time into scaled/fixed simulation steps
+        for dt in self.simulation.clock.tick(real_dt):
+            self.simulation.step(dt)
     
     def draw(self):
         """Render the game"""
         # Clear screen
         self.screen.fill(BLACK)
-          # Draw restart button at the top left corner of the screen
-        restart_rect = pygame.Rect(10, 10, 100, 30)
-        pygame.draw.rect(self.screen, GREEN, restart_rect)
-        pygame.draw.rect(self.screen, BLACK, restart_rect, 1)
-        font = pygame.font.SysFont('Arial', 16)
-        restart_text = font.render("Restart Game", True, BLACK)
-        self.screen.blit(restart_text, (restart_rect.x + 10, restart_rect.y + 7))
-        self.ui.restart_button = restart_rect
         
         # Draw world
-        world_surface = pygame.Surface((SCREEN_WIDTH - UI_PANEL_WIDTH, SCREEN_HEIGHT))
-        world_surface.fill(BLACK)
-        
         # Get zoom level from camera
         camera_offset = self.camera.get_offset()
         zoom_level = self.camera.zoom_level
         
-        # Create a temporary surface at the zoomed size
-        zoom_width = int((SCREEN_WIDTH - UI_PANEL_WIDTH) / zoom_level)
-        zoom_height = int(SCREEN_HEIGHT / zoom_level)
-        
-        # Draw world onto the temporary surface
-        temp_surface = pygame.Surface((zoom_width, zoom_height))
-        temp_surface.fill(BLACK)
-        self.world.draw(temp_surface, (camera_offset[0], camera_offset[1]))
-        
-        # Scale the temporary surface to apply zoom
-        if zoom_level != 1.0:
-            scaled_surface = pygame.transform.scale(
-                temp_surface, 
-                (int(zoom_width * zoom_level), int(zoom_height * zoom_level))
-            )
-            world_surface.blit(scaled_surface, (0, 0))
-        else:
-            world_surface.blit(temp_surface, (0, 0))
-            
-        # Blit world surface to screen
-        self.screen.blit(world_surface, (0, 0))
+        # Tiles are drawn straight to the screen at the zoomed size, clipped to the world view
+        self.screen.set_clip(pygame.Rect(0, 0, SCREEN_WIDTH - UI_PANEL_WIDTH, SCREEN_HEIGHT))
+        visible_tiles = self.camera.get_visible_tile_range(self.world)
+        self.world_renderer.draw(self.screen, (camera_offset[0] * zoom_level, camera_offset[1] * zoom_level),
+                                 visible_tiles, self.camera.get_tile_size())
+        self.screen.set_clip(None)
         
         # Draw UI
         self.ui.draw(self.screen, self.player, self.market)
         
+        # Draw restart button at the top left corner of the screen (over the world view)
+        restart_rect = pygame.Rect(10, 10, 100, 30)
+        pygame.draw.rect(self.screen, GREEN, restart_rect)
+        pygame.draw.rect(self.screen, BLACK, restart_rect, 1)
+        font = utils.get_font('Arial', 16)
+        restart_text = utils.render_text("Restart Game", font, BLACK)
+        self.screen.blit(restart_text, (restart_rect.x + 10, restart_rect.y + 7))
+        self.ui.restart_button = restart_rect
+        
+        # Draw simulation speed indicator next to the restart button
+        clock = self.simulation.clock
+        speed_str = "Paused" if clock.paused else f"Speed: {clock.time_scale:g}x"
+        speed_text = utils.render_text(speed_str, font, WHITE)
+        speed_rect = speed_text.get_rect(topleft=(restart_rect.right + 10, restart_rect.y + 7))
+        self.screen.fill(BLACK, speed_rect.inflate(8, 4))  # Keep it readable over light tiles
+        self.screen.blit(speed_text, speed_rect)
+        
         # Draw logger messages
         if DEBUG_LOGGER:
-            self.logger.draw(self.screen, 10, SCREEN_HEIGHT - 200, pygame.font.SysFont('Arial', 14))
+            self.logger.draw(self.screen, 10, SCREEN_HEIGHT - 200, utils.get_font('Arial', 14))
         
         # Draw game over message if applicable
-        if self.game_over:
+        if self.simulation.game_over:
             # Draw semi-transparent overlay
             overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
             overlay.fill((0, 0, 0, 180))  # Black with 70% opacity
             self.screen.blit(overlay, (0, 0))
             
             # Draw win message
-            font_large = pygame.font.SysFont('Arial', 48)
-            text_win = font_large.render("You Win!", True, GREEN)
+            font_large = utils.get_font('Arial', 48)
+            text_win = utils.render_text("You Win!", font_large, GREEN)
             text_rect_win = text_win.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//4))
             self.screen.blit(text_win, text_rect_win)
               # Draw stats
-            font_stats = pygame.font.SysFont('Arial', 24)
+            font_stats = utils.get_font('Arial', 24)
             stats_list = self.stats.get_stats_display()
             for i, stat_text in enumerate(stats_list):
                 # Highlight new personal best with gold color
@@ -371,7 +332,7 @@ class Game:
                 if "New Record" in stat_text:
                     text_color = (255, 215, 0)  # Gold color for new record
                 
-                text_surface = font_stats.render(stat_text, True, text_color)
+                text_surface = utils.render_text(stat_text, font_stats, text_color)
                 text_rect = text_surface.get_rect(
                     center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//4 + 80 + i * 40)
                 )
@@ -380,14 +341,21 @@ class Game:
             restart_rect = pygame.Rect(SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT - 120, 200, 40)
             pygame.draw.rect(self.screen, GREEN, restart_rect)
             pygame.draw.rect(self.screen, BLACK, restart_rect, 1)
-            font_restart = pygame.font.SysFont('Arial', 20)
-            restart_text = font_restart.render("Restart Game", True, BLACK)
+            font_restart = utils.get_font('Arial', 20)
+            restart_text = utils.render_text("Restart Game", font_restart, BLACK)
             restart_text_rect = restart_text.get_rect(center=restart_rect.center)
             self.screen.blit(restart_text, restart_text_rect)
             self.ui.restart_button = restart_rect
             
+            # Draw session export progress
+            export_status = self.session_saver.get_export_status()
+            if export_status:
+                text_export = utils.render_text(export_status, font_restart, LIGHT_GRAY)
+                text_rect_export = text_export.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 150))
+                self.screen.blit(text_export, text_rect_export)
+            
             # Draw quit instruction
-            text_quit = font_restart.render("Press ESC to quit", True, WHITE)
+            text_quit = utils.render_text("Press ESC to quit", font_restart, WHITE)
             text_rect_quit = text_quit.get_rect(
                 center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 60)
             )
@@ -396,10 +364,18 @@ class Game:
         # Update display
         pygame.display.flip()
     
+    def finish_session(self):
+        """Close the session saver, drawing export progress until exports in flight finish"""
+        while self.session_saver.is_exporting():
+            pygame.event.pump()  # Keep the window responsive
+            self.draw()
+            self.clock.tick(30)
+        self.session_saver.close()
+    
     def run(self):
         """Main game loop"""
         while self.running:
-            dt = self.clock.tick(60) / 1000.0  # Delta time in seconds
+            dt = self.clock.tick(60) / 1000.0  # Real frame time in seconds
             
             self.handle_events()
             self.update(dt)
@@ -418,6 +394,7 @@ class Game:
                 config_screen = ConfigurationScreen(screen)
                 if config_screen.run():
                     # Re-initialize the game with new settings
+                    self.finish_session()
                     self.__init__(screen)
                     
                     # Log the new settings
@@ -425,13 +402,13 @@ class Game:
                     world_size = f"{WORLD_SIZE['width']}x{WORLD_SIZE['height']}"
                     self.logger.log('GAME', 'SETTINGS', f"World Size: {world_size}")
                     self.logger.log('GAME', 'SETTINGS', f"AI Players: {NUM_AI_PLAYERS}")
+                    self.logger.log('GAME', 'SETTINGS', f"Seed: {self.simulation.seed}")
                 else:
                     # User quit during configuration
                     self.running = False
         
-        # Save session data if the game is over
-        if hasattr(self, 'session_saver') and self.game_over:
-            self.session_saver.save_session()
+        # The session was exported when the game was won; let that export finish
+        self.finish_session()
             
         pygame.quit()
         sys.exit()
@@ -0,0 +1,133 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from config import LOG_FLUSH_INTERVAL, LOG_QUEUE_SIZE
+
+# Seconds between checks that the writer thread is still alive while waiting on it
+WAIT_POLL_INTERVAL = 0.5
+
+# Control messages for the writer thread
+_FLUSH = object()
+_CLOSE = object()
+
+class LogWriter:
+    """Appends log lines to per-category files from a background thread
+
+    The game thread only queues lines; the writer thread owns the files, writes
+    through their buffers and flushes them every `flush_interval` seconds, so a
+    crash loses at most the last interval. The queue is bounded: if the writer
+    falls that far behind, `write` waits rather than letting memory grow.
+    
+    If the files cannot be written (disk full, directory removed), the writer
+    reports it once, marks itself failed and drops further lines; it never leaves
+    the game waiting on a thread that is gone.
+    """
+    def __init__(self, directory, files, flush_interval=LOG_FLUSH_INTERVAL, queue_size=LOG_QUEUE_SIZE):
+        self.directory = directory
+        self.files = files  # Category -> (file name, header written when the file is created)
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.open_files = {}  # Category -> file object (writer thread only)
+        self.closed = False
+        self.failed = False  # Set by the writer thread when a file operation fails
+        self.thread = threading.Thread(target=self._run, name='LogWriter', daemon=True)
+        self.thread.start()
+        # Make sure buffered lines reach disk even if the owner never closes us
+        atexit.register(self.close)
+
+    def write(self, category, line):
+        """Queue a line for the category's file (categories without a file are ignored)"""
+        if self.closed or self.failed or category not in self.files:
+            return
+        self._put((category, line))
+
+    def flush(self):
+        """Wait until every line queued so far is written and flushed"""
+        if self.closed:
+            return
+        done = threading.Event()
+        if not self._put((_FLUSH, done)):
+            return
+        while not done.wait(WAIT_POLL_INTERVAL):
+            if not self.thread.is_alive():
+                return
+
+    def close(self):
+        """Write out everything queued, close the files and stop the thread"""
+        if self.closed:
+            return
+        self.closed = True
+        self._put((_CLOSE, None))
+        self.thread.join()
+        atexit.unregister(self.close)
+
+    def _put(self, item):
+        """Queue an item, waiting while the queue is full
+        Returns False (dropping the item) if the writer thread is no longer running"""
+        while self.thread.is_alive():
+            try:
+                self.queue.put(item, timeout=WAIT_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _run(self):
+        next_flush = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                category, item = self.queue.get(timeout=max(0, next_flush - time.monotonic()))
+            except queue.Empty:
+                category = None
+
+            if category is _CLOSE:
+                self._close_files()
+                return
+            if category is _FLUSH:
+                self._flush_files()
+                item.set()
+            elif category is not None and not self.failed:
+                try:
+                    self._get_file(category).write(item + "\n")
+                except OSError as e:
+                    self._fail(e)
+
+            if time.monotonic() >= next_flush:
+                self._flush_files()
+                next_flush = time.monotonic() + self.flush_interval
+
+    def _get_file(self, category):
+        """Open a category's file for appending, writing its header if the file is new"""
+        file = self.open_files.get(category)
+        if file is None:
+            name, header = self.files[category]
+            file = open(os.path.join(self.directory, name), 'a')
+            if file.tell() == 0:
+                file.write(header)
+            self.open_files[category] = file
+        return file
+
+    def _flush_files(self):
+        if self.failed:
+            return
+        try:
+            for file in self.open_files.values():
+                file.flush()
+        except OSError as e:
+            self._fail(e)
+
+    def _close_files(self):
+        for file in self.open_files.values():
+            try:
+                file.close()
+            except OSError:
+                pass  # Already reported, or nothing left worth saving
+        self.open_files = {}
+
+    def _fail(self, error):
+        """Stop writing after a file error (queued and later lines are dropped)"""
+        print(f"Session logs can no longer be written: {error}")
+        self.failed = True
+        self._close_files()
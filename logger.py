@@ -1,33 +1,112 @@
-import pygame
-from config import DEBUG_LOGGER, LOGGER_SHOW_PLAYER, LOGGER_SHOW_AI, LOGGER_SHOW_BUILDING
+from collections import deque
+from config import DEBUG_LOGGER, LOGGER_SHOW_PLAYER, LOGGER_SHOW_AI, LOGGER_SHOW_BUILDING, LOG_LEVEL, LOG_CONSOLE_LEVEL, LOG_RATE_LIMIT_INTERVAL
+import utils
+from sim_clock import SimClock
 
-def draw_text(surface, text, pos, font, color=(255, 255, 255)):
-    """Helper to draw text on a surface"""
-    text_surface = font.render(text, True, color)
-    surface.blit(text_surface, pos)
+# Severity levels (records below the configured LOG_LEVEL are dropped before formatting)
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVELS = {'DEBUG': DEBUG, 'INFO': INFO, 'WARNING': WARNING, 'ERROR': ERROR}
 
 class GameLogger:
-    def __init__(self):
-        self.messages = []
+    def __init__(self, clock=None):
+        # Most recent messages (bounded: old entries fall off the front)
         self.max_messages = 10
+        self.messages = deque(maxlen=self.max_messages)
+        
+        # Which categories are shown (other logs are always shown on screen, never on the console)
+        self.show = {'player': LOGGER_SHOW_PLAYER, 'ai': LOGGER_SHOW_AI, 'building': LOGGER_SHOW_BUILDING, 'other': True}
+        # Most recent messages in shown categories, as drawn on screen
+        self.visible = deque(maxlen=self.max_messages)
+        self.visible_version = 0  # Bumped on every new visible message
+        self.surface = None  # Cached on-screen log
+        self.surface_key = None  # (visible_version, font) the cached surface was drawn for
         # Building log sources - these are considered building logs
         self.building_sources = ['DEPOSIT', 'PROCESSING', 'COLLECTION', 'COMMERCE', 'CENTRAL', 'COLLECTOR']    
+        self.categories = {}  # Source -> category, worked out once per source
         # For session saving
         self.session_saver = None
         
+        # Minimum severity kept, and printed to the console (printing blocks the game thread)
+        self.level = LEVELS[LOG_LEVEL]
+        self.console_level = LEVELS[LOG_CONSOLE_LEVEL] if LOG_CONSOLE_LEVEL else None
+        
+        # Rate limiting of located records, on the simulated clock
+        self.clock = clock or SimClock()
+        self.rate_limit_interval = LOG_RATE_LIMIT_INTERVAL
+        # (source, action, location) -> [time last kept, records dropped since, level, description, args of the last dropped]
+        self.rate_limits = {}
+        
     def set_session_saver(self, saver):
         """Set the session saver reference"""
         self.session_saver = saver
+    
+    def is_enabled(self, level):
+        """Whether records of this severity are kept (lets callers skip building expensive arguments)"""
+        return level >= self.level
+        
+    def log(self, source, action_type, description, *args, level=None, location=None):
+        """Add a log message
+
+        description may be a %-format string; args are only formatted if the record is kept.
+        level defaults to ERROR for 'ERROR' actions and INFO otherwise. Records with a
+        location (e.g. tile coordinates) are rate limited per (source, action, location):
+        repeats within the interval are dropped and counted in the next kept record
+        (or reported by flush_suppressed).
+        """
+        if level is None:
+            level = ERROR if action_type == 'ERROR' else INFO
+        if level < self.level:
+            return
         
-    def log(self, source, action_type, description):
-        """Add a log message"""
+        suppressed = 0
+        if location is not None:
+            key = (source, action_type, location)
+            limit = self.rate_limits.get(key)
+            now = self.clock.now
+            if limit is not None and now - limit[0] < self.rate_limit_interval:
+                limit[1] += 1
+                limit[2:] = (level, description, args)
+                return
+            if limit is not None:
+                suppressed = limit[1]
+            self.rate_limits[key] = [now, 0, None, None, None]
+        
+        self.emit(source, action_type, description, args, level, suppressed)
+    
+    def flush_suppressed(self):
+        """Report rate-limited records that were dropped and never followed by a kept one
+        (call before the logs are saved, so no burst goes unreported)
+        
+        Also forgets limits whose interval has passed: with nothing dropped they behave
+        exactly like a key never seen, so the table only holds recently logged locations.
+        """
+        now = self.clock.now
+        for key, limit in list(self.rate_limits.items()):
+            if limit[1]:
+                # The last dropped record stands for the whole burst
+                source, action_type, location = key
+                self.emit(source, action_type, limit[3], limit[4], limit[2], limit[1] - 1)
+                limit[1:] = (0, None, None, None)
+            if now - limit[0] >= self.rate_limit_interval:
+                del self.rate_limits[key]
+    
+    def emit(self, source, action_type, description, args, level, suppressed=0):
+        """Format a kept record and send it to the console, the session files and the on-screen log"""
+        if args:
+            description = description % args
+        if suppressed:
+            description = f"{description} ({suppressed} more suppressed)"
         message = f"[{source}] [{action_type}] {description}"
         # Add source category to the message for filtering when drawing
-        category = self.get_log_category(source)
+        category = self.categories.get(source)
+        if category is None:
+            category = self.categories[source] = self.get_log_category(source)
         
-        if (category == 'player' and LOGGER_SHOW_PLAYER) or \
-            (category == 'ai' and LOGGER_SHOW_AI) or \
-            (category == 'building' and LOGGER_SHOW_BUILDING):
+        shown = self.show[category]
+        if shown and category != 'other' and self.console_level is not None and level >= self.console_level:
             print(message)  # Console output
         
         # Store log in session saver if available
@@ -36,8 +115,9 @@ class GameLogger:
         
         log_entry = {'message': message, 'source': source, 'category': category}
         self.messages.append(log_entry)
-        if len(self.messages) > self.max_messages:
-            self.messages.pop(0)
+        if shown:
+            self.visible.append(log_entry)
+            self.visible_version += 1
     
     def get_log_category(self, source):
         """Determine the category of a log based on its source"""
@@ -55,19 +135,23 @@ class GameLogger:
         if not DEBUG_LOGGER:
             return
         
-        y_offset = 0
-        for log_entry in self.messages:
-            # Filter logs based on category
-            category = log_entry['category']
-            should_draw = True
-            
-            if category == 'player' and not LOGGER_SHOW_PLAYER:
-                should_draw = False
-            elif category == 'ai' and not LOGGER_SHOW_AI:
-                should_draw = False
-            elif category == 'building' and not LOGGER_SHOW_BUILDING:
-                should_draw = False
-                
-            if should_draw:
-                draw_text(surface, log_entry['message'], (x, y + y_offset), font, (200, 200, 200))
-                y_offset += 20
\ No newline at end of file
+        # Redraw the log only when a new visible message arrived (or the font changed)
+        key = (self.visible_version, font)
+        if self.surface_key != key:
+            self.surface = self.render(font)
+            self.surface_key = key
+        if self.surface:
+            surface.blit(self.surface, (x, y))
+    
+    def render(self, font):
+        """Draw the visible messages onto a new transparent surface (None if there are none)"""
+        import pygame
+        lines = [utils.render_text(log_entry['message'], font, (200, 200, 200)) for log_entry in self.visible]
+        if not lines:
+            return None
+        
+        log_surface = pygame.Surface((max(line.get_width() for line in lines), 20 * (len(lines) - 1) + lines[-1].get_height()),
+                                     pygame.SRCALPHA)
+        for i, line in enumerate(lines):
+            log_surface.blit(line, (0, 20 * i))
+        return log_surface
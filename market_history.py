@@ -0,0 +1,99 @@
+"""Columnar market price history
+
+Each market update is one fixed-size record: the time plus the price, supply and
+demand of every resource, in resource id order. Records go into a preallocated
+NumPy buffer. When the history has a file, full buffers are appended to it as raw
+binary chunks, so memory stays bounded however long the run. Without a file the
+buffer grows by doubling.
+
+File layout: a MAGIC line, a line of comma-separated resource names, then the
+records back to back (see `record_dtype`).
+"""
+import numpy as np
+
+from config import MARKET_HISTORY_CHUNK_SIZE
+from resources import RESOURCE_NAMES
+
+MAGIC = b"MARKET_HISTORY 1\n"
+
+
+def record_dtype(num_resources):
+    """Layout of one history sample (8 + 12 * num_resources bytes)"""
+    return np.dtype([
+        ('time', '<f8'),
+        ('price', '<f4', (num_resources,)),
+        ('supply', '<f4', (num_resources,)),
+        ('demand', '<f4', (num_resources,)),
+    ])
+
+
+def load_history(path, count=None):
+    """Read a history file back as (resource names, structured array of samples)
+    Only the first `count` samples are read if given"""
+    with open(path, 'rb') as f:
+        if f.readline() != MAGIC:
+            raise ValueError(f"{path} is not a market history file")
+        resources = f.readline().decode().strip().split(',')
+        dtype = record_dtype(len(resources))
+        data = f.read() if count is None else f.read(count * dtype.itemsize)
+    # Drop a trailing partial record (the run was killed mid-write)
+    usable = len(data) - len(data) % dtype.itemsize
+    return resources, np.frombuffer(data[:usable], dtype=dtype)
+
+
+class MarketHistory:
+    """Records a market's prices, supply and demand after every update"""
+    def __init__(self, path=None, start_time=0.0, chunk_size=MARKET_HISTORY_CHUNK_SIZE):
+        self.path = path  # Binary file the history is flushed to (None keeps it all in memory)
+        self.start_time = start_time  # Clock time recorded as time 0
+        self.resources = list(RESOURCE_NAMES)
+        self.dtype = record_dtype(len(self.resources))
+        self.buffer = np.zeros(chunk_size, dtype=self.dtype)
+        self.count = 0  # Samples in the buffer
+        self.flushed = 0  # Samples already written to the file
+
+        if self.path:
+            with open(self.path, 'wb') as f:
+                f.write(MAGIC)
+                f.write((','.join(self.resources) + "\n").encode())
+
+    def __len__(self):
+        return self.flushed + self.count
+
+    def record(self, now, market):
+        """Append the market's current state as a sample taken at clock time `now`"""
+        if self.count == len(self.buffer):
+            if self.path:
+                self.flush()
+            else:
+                self.buffer = np.concatenate([self.buffer, np.zeros_like(self.buffer)])
+
+        sample = self.buffer[self.count]
+        sample['time'] = now - self.start_time
+        sample['price'] = market.prices.array
+        sample['supply'] = market.supply.array
+        sample['demand'] = market.demand.array
+        self.count += 1
+
+    def flush(self):
+        """Append the buffered samples to the history file"""
+        if not self.path or not self.count:
+            return
+        with open(self.path, 'ab') as f:
+            f.write(self.buffer[:self.count].tobytes())
+        self.flushed += self.count
+        self.count = 0
+
+    def samples(self, count=None):
+        """The first `count` samples recorded (all of them by default), oldest first,
+        as a structured array
+
+        Samples already on disk are read back from the file; buffered ones are not
+        flushed for this, so a partial chunk is never written early.
+        """
+        count = len(self) if count is None else min(count, len(self))
+        if not self.path:
+            return self.buffer[:count]
+        from_file = min(count, self.flushed)
+        on_disk = load_history(self.path, from_file)[1]
+        return np.concatenate([on_disk, self.buffer[:count - from_file]])
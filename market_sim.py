@@ -0,0 +1,109 @@
+"""Batch Monte-Carlo simulation of the market price dynamics
+
+Runs many independent copies of the game's Market (periodic price updates plus
+random market shocks) side by side and reports, per resource, the distribution of
+final prices, the per-update volatility and how long prices sit at their clamps.
+Useful for tuning the MARKET_* settings without playing the game.
+
+Usage:
+    python market_sim.py [--paths 10000] [--steps 360] [--seed 0]
+                         [--adjustment 0.05] [--min-multiplier 0.4] [--max-multiplier 2.5]
+                         [--shock-probability 0.01]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from config import *
+from economy import MarketBatch
+from resources import RESOURCE_NAMES
+
+
+def simulate(paths, steps, seed=None, adjustment_factor=MARKET_PRICE_ADJUSTMENT_FACTOR,
+             min_multiplier=MARKET_MIN_PRICE_MULTIPLIER, max_multiplier=MARKET_MAX_PRICE_MULTIPLIER,
+             shock_probability=MARKET_SHOCK_PROBABILITY):
+    """Run `paths` markets for `steps` price updates and return per-resource statistics
+
+    Statistics are accumulated step by step, so memory does not grow with `steps`.
+    Prices are reported relative to each resource's base price.
+    """
+    batch = MarketBatch(paths, np.random.default_rng(seed))
+    batch.adjustment_factor = adjustment_factor
+    batch.min_multiplier = min_multiplier
+    batch.max_multiplier = max_multiplier
+    batch.shock_probability = shock_probability
+
+    # Resources without a base price (EMPTY) never move and are left out
+    tracked = batch.base_prices[0] > 0
+    base = batch.base_prices[:, tracked]
+    floor = base * min_multiplier
+    ceiling = base * max_multiplier
+
+    log_return_sum = np.zeros(tracked.sum())
+    log_return_sq_sum = np.zeros(tracked.sum())
+    steps_at_floor = np.zeros(tracked.sum())
+    steps_at_ceiling = np.zeros(tracked.sum())
+
+    previous = batch.prices[:, tracked]
+    for _ in range(steps):
+        batch.step()
+        batch.shock()
+        prices = batch.prices[:, tracked]
+
+        # Per-update log returns (volatility) and time spent at either clamp
+        log_returns = np.log(prices / previous)
+        log_return_sum += log_returns.sum(axis=0)
+        log_return_sq_sum += (log_returns ** 2).sum(axis=0)
+        steps_at_floor += (prices <= floor).sum(axis=0)
+        steps_at_ceiling += (prices >= ceiling).sum(axis=0)
+        previous = prices
+
+    samples = paths * max(steps, 1)
+    mean_return = log_return_sum / samples
+    final = batch.prices[:, tracked] / base
+    return {
+        'resources': [r for r, keep in zip(RESOURCE_NAMES, tracked) if keep],
+        'final_mean': final.mean(axis=0),
+        'final_std': final.std(axis=0),
+        'final_percentiles': np.percentile(final, [5, 50, 95], axis=0),
+        'volatility': np.sqrt(np.maximum(log_return_sq_sum / samples - mean_return ** 2, 0)),
+        'time_at_floor': steps_at_floor / samples,
+        'time_at_ceiling': steps_at_ceiling / samples,
+    }
+
+
+def report(stats):
+    """Print the statistics as a table (prices as multiples of the base price)"""
+    print(f"{'resource':<14}{'mean':>7}{'std':>7}{'p5':>7}{'p50':>7}{'p95':>7}"
+          f"{'vol/upd':>9}{'@min':>8}{'@max':>8}")
+    p5, p50, p95 = stats['final_percentiles']
+    for i, resource in enumerate(stats['resources']):
+        print(f"{resource:<14}{stats['final_mean'][i]:7.2f}{stats['final_std'][i]:7.2f}"
+              f"{p5[i]:7.2f}{p50[i]:7.2f}{p95[i]:7.2f}"
+              f"{stats['volatility'][i]:9.4f}{stats['time_at_floor'][i]:8.1%}{stats['time_at_ceiling'][i]:8.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte-Carlo simulation of market price dynamics")
+    parser.add_argument('--paths', type=int, default=10000, help="independent markets to simulate")
+    parser.add_argument('--steps', type=int, default=360,
+                        help=f"price updates per market (one every {MARKET_UPDATE_INTERVAL}s of game time)")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--adjustment', type=float, default=MARKET_PRICE_ADJUSTMENT_FACTOR)
+    parser.add_argument('--min-multiplier', type=float, default=MARKET_MIN_PRICE_MULTIPLIER)
+    parser.add_argument('--max-multiplier', type=float, default=MARKET_MAX_PRICE_MULTIPLIER)
+    parser.add_argument('--shock-probability', type=float, default=MARKET_SHOCK_PROBABILITY)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = simulate(args.paths, args.steps, args.seed, args.adjustment,
+                     args.min_multiplier, args.max_multiplier, args.shock_probability)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.paths} paths x {args.steps} updates in {elapsed:.2f}s")
+    report(stats)
+
+
+if __name__ == '__main__':
+    main()
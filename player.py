@@ -1,4 +1,3 @@
-import pygame
 from config import *
 import time
 from economy import PriceManager
@@ -22,9 +21,9 @@ class Player:
             tile.surveyed = True  # Auto-survey when buying a tile
             self.owned_tiles.append(tile)
             # Update stats
-            from game import Game
-            Game.instance.stats.total_money_spent += cost
-            Game.instance.stats.tiles_owned += 1
+            from simulation import Simulation
+            Simulation.instance.stats.total_money_spent += cost
+            Simulation.instance.stats.tiles_owned += 1
             return True
         return False
     
@@ -43,10 +42,10 @@ class Player:
             
         self.money -= cost
         tile.set_building(building_type)  # Using new set_building method
-        from game import Game
-        Game.instance.stats.total_money_spent += cost
-        Game.instance.stats.num_buildings += 1
-        Game.instance.logger.log('PLAYER', 'BUILD', f'Built {building_type} at ({tile.x}, {tile.y}) for ${cost}')
+        from simulation import Simulation
+        Simulation.instance.stats.total_money_spent += cost
+        Simulation.instance.stats.num_buildings += 1
+        Simulation.instance.logger.log('PLAYER', 'BUILD', f'Built {building_type} at ({tile.x}, {tile.y}) for ${cost}')
         return True
         
     def survey_tile(self, tile):
@@ -56,34 +55,33 @@ class Player:
         if self.can_afford(PriceManager.instance.get_survey_cost()):
             self.money -= PriceManager.instance.get_survey_cost()
             tile.surveyed = True
-            from game import Game
-            Game.instance.stats.total_money_spent += PriceManager.instance.get_survey_cost()
-            Game.instance.stats.tiles_surveyed = Game.instance.stats.tiles_surveyed + 1
-            Game.instance.logger.log('PLAYER', 'SURVEY', f'Surveyed tile at ({tile.x}, {tile.y}) for ${PriceManager.instance.get_survey_cost()}')
+            from simulation import Simulation
+            Simulation.instance.stats.total_money_spent += PriceManager.instance.get_survey_cost()
+            Simulation.instance.stats.tiles_surveyed = Simulation.instance.stats.tiles_surveyed + 1
+            Simulation.instance.logger.log('PLAYER', 'SURVEY', f'Surveyed tile at ({tile.x}, {tile.y}) for ${PriceManager.instance.get_survey_cost()}')
             return True
         return False
     
     def sell_resources(self, deposit_building, resource_type, amount, price_per_unit):
         """Sell resources from a deposit building"""
-        resources = None
-        
         # Check if deposit_building is a Building or a Tile with building_instance
         if hasattr(deposit_building, 'resources'):
             # It's already a Building object
-            resources = deposit_building.resources
+            building = deposit_building
         elif hasattr(deposit_building, 'building_instance') and deposit_building.building_instance:
             # It's a Tile with a building_instance
-            resources = deposit_building.building_instance.resources
+            building = deposit_building.building_instance
         else:
             # Neither a Building nor a Tile with building_instance
             return False
+        resources = building.resources
             
         if resource_type in resources and resources[resource_type] >= amount:
-            resources[resource_type] -= amount
+            building.remove_resource(resource_type, amount)
             revenue = amount * price_per_unit
             self.money += revenue
             # Update stats
-            from game import Game
-            Game.instance.stats.total_money_generated += revenue
+            from simulation import Simulation
+            Simulation.instance.stats.total_money_generated += revenue
             return True
         return False
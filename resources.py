@@ -0,0 +1,126 @@
+import numpy as np
+from config import RESOURCE_TYPES, PROCESSED_RESOURCES
+
+# Fixed integer ids for every resource type (raw resources first, then processed goods).
+# Array-backed structures index by these ids instead of resource name strings.
+RESOURCE_NAMES = list(RESOURCE_TYPES) + [r for r in PROCESSED_RESOURCES if r not in RESOURCE_TYPES]
+RESOURCE_IDS = {name: i for i, name in enumerate(RESOURCE_NAMES)}
+NUM_RESOURCES = len(RESOURCE_NAMES)
+EMPTY_ID = RESOURCE_IDS['EMPTY']
+
+class Inventory:
+    """Resource amounts stored in a fixed-size vector indexed by resource id
+
+    Behaves like the {resource: amount} dict it replaces (a resource stays listed,
+    even at zero, until it is deleted) while keeping the total amount and the number
+    of listed resource types up to date, so capacity checks are O(1).
+    """
+    __slots__ = ('amounts', 'order', 'total')
+    
+    def __init__(self):
+        self.amounts = np.zeros(NUM_RESOURCES, dtype=np.int64)
+        self.order = []  # Listed resource ids, in the order they were first stored
+        self.total = 0  # Sum of all amounts
+    
+    def __len__(self):
+        """Number of listed resource types"""
+        return len(self.order)
+    
+    def __contains__(self, resource):
+        return RESOURCE_IDS.get(resource) in self.order
+    
+    def __getitem__(self, resource):
+        resource_id = RESOURCE_IDS[resource]
+        if resource_id not in self.order:
+            raise KeyError(resource)
+        return int(self.amounts[resource_id])
+    
+    def __setitem__(self, resource, amount):
+        resource_id = RESOURCE_IDS[resource]
+        if resource_id not in self.order:
+            self.order.append(resource_id)
+        self.total += amount - int(self.amounts[resource_id])
+        self.amounts[resource_id] = amount
+    
+    def __delitem__(self, resource):
+        resource_id = RESOURCE_IDS[resource]
+        if resource_id not in self.order:
+            raise KeyError(resource)
+        self.order.remove(resource_id)
+        self.total -= int(self.amounts[resource_id])
+        self.amounts[resource_id] = 0
+    
+    def __iter__(self):
+        return iter(self.keys())
+    
+    def get(self, resource, default=0):
+        resource_id = RESOURCE_IDS.get(resource)
+        if resource_id is None or resource_id not in self.order:
+            return default
+        return int(self.amounts[resource_id])
+    
+    def keys(self):
+        return [RESOURCE_NAMES[i] for i in self.order]
+    
+    def values(self):
+        return [int(self.amounts[i]) for i in self.order]
+    
+    def items(self):
+        return [(RESOURCE_NAMES[i], int(self.amounts[i])) for i in self.order]
+    
+    def add(self, resource, amount):
+        """Add to a resource's amount, listing it if needed"""
+        resource_id = RESOURCE_IDS[resource]
+        if resource_id not in self.order:
+            self.order.append(resource_id)
+        self.amounts[resource_id] += amount
+        self.total += amount
+    
+    def stocked(self):
+        """Names of the resources with a positive amount"""
+        return [RESOURCE_NAMES[i] for i in self.order if self.amounts[i] > 0]
+
+class ResourceMap:
+    """Dict-style view of a per-resource array (one value per resource id)
+
+    Reads and writes go straight to the underlying array, so code that works on whole
+    arrays and code that looks up single resources by name share the same storage.
+    """
+    __slots__ = ('array',)
+    
+    def __init__(self, array):
+        self.array = array
+    
+    def __len__(self):
+        return NUM_RESOURCES
+    
+    def __contains__(self, resource):
+        return resource in RESOURCE_IDS
+    
+    def __iter__(self):
+        return iter(RESOURCE_NAMES)
+    
+    def __getitem__(self, resource):
+        return float(self.array[RESOURCE_IDS[resource]])
+    
+    def __setitem__(self, resource, value):
+        self.array[RESOURCE_IDS[resource]] = value
+    
+    def get(self, resource, default=None):
+        resource_id = RESOURCE_IDS.get(resource)
+        if resource_id is None:
+            return default
+        return float(self.array[resource_id])
+    
+    def keys(self):
+        return list(RESOURCE_NAMES)
+    
+    def values(self):
+        return self.array.tolist()
+    
+    def items(self):
+        return list(zip(RESOURCE_NAMES, self.array.tolist()))
+    
+    def copy(self):
+        """Snapshot as a plain dict"""
+        return dict(self.items())
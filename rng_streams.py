@@ -0,0 +1,63 @@
+"""Seeded random number streams, one per subsystem
+
+Every subsystem (world generation, market, each AI factory, commerce decisions)
+draws from its own stream derived from a single master seed, so a seed fully
+determines a run, and one subsystem drawing more or fewer numbers never shifts
+another's sequence. Streams are derived from the stream name, not creation order.
+"""
+import random
+import zlib
+
+import numpy as np
+
+import config
+
+_master_seed = None
+_randoms = {}  # Stream name -> random.Random
+_generators = {}  # Stream name -> numpy Generator
+
+
+def reset(seed=None):
+    """Start fresh streams from `seed` (config.MASTER_SEED, or a new random seed, if None)
+
+    Returns the master seed in use, so an unseeded run can still be reproduced.
+    """
+    global _master_seed
+    if seed is None:
+        seed = config.MASTER_SEED
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % 2**63)
+    _master_seed = seed
+    _randoms.clear()
+    _generators.clear()
+    return seed
+
+
+def master_seed():
+    """The master seed of the current streams"""
+    if _master_seed is None:
+        reset()
+    return _master_seed
+
+
+def _seed_sequence(name):
+    # crc32 rather than hash(): string hashes change between processes
+    return np.random.SeedSequence([master_seed(), zlib.crc32(name.encode())])
+
+
+def get_random(name):
+    """The random.Random stream for a subsystem"""
+    stream = _randoms.get(name)
+    if stream is None:
+        stream = random.Random(int(_seed_sequence(name).generate_state(2, np.uint64)[0]))
+        _randoms[name] = stream
+    return stream
+
+
+def get_generator(name):
+    """The NumPy Generator stream for a subsystem (independent of its random.Random stream)"""
+    generator = _generators.get(name)
+    if generator is None:
+        generator = np.random.default_rng(_seed_sequence(name + ':numpy'))
+        _generators[name] = generator
+    return generator
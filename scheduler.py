@@ -0,0 +1,52 @@
+import heapq
+import itertools
+
+# Slack for floating point drift between scheduled times and the accumulated clock
+EPSILON = 1e-9
+
+class Scheduler:
+    """Priority queue of building wake-ups on the simulation clock
+
+    Each building has at most one live wake-up. Scheduling an earlier one replaces it;
+    replaced entries stay in the heap and are skipped when popped.
+    """
+    def __init__(self, clock):
+        self.clock = clock
+        self.heap = []  # (wake time, sequence, building)
+        self.pending = {}  # Building -> (wake time, sequence) of its live entry
+        self.sequence = itertools.count()  # Tie-breaker so buildings are never compared
+
+    def schedule(self, building, delay):
+        """Wake the building `delay` simulated seconds from now (keeps an earlier wake-up)"""
+        wake_time = self.clock.now + max(0, delay)
+        current = self.pending.get(building)
+        if current is not None and current[0] <= wake_time:
+            return
+        entry = (wake_time, next(self.sequence))
+        self.pending[building] = entry
+        heapq.heappush(self.heap, (entry[0], entry[1], building))
+
+    def cancel(self, building):
+        """Forget any pending wake-up for the building"""
+        self.pending.pop(building, None)
+
+    def pop_due(self, now):
+        """Remove and return the buildings due at or before `now`, earliest first"""
+        return [building for _, building in self.pop_due_entries(now)]
+
+    def pop_due_entries(self, now):
+        """Like pop_due, but as (wake time, building) pairs
+
+        A wake time may be up to EPSILON after `now` (the clock drifted just short of it).
+        """
+        due = []
+        heap = self.heap
+        while heap and heap[0][0] <= now + EPSILON:
+            wake_time, sequence, building = heapq.heappop(heap)
+            if self.pending.get(building) == (wake_time, sequence):
+                del self.pending[building]
+                due.append((wake_time, building))
+        return due
+
+    def __len__(self):
+        return len(self.pending)
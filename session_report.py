@@ -0,0 +1,41 @@
+"""End-of-session report graphs
+
+Kept out of session_saver so matplotlib is only imported when a report is actually
+produced (at game end), not at every game launch. matplotlib is optional: without
+it the graphs are skipped and the CSV data is still saved.
+"""
+import os
+
+
+def generate_market_graph(timestamps, resources, prices, session_dir):
+    """Plot market price history to market.png
+    `prices` has one row per timestamp and one column per name in `resources`
+    Returns the image path, or None if nothing was plotted"""
+    if not len(timestamps):
+        return None
+    try:
+        # Figure (not pyplot) draws straight to file: no GUI backend, no global figure state
+        from matplotlib.figure import Figure
+    except ImportError:
+        print("matplotlib is not installed, skipping the market graph")
+        return None
+
+    # Create a graph showing the price variation of all resources
+    figure = Figure(figsize=(12, 8))
+    axes = figure.add_subplot()
+
+    minutes = timestamps / 60  # Convert to minutes
+    for name, column in sorted(zip(resources, range(len(resources)))):
+        axes.plot(minutes, prices[:, column], label=name, linewidth=2)
+
+    axes.set_xlabel('Time (minutes)')
+    axes.set_ylabel('Price ($)')
+    axes.set_title('Resource Price Fluctuation')
+    axes.grid(True, alpha=0.3)
+    axes.legend(loc='upper left', bbox_to_anchor=(1, 1))
+    figure.tight_layout()
+
+    # Save the graph
+    graph_path = os.path.join(session_dir, "market.png")
+    figure.savefig(graph_path)
+    return graph_path
@@ -1,133 +1,134 @@
 import os
-import time
-import csv
+import numpy as np
 import pygame
-import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from logger import GameLogger
-from config import MARKET_UPDATE_INTERVAL
+from log_writer import LogWriter
+from market_history import MarketHistory, load_history
+from world import BUILDING_NAMES, get_sprite_key
+from world_renderer import TileSprites
+from resources import RESOURCE_NAMES
+from config import TILE_SIZE
+
+# Log category -> (file name, header) of the session's log files
+LOG_TABLE_HEADER = "Time | Source | Action | Description\n-----|--------|--------|------------\n"
+LOG_FILES = {
+    'player': ("player_logs.txt", "# Player Logs\n\n" + LOG_TABLE_HEADER),
+    'ai': ("ai_logs.txt", "# AI Logs\n\n" + LOG_TABLE_HEADER),
+    'building': ("building_logs.txt", "# Building Logs\n\n" + LOG_TABLE_HEADER),
+}
+
+class SessionSnapshot:
+    """Copy of everything a session export writes, taken on the game thread
+
+    The export runs in the background while the game keeps going, so it only ever
+    reads this copy, never the live world, market or stats.
+    """
+    def __init__(self, game, market_history):
+        world = getattr(game, 'world', None)
+        self.has_world = bool(world)
+        if world:
+            self.width = world.width
+            self.height = world.height
+            self.resource_ids = world.resource_ids.copy()
+            self.owner_ids = world.owner_ids.copy()
+            self.building_ids = world.building_ids.copy()
+            self.prices = world.prices.copy()
+            self.surveyed = world.surveyed.copy()
+            self.owner_names = list(world.owner_names)
+            self.owner_colors = [world.get_owner_color(owner) for owner in self.owner_names]
+        
+        # The history file is append-only, so its first `market_count` samples stay as
+        # they are now; the export reads them back itself instead of the game thread
+        self.resources = list(market_history.resources)
+        self.market_path = market_history.path
+        self.market_samples = None
+        if self.market_path:
+            market_history.flush()
+        else:
+            self.market_samples = market_history.samples().copy()
+        self.market_count = len(market_history)
+        
+        self.stats = None  # Lines of the stats display
+        self.personal_best = None  # Formatted time, if this is a personal best
+        stats = getattr(game, 'stats', None)
+        if stats:
+            self.stats = stats.get_stats_display()
+            if hasattr(stats, 'personal_best_time') and stats.is_personal_best():
+                self.personal_best = stats.format_time(stats.time_played)
+    
+    def get_market_samples(self):
+        """Market history samples up to the snapshot (reads the history file on first use)"""
+        if self.market_samples is None:
+            self.market_samples = load_history(self.market_path, self.market_count)[1]
+        return self.market_samples
 
 class SessionSaver:
     """Class to handle saving session data to files"""
     def __init__(self, game):
         self.game = game
-        self.session_start_time = time.time()
+        self.clock = game.clock
+        self.session_start_time = self.clock.now
         self.session_id = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         self.session_dir = os.path.join("sessions", self.session_id)
-        self.player_logs = []
-        self.ai_logs = []
-        self.building_logs = []
-        self.market_data = []  # Format: [timestamp, {resource: price, ...}]
         
         # Create session directory if it doesn't exist
         if not os.path.exists("sessions"):
             os.mkdir("sessions")
         os.mkdir(self.session_dir)
         
-        # Initialize market data collection
-        self._record_market_data()
-    
-    def _record_market_data(self):
-        """Record current market data"""
+        # Logs are streamed to append-only files as they happen
+        self.log_writer = LogWriter(self.session_dir, LOG_FILES)
+        
+        # Market history is recorded by the simulation after every price update
+        # and written to the session directory in binary chunks
+        self.market_history = MarketHistory(os.path.join(self.session_dir, "market_history.bin"),
+                                             self.session_start_time)
         if hasattr(self.game, 'market') and self.game.market:
-            timestamp = time.time() - self.session_start_time
-            self.market_data.append([timestamp, self.game.market.prices.copy()])
-    
-    def capture_log(self, source, action_type, description, category):
-        """Store logs by category for later saving"""
-        log_entry = {
-            'time': time.time() - self.session_start_time,
-            'source': source,
-            'action': action_type,
-            'description': description
-        }
+            self.market_history.record(self.clock.now, self.game.market)
+            self.game.market_history = self.market_history
         
-        if category == 'player':
-            self.player_logs.append(log_entry)
-        elif category == 'ai':
-            self.ai_logs.append(log_entry)
-        elif category == 'building':
-            self.building_logs.append(log_entry)
+        # Session exports run one at a time on a background thread
+        self.exporter = ThreadPoolExecutor(max_workers=1, thread_name_prefix='SessionExport')
+        self.exports = []  # Futures of the exports started so far
+        self.export_progress = None  # (steps done, total steps, current step) of the latest export
     
-    def update(self, dt):
-        """Update session data collection on market update interval"""
-        if hasattr(self.game, 'time_since_update') and self.game.time_since_update == 0:
-            # Market prices just updated, record the data
-            self._record_market_data()
+    def capture_log(self, source, action_type, description, category):
+        """Stream a log entry to its category's log file"""
+        time_str = f"{self.clock.now - self.session_start_time:.2f}s"
+        self.log_writer.write(category, f"{time_str} | {source} | {action_type} | {description}")
     
-    def save_market_data_csv(self):
+    def save_market_data_csv(self, snapshot):
         """Save market price history to CSV file"""
-        if not self.market_data:
+        samples = snapshot.get_market_samples()
+        if not len(samples):
             return
         
         csv_path = os.path.join(self.session_dir, "market.csv")
         
-        # Get all resource types that have appeared in the market data
-        resources = set()
-        for _, prices in self.market_data:
-            resources.update(prices.keys())
-        
-        resources = sorted(resources)  # Sort for consistent order
-        
-        with open(csv_path, 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            
-            # Write header row
-            header = ['Time'] + resources
-            writer.writerow(header)
-            
-            # Write data rows
-            for timestamp, prices in self.market_data:
-                row = [f"{timestamp:.2f}"]
-                for resource in resources:
-                    row.append(prices.get(resource, ""))
-                writer.writerow(row)
+        # Resource columns in alphabetical order, dumped straight from the price columns
+        resources = snapshot.resources
+        order = np.argsort(resources)
+        header = ','.join(['Time'] + [resources[i] for i in order])
+        table = np.column_stack([samples['time'], samples['price'][:, order]])
+        # Full precision: prices are float32 in the history (about 7 significant digits;
+        # more would only print conversion noise), times are float64
+        fmt = ['%.10g'] + ['%.7g'] * len(order)
+        np.savetxt(csv_path, table, fmt=fmt, delimiter=',', header=header, comments='')
     
-    def generate_market_graph(self):
+    def generate_market_graph(self, snapshot):
         """Generate a graph of market price changes"""
-        if not self.market_data:
-            return
-        
-        # Get all resource types that have appeared in the market data
-        resources = set()
-        for _, prices in self.market_data:
-            resources.update(prices.keys())
-        
-        # Create a graph showing the price variation of all resources
-        plt.figure(figsize=(12, 8))
-        
-        # Extract times and prices for each resource
-        timestamps = [data[0] / 60 for data in self.market_data]  # Convert to minutes
-        
-        for resource in sorted(resources):
-            prices = []
-            for _, price_data in self.market_data:
-                prices.append(price_data.get(resource, None))
-            
-            # Filter out None values
-            valid_points = [(t, p) for t, p in zip(timestamps, prices) if p is not None]
-            if valid_points:
-                t_vals, p_vals = zip(*valid_points)
-                plt.plot(t_vals, p_vals, label=resource, linewidth=2)
-        
-        plt.xlabel('Time (minutes)')
-        plt.ylabel('Price ($)')
-        plt.title('Resource Price Fluctuation')
-        plt.grid(True, alpha=0.3)
-        plt.legend(loc='upper left', bbox_to_anchor=(1, 1))
-        plt.tight_layout()
-        
-        # Save the graph
-        graph_path = os.path.join(self.session_dir, "market.png")
-        plt.savefig(graph_path)
-        plt.close()
+        # Loaded on demand: plotting pulls in matplotlib, which is slow to import
+        from session_report import generate_market_graph
+        samples = snapshot.get_market_samples()
+        generate_market_graph(samples['time'], snapshot.resources, samples['price'], self.session_dir)
     
-    def save_world_data(self):
+    def save_world_data(self, snapshot):
         """Save world data as a markdown table"""
-        if not hasattr(self.game, 'world') or not self.game.world:
+        if not snapshot.has_world:
             return
         
-        world = self.game.world
         md_path = os.path.join(self.session_dir, "world.md")
         
         with open(md_path, 'w') as mdfile:
@@ -136,125 +137,129 @@ class SessionSaver:
             
             # Write the table header
             mdfile.write("| Coordinates |")
-            for x in range(world.width):
+            for x in range(snapshot.width):
                 mdfile.write(f" {x} |")
             mdfile.write("\n")
             
             # Write the header separator
             mdfile.write("|------------|")
-            for x in range(world.width):
+            for x in range(snapshot.width):
                 mdfile.write("---|")
             mdfile.write("\n")
             
+            # Owner labels by owner id
+            owner_labels = [""]
+            for owner in snapshot.owner_names[1:]:
+                owner_labels.append("(P)" if owner == 'player' else f"(AI-{owner.split('_')[1]})")
+            
             # Write the table rows
-            for y in range(world.height):
+            for y in range(snapshot.height):
                 mdfile.write(f"| **{y}** |")
-                for x in range(world.width):
-                    if (x, y) in world.tiles:
-                        tile = world.tiles[(x, y)]
-                        
-                        # Format the cell content
-                        resource = tile.resource_type if tile.surveyed else "?"
-                        owner = ""
-                        if tile.owner:
-                            if tile.owner == 'player':
-                                owner = "(P)"
-                            else:
-                                ai_id = tile.owner.split('_')[1]
-                                owner = f"(AI-{ai_id})"
-                        
-                        building = f"[{tile.building}]" if tile.building else ""
-                        price = f"${tile.price}" if tile.surveyed else "$?"
-                        
-                        mdfile.write(f" {resource} {owner} {building} - {price} |")
-                    else:
-                        mdfile.write(" |")
+                for x in range(snapshot.width):
+                    # Format the cell content
+                    surveyed = snapshot.surveyed[x, y]
+                    resource = RESOURCE_NAMES[snapshot.resource_ids[x, y]] if surveyed else "?"
+                    owner = owner_labels[snapshot.owner_ids[x, y]]
+                    building = BUILDING_NAMES[snapshot.building_ids[x, y]]
+                    building = f"[{building}]" if building else ""
+                    price = f"${snapshot.prices[x, y]}" if surveyed else "$?"
+                    
+                    mdfile.write(f" {resource} {owner} {building} - {price} |")
                 mdfile.write("\n")
     
-    def capture_world_image(self):
+    def capture_world_image(self, snapshot):
         """Capture an image of the entire world"""
-        if not hasattr(self.game, 'world') or not self.game.world:
+        if not snapshot.has_world:
             return
         
-        world = self.game.world
-        
-        # Calculate the size needed for the entire world
-        width = world.width * 50  # TILE_SIZE
-        height = world.height * 50  # TILE_SIZE
-        
         # Create a surface big enough to render the entire world
-        surface = pygame.Surface((width, height))
+        surface = pygame.Surface((snapshot.width * TILE_SIZE, snapshot.height * TILE_SIZE))
         surface.fill((0, 0, 0))  # Black background
         
-        # Draw the world on this surface without camera offset
-        world.draw(surface, (0, 0))
+        # Draw every tile without camera offset, from a sprite cache of our own
+        # (the shared one belongs to the game thread)
+        sprites = TileSprites()
+        for x in range(snapshot.width):
+            for y in range(snapshot.height):
+                key = get_sprite_key(snapshot.owner_colors[snapshot.owner_ids[x, y]],
+                                     RESOURCE_NAMES[snapshot.resource_ids[x, y]],
+                                     BUILDING_NAMES[snapshot.building_ids[x, y]],
+                                     snapshot.surveyed[x, y])
+                surface.blit(sprites.get(TILE_SIZE, *key), (x * TILE_SIZE, y * TILE_SIZE))
         
         # Save the surface as an image
         image_path = os.path.join(self.session_dir, "world.png")
         pygame.image.save(surface, image_path)
     
-    def save_stats(self):
+    def save_stats(self, snapshot):
         """Save player stats from game finish"""
-        if hasattr(self.game, 'stats'):
-            stats = self.game.stats
-            stats_path = os.path.join(self.session_dir, "player_stats.txt")
+        if snapshot.stats is None:
+            return
+        stats_path = os.path.join(self.session_dir, "player_stats.txt")
+        
+        with open(stats_path, 'w') as statsfile:
+            statsfile.write("# Player Statistics\n\n")
+            
+            # Write regular stats
+            for stat in snapshot.stats:
+                statsfile.write(f"{stat}\n")
             
-            with open(stats_path, 'w') as statsfile:
-                statsfile.write("# Player Statistics\n\n")
-                
-                # Write regular stats
-                stats_list = stats.get_stats_display()
-                for stat in stats_list:
-                    statsfile.write(f"{stat}\n")
-                
-                # If this is a personal best time, mark it as such for future reference
-                if hasattr(stats, 'personal_best_time') and stats.is_personal_best():
-                    statsfile.write("\n# This is a personal best time!\n")
-                    statsfile.write(f"Personal Best Time: {stats.format_time(stats.time_played)}\n")
+            # If this is a personal best time, mark it as such for future reference
+            if snapshot.personal_best:
+                statsfile.write("\n# This is a personal best time!\n")
+                statsfile.write(f"Personal Best Time: {snapshot.personal_best}\n")
     
     def save_logs(self):
-        """Save log files for each source category"""
-        # Save player logs
-        if self.player_logs:
-            player_log_path = os.path.join(self.session_dir, "player_logs.txt")
-            with open(player_log_path, 'w') as logfile:
-                logfile.write("# Player Logs\n\n")
-                logfile.write("Time | Source | Action | Description\n")
-                logfile.write("-----|--------|--------|------------\n")
-                
-                for log in self.player_logs:
-                    time_str = f"{log['time']:.2f}s"
-                    logfile.write(f"{time_str} | {log['source']} | {log['action']} | {log['description']}\n")
-        
-        # Save AI logs
-        if self.ai_logs:
-            ai_log_path = os.path.join(self.session_dir, "ai_logs.txt")
-            with open(ai_log_path, 'w') as logfile:
-                logfile.write("# AI Logs\n\n")
-                logfile.write("Time | Source | Action | Description\n")
-                logfile.write("-----|--------|--------|------------\n")
-                
-                for log in self.ai_logs:
-                    time_str = f"{log['time']:.2f}s"
-                    logfile.write(f"{time_str} | {log['source']} | {log['action']} | {log['description']}\n")
-        
-        # Save building logs
-        if self.building_logs:
-            building_log_path = os.path.join(self.session_dir, "building_logs.txt")
-            with open(building_log_path, 'w') as logfile:
-                logfile.write("# Building Logs\n\n")
-                logfile.write("Time | Source | Action | Description\n")
-                logfile.write("-----|--------|--------|------------\n")
-                
-                for log in self.building_logs:
-                    time_str = f"{log['time']:.2f}s"
-                    logfile.write(f"{time_str} | {log['source']} | {log['action']} | {log['description']}\n")
+        """Make sure every captured log line is on disk"""
+        self.log_writer.flush()
     
     def save_session(self):
-        """Save all session data to files"""
-        self.save_logs()
-        self.save_world_data()
-        self.save_market_data_csv()
-        self.generate_market_graph()
-        self.capture_world_image()
-        self.save_stats()
+        """Start saving all session data to files in the background
+        Returns the export's future"""
+        # Report rate-limited bursts so the saved logs account for them
+        self.game.logger.flush_suppressed()
+        # Everything the export reads is copied now, on the game thread
+        snapshot = SessionSnapshot(self.game, self.market_history)
+        future = self.exporter.submit(self._export, snapshot)
+        self.exports.append(future)
+        return future
+    
+    def _export(self, snapshot):
+        """Write out a snapshot (runs on the export thread)"""
+        steps = [
+            ("logs", lambda snapshot: self.save_logs()),
+            ("world table", self.save_world_data),
+            ("market data", self.save_market_data_csv),
+            ("market graph", self.generate_market_graph),
+            ("world image", self.capture_world_image),
+            ("stats", self.save_stats),
+        ]
+        for i, (name, step) in enumerate(steps):
+            self.export_progress = (i, len(steps), name)
+            try:
+                step(snapshot)
+            except Exception as e:
+                # One failed file should not cost the rest of the session data
+                print(f"Session export: saving the {name} failed: {e}")
+        self.export_progress = (len(steps), len(steps), None)
+    
+    def is_exporting(self):
+        """Whether an export is still running or waiting to run"""
+        return any(not future.done() for future in self.exports)
+    
+    def get_export_status(self):
+        """One line describing the latest export for the UI, or None before the first export"""
+        if self.export_progress is None:
+            return None
+        done, total, step = self.export_progress
+        if step is None:
+            return f"Session saved to {self.session_dir}"
+        return f"Saving session: {step} ({done}/{total})"
+    
+    def close(self):
+        """Wait for exports in flight, then finish writing the session's logs and market history
+        (call when the session ends)"""
+        self.exporter.shutdown(wait=True)
+        self.game.logger.flush_suppressed()
+        self.log_writer.close()
+        self.market_history.flush()
@@ -0,0 +1,67 @@
+from config import SIM_TIME_SCALE, SIM_MIN_TIME_SCALE, SIM_MAX_TIME_SCALE, SIM_FIXED_STEP, SIM_MAX_STEP, SIM_MAX_STEPS_PER_TICK
+
+class SimClock:
+    """Single source of simulated time shared by every subsystem
+
+    Subsystems read `now` (simulated seconds since the clock was created) instead of
+    the wall clock, so the simulation behaves the same when paused, scaled or stepped
+    headless as fast as possible.
+    """
+    def __init__(self, time_scale=SIM_TIME_SCALE, fixed_step=SIM_FIXED_STEP):
+        self.now = 0.0  # Simulated seconds elapsed
+        self.time_scale = 1.0
+        self.set_time_scale(time_scale)
+        self.paused = False
+        self.fixed_step = fixed_step  # Seconds per step, or None for variable steps
+        self.max_step = SIM_MAX_STEP  # Largest single step in variable mode
+        self.max_steps_per_tick = SIM_MAX_STEPS_PER_TICK
+        self.accumulator = 0.0  # Unconsumed simulated time in fixed-step mode
+
+    def set_time_scale(self, scale):
+        """Set how many simulated seconds pass per real second (clamped to the allowed range)"""
+        self.time_scale = max(SIM_MIN_TIME_SCALE, min(SIM_MAX_TIME_SCALE, scale))
+
+    def pause(self):
+        """Stop simulated time from passing"""
+        self.paused = True
+
+    def resume(self):
+        """Let simulated time pass again"""
+        self.paused = False
+
+    def toggle_pause(self):
+        """Switch between paused and running"""
+        self.paused = not self.paused
+
+    def tick(self, real_dt):
+        """Convert a real frame duration into the list of simulation steps to run
+
+        In fixed-step mode every step is exactly `fixed_step` long and leftover time is
+        carried to the next tick. In variable mode the scaled frame time is split into
+        steps no longer than `max_step`, so high time scales keep the same per-step
+        granularity as real-time play.
+        """
+        if self.paused:
+            return []
+
+        sim_dt = real_dt * self.time_scale
+
+        if self.fixed_step:
+            self.accumulator += sim_dt
+            steps = []
+            while self.accumulator >= self.fixed_step and len(steps) < self.max_steps_per_tick:
+                self.accumulator -= self.fixed_step
+                steps.append(self.fixed_step)
+            # Drop time we could not catch up on rather than spiralling further behind
+            if len(steps) >= self.max_steps_per_tick:
+                self.accumulator = min(self.accumulator, self.fixed_step)
+            return steps
+
+        if sim_dt <= 0:
+            return []
+        num_steps = min(self.max_steps_per_tick, max(1, int(-(-sim_dt // self.max_step))))
+        return [sim_dt / num_steps] * num_steps
+
+    def advance(self, dt):
+        """Move simulated time forward by dt seconds (called once per simulation step)"""
+        self.now += dt
@@ -0,0 +1,116 @@
+import rng_streams
+from config import *
+from world import World
+from player import Player
+from economy import Market, PriceManager
+from ai import AIFactory
+from logger import GameLogger
+from stats import GameStats
+from sim_clock import SimClock
+
+class Simulation:
+    """Headless game core (world, economy, AI factories) stepped with an explicit dt"""
+    instance = None  # Class variable for global access
+
+    def __init__(self, clock=None, seed=None):
+        Simulation.instance = self  # Set up global instance
+
+        # Fresh per-subsystem random streams; the seed (config.MASTER_SEED by default) fully determines the run
+        self.seed = rng_streams.reset(seed)
+
+        # Single simulated time source read by every subsystem
+        self.clock = clock or SimClock()
+
+        # Game objects
+        from config import NUM_AI_PLAYERS
+        self.world = World(self.clock)  # World now uses WORLD_SIZE from config
+        self.player = Player()
+        self.market = Market(self.clock)
+        self.price_manager = PriceManager(self.clock)  # Initialize the price manager
+        self.logger = GameLogger(self.clock)
+        self.stats = GameStats(self.clock)  # Initialize stats tracker
+
+        # Set up player starting area
+        self.world.setup_player_start(self.player)
+
+        # Set up AI factories
+        self.ai_factories = []
+        self.world.setup_ai_factories()  # Uses NUM_AI_PLAYERS from config
+        for i in range(NUM_AI_PLAYERS):
+            self.ai_factories.append(AIFactory(i, self.world, self.clock, self.logger))
+
+        # Simulation state
+        self.game_over = False
+        self.steps = 0
+
+        # Optional session saver (attached by the rendering shell, None when headless)
+        self.session_saver = None
+
+        # Optional market_history.MarketHistory, recorded after every market update
+        self.market_history = None
+
+    def set_session_saver(self, saver):
+        """Attach a session saver and connect it to the logger"""
+        self.session_saver = saver
+        self.logger.set_session_saver(saver)
+
+    def step(self, dt):
+        """Advance the simulation by dt seconds"""
+        if self.game_over:
+            return
+
+        self.clock.advance(dt)
+        self.steps += 1
+
+        # Update price manager continuously
+        self.price_manager.update(dt)
+
+        # Update market prices periodically (the market tracks its own interval on the clock)
+        if self.market.update_prices():
+            # Occasionally create market shocks
+            if rng_streams.get_random('market').random() < MARKET_SHOCK_PROBABILITY:
+                affected_resources = self.market.create_market_shock()
+                # Log the market shock event
+                resources_str = ', '.join(affected_resources)
+                self.logger.log("MARKET", "SHOCK", f"Market shock affecting: {resources_str}")
+
+            # Update AI factories
+            for ai in self.ai_factories:
+                ai.update()
+
+            # Record the new prices
+            if self.market_history is not None:
+                self.market_history.record(self.clock.now, self.market)
+
+        # Update world (includes buildings)
+        self.world.update(dt)
+
+        # Check win condition
+        if self.player.money >= WIN_CONDITION:
+            self.game_over = True
+            # Stop the timer when the game ends
+            self.stats.stop_timer()
+
+            # Log win message with time
+            time_played_str = self.stats.format_time(self.stats.time_played)
+            win_message = f"You've reached the goal of $1,000,000! Time: {time_played_str}"
+
+            # Check if this is a new personal best
+            if self.stats.is_personal_best():
+                win_message += " (New Personal Best!)"
+            self.logger.log('GAME', 'WIN', win_message)
+
+            # Save session data when game ends
+            if self.session_saver:
+                self.session_saver.save_session()
+
+    def run(self, duration, dt=1/60):
+        """Step the simulation as fast as possible for `duration` simulated seconds
+        Returns the number of steps taken (stops early if the game ends)"""
+        steps = 0
+        for _ in range(int(round(duration / dt))):
+            if self.game_over:
+                break
+            self.step(dt)
+            steps += 1
+        return steps
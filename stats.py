@@ -1,15 +1,17 @@
-import time
 import os
+from sim_clock import SimClock
 
 class GameStats:
     """Class to track game statistics"""
-    def __init__(self):
+    def __init__(self, clock=None):
+        # Simulated time source for time played
+        self.clock = clock or SimClock()
         # Initialize all stats
         self.tiles_owned = 0
         self.total_money_generated = 0
         self.total_money_spent = 0
         self.num_buildings = 0
-        self.start_time = time.time()
+        self.start_time = self.clock.now
         self.time_played = 0
         self.timer_stopped = False
         self.tiles_surveyed = 0
@@ -18,12 +20,12 @@ class GameStats:
     def update_time_played(self):
         """Update the time played stat"""
         if not self.timer_stopped:
-            self.time_played = time.time() - self.start_time
+            self.time_played = self.clock.now - self.start_time
     
     def stop_timer(self):
         """Stop the timer and record final time played"""
         if not self.timer_stopped:
-            self.time_played = time.time() - self.start_time
+            self.time_played = self.clock.now - self.start_time
             self.timer_stopped = True
             # Check if this is a new personal best
             if self.is_personal_best():
@@ -0,0 +1,91 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from config import DEPOSIT_SIZE
+from deposit_index import DepositIndex, LINEAR_SCAN_LIMIT
+from resources import Inventory
+
+
+class Deposit:
+    def __init__(self, x, y, owner='player'):
+        self.tile = SimpleNamespace(x=x, y=y, owner=owner)
+        self.resources = Inventory()
+
+
+def linear_scan(deposits, x, y, accept):
+    """The search the index replaced: scan the map column by column, keep the first strictly closer deposit"""
+    by_position = {(d.tile.x, d.tile.y): d for d in deposits}
+    best = None
+    best_distance = float('inf')
+    for px in range(WIDTH):
+        for py in range(HEIGHT):
+            deposit = by_position.get((px, py))
+            if deposit and accept(deposit):
+                distance = abs(px - x) + abs(py - y)
+                if distance < best_distance:
+                    best, best_distance = deposit, distance
+    return best
+
+
+WIDTH = HEIGHT = 60
+
+
+def build_index(rng, count):
+    index = DepositIndex(WIDTH, HEIGHT)
+    positions = rng.sample([(x, y) for x in range(WIDTH) for y in range(HEIGHT)], count)
+    deposits = []
+    for x, y in positions:
+        deposit = Deposit(x, y)
+        if rng.random() < 0.5:
+            deposit.resources['WOOD'] = rng.randint(0, 3)
+        if rng.random() < 0.2:
+            deposit.resources['STONE'] = DEPOSIT_SIZE  # Full
+        index.add(deposit)
+        deposits.append(deposit)
+    return index, deposits
+
+
+# Both sides of LINEAR_SCAN_LIMIT, so the direct scan and the grid ring walk are covered
+@pytest.mark.parametrize('count', [5, LINEAR_SCAN_LIMIT + 1, 200])
+def test_nearest_matches_linear_scan(count):
+    rng = random.Random(count)
+    index, deposits = build_index(rng, count)
+    for _ in range(200):
+        x, y = rng.randrange(WIDTH), rng.randrange(HEIGHT)
+        assert index.nearest_with_space('player', x, y) is linear_scan(
+            deposits, x, y, lambda d: d.resources.total < DEPOSIT_SIZE)
+        assert index.nearest_with_resource('player', x, y, 'WOOD') is linear_scan(
+            deposits, x, y, lambda d: d.resources.get('WOOD', 0) >= 1)
+        assert index.nearest_with_resource('player', x, y, 'WOOD', 2) is linear_scan(
+            deposits, x, y, lambda d: d.resources.get('WOOD', 0) >= 2)
+
+
+def test_ties_go_to_the_lowest_position():
+    index = DepositIndex(WIDTH, HEIGHT)
+    deposits = [Deposit(12, 10), Deposit(10, 12), Deposit(8, 10), Deposit(10, 8)]
+    for deposit in deposits:
+        index.add(deposit)
+    # All four are 2 tiles away; the column-major scan met (8, 10) first
+    assert index.nearest_with_space('player', 10, 10) is deposits[2]
+
+
+def test_updates_and_removal_are_tracked():
+    index = DepositIndex(WIDTH, HEIGHT)
+    near, far = Deposit(1, 1), Deposit(30, 30)
+    index.add(near)
+    index.add(far)
+    assert index.nearest_with_resource('player', 0, 0, 'WOOD') is None
+
+    far.resources['WOOD'] = 5
+    index.update(far)
+    assert index.nearest_with_resource('player', 0, 0, 'WOOD') is far
+
+    near.resources['STONE'] = DEPOSIT_SIZE
+    index.update(near)
+    assert index.nearest_with_space('player', 0, 0) is far
+
+    index.remove(far)
+    assert index.nearest_with_space('player', 0, 0) is None
+    assert index.nearest_with_space('ai_0', 0, 0) is None
@@ -0,0 +1,122 @@
+import pytest
+
+import config
+from config import DEPOSIT_SIZE, MAX_RESOURCE_TYPES_PER_DEPOSIT
+from resources import Inventory
+
+
+def test_inventory_behaves_like_a_dict():
+    inventory = Inventory()
+    inventory['WOOD'] = 5
+    inventory.add('STONE', 3)
+    inventory.add('WOOD', 2)
+    inventory['CLAY'] = 0
+    assert inventory.items() == [('WOOD', 7), ('STONE', 3), ('CLAY', 0)]
+    assert len(inventory) == 3 and 'CLAY' in inventory and 'COAL' not in inventory
+    assert inventory.get('COAL') == 0 and inventory.get('NOT_A_RESOURCE', -1) == -1
+    assert inventory.stocked() == ['WOOD', 'STONE']
+    with pytest.raises(KeyError):
+        inventory['COAL']
+
+    del inventory['WOOD']
+    assert inventory.keys() == ['STONE', 'CLAY']
+    assert inventory.total == 3
+    with pytest.raises(KeyError):
+        del inventory['WOOD']
+
+
+def test_inventory_total_tracks_every_change():
+    inventory = Inventory()
+    inventory['WOOD'] = 10
+    inventory['WOOD'] -= 4
+    inventory.add('STONE', 7)
+    inventory['STONE'] = 2
+    del inventory['WOOD']
+    inventory.add('WOOD', 1)
+    assert inventory.total == sum(inventory.values()) == 3
+
+
+@pytest.fixture
+def world(monkeypatch):
+    from world import World
+
+    monkeypatch.setattr(config, 'WORLD_SIZE', config.WORLD_SIZE_SMALL)
+    return World()
+
+
+def build(world, x, y, building_type, owner='player'):
+    tile = world.tiles[(x, y)]
+    tile.owner = owner
+    tile.set_building(building_type)
+    return tile.building_instance
+
+
+def test_capacity_limits(world):
+    deposit = build(world, 2, 2, 'DEPOSIT')
+    assert deposit.can_accept_resource('WOOD', DEPOSIT_SIZE)
+    assert not deposit.can_accept_resource('WOOD', DEPOSIT_SIZE + 1)
+
+    deposit.add_resource('WOOD', DEPOSIT_SIZE - 1)
+    assert deposit.can_accept_resource('WOOD', 1)
+    assert not deposit.can_accept_resource('WOOD', 2)
+
+    # Type limit: listed types (even at zero) take a slot until cleared
+    deposit.remove_resource('WOOD', DEPOSIT_SIZE - 1)
+    deposit.add_resource('STONE', 0)
+    deposit.add_resource('CLAY', 0)
+    assert len(deposit.resources) == MAX_RESOURCE_TYPES_PER_DEPOSIT
+    assert not deposit.can_accept_resource('COAL', 1)
+    assert deposit.can_accept_resource('WOOD', 1)
+    deposit.clear_resource('WOOD')
+    assert deposit.can_accept_resource('COAL', 1)
+
+
+def test_removing_more_than_held(world):
+    deposit = build(world, 2, 2, 'DEPOSIT')
+    deposit.add_resource('WOOD', 3)
+    # Like the dict it replaced, the amount goes negative rather than raising
+    deposit.remove_resource('WOOD', 5)
+    assert deposit.resources['WOOD'] == -2
+    assert deposit.get_total_resources() == -2
+    assert world.deposit_index.nearest_with_resource('player', 0, 0, 'WOOD') is None
+    deposit.add_resource('WOOD', 2)
+    assert deposit.get_total_resources() == 0
+
+
+def test_storage_changes_update_the_deposit_index(world):
+    deposit = build(world, 2, 2, 'DEPOSIT')
+    index = world.deposit_index
+
+    deposit.add_resource('WOOD', 4)
+    assert index.nearest_with_resource('player', 0, 0, 'WOOD', 4) is deposit
+    assert index.total_resources('player').sum() == 4
+
+    deposit.remove_resource('WOOD', 4)
+    assert index.nearest_with_resource('player', 0, 0, 'WOOD') is None
+    # Still listed at zero, so it keeps the slot for more wood
+    assert index.nearest_with_space('player', 0, 0, 'WOOD', prefer_holding=True) is deposit
+
+    deposit.add_resource('STONE', DEPOSIT_SIZE)
+    assert index.nearest_with_space('player', 0, 0) is None
+    deposit.clear_resource('STONE')
+    assert index.nearest_with_space('player', 0, 0) is deposit
+    assert index.total_resources('player').sum() == 0
+
+
+def test_storage_changes_wake_deposit_waiters(world):
+    deposit = build(world, 2, 2, 'DEPOSIT')
+    processor = build(world, 3, 2, 'PROCESSING')
+    other = build(world, 10, 10, 'PROCESSING', owner='ai_0')
+    world.scheduler.pop_due(world.clock.now)
+
+    world.wait_for_deposits(processor)
+    world.wait_for_deposits(other)
+    deposit.add_resource('WOOD', 1)
+    assert world.scheduler.pop_due(world.clock.now) == [processor]
+    assert other in world.deposit_waiters['ai_0']
+
+    # Non-deposit buildings do not touch the index or the waiters
+    world.wait_for_deposits(processor)
+    processor.add_resource('WOOD', 1)
+    assert world.scheduler.pop_due(world.clock.now) == []
+    assert world.deposit_index.total_resources('player').sum() == 1
@@ -0,0 +1,63 @@
+import os
+import threading
+
+import pytest
+
+from log_writer import LogWriter
+
+FILES = {'player': ("player_logs.txt", "# player\n"), 'ai': ("ai_logs.txt", "# ai\n")}
+
+
+def returns_promptly(func, timeout=5):
+    """Run func on a helper thread; True if it finished within the timeout"""
+    thread = threading.Thread(target=func, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return not thread.is_alive()
+
+
+def test_lines_are_written_with_headers(tmp_path):
+    writer = LogWriter(str(tmp_path), FILES, flush_interval=60)
+    writer.write('player', "one")
+    writer.write('other', "ignored")
+    writer.flush()
+    assert (tmp_path / "player_logs.txt").read_text() == "# player\none\n"
+    writer.write('player', "two")
+    writer.close()
+    assert (tmp_path / "player_logs.txt").read_text() == "# player\none\ntwo\n"
+    assert not (tmp_path / "ai_logs.txt").exists()
+
+
+def test_missing_directory_fails_without_hanging(tmp_path, capsys):
+    writer = LogWriter(str(tmp_path / "removed"), FILES, flush_interval=60)
+    for i in range(100):
+        writer.write('player', f"line {i}")
+    assert returns_promptly(writer.flush)
+    assert writer.failed
+    writer.write('ai', "dropped")
+    assert returns_promptly(writer.flush)
+    assert returns_promptly(writer.close)
+    assert not writer.thread.is_alive()
+    # Reported once
+    assert capsys.readouterr().out.count("Session logs can no longer be written") == 1
+
+
+@pytest.mark.skipif(not os.path.exists('/dev/full'), reason="needs /dev/full")
+def test_full_disk_on_flush_fails_without_hanging(capsys):
+    # /dev/full opens fine but every flush fails with ENOSPC
+    writer = LogWriter('/dev', {'player': ("full", "")}, flush_interval=60)
+    writer.write('player', "line")
+    assert returns_promptly(writer.flush)
+    assert writer.failed
+    assert returns_promptly(writer.close)
+    assert "Session logs can no longer be written" in capsys.readouterr().out
+
+
+def test_calls_after_close_return(tmp_path):
+    writer = LogWriter(str(tmp_path), FILES, flush_interval=60)
+    writer.close()
+    # A second close and later calls are no-ops
+    assert returns_promptly(writer.close)
+    assert returns_promptly(writer.flush)
+    writer.write('player', "late")
+    assert not (tmp_path / "player_logs.txt").exists()
@@ -0,0 +1,119 @@
+import pytest
+
+import logger
+from logger import GameLogger, DEBUG, INFO, WARNING
+from sim_clock import SimClock
+
+
+class Formatted:
+    """Argument that counts how often it is formatted"""
+    count = 0
+
+    def __str__(self):
+        Formatted.count += 1
+        return "formatted"
+
+
+class Saver:
+    """Collects what the logger would write to the session files"""
+    def __init__(self):
+        self.lines = []
+
+    def capture_log(self, source, action_type, description, category):
+        self.lines.append(description)
+
+
+@pytest.fixture
+def log():
+    clock = SimClock()
+    game_logger = GameLogger(clock)
+    game_logger.console_level = None
+    saver = Saver()
+    game_logger.set_session_saver(saver)
+    return game_logger, clock, saver.lines
+
+
+def test_records_below_level_are_not_formatted(log):
+    game_logger, _, lines = log
+    Formatted.count = 0
+    game_logger.log('PLAYER', 'DETAIL', "value %s", Formatted(), level=DEBUG)
+    assert Formatted.count == 0
+    assert lines == []
+    assert not game_logger.is_enabled(DEBUG)
+    game_logger.log('PLAYER', 'DETAIL', "value %s", Formatted())
+    assert Formatted.count == 1
+    assert lines == ["value formatted"]
+
+
+def test_repeats_at_a_location_are_rate_limited(log):
+    game_logger, clock, lines = log
+    for _ in range(5):
+        game_logger.log('COLLECTOR', 'ERROR', "stuck at %d", 1, location=(1, 1))
+        clock.advance(1)
+    assert lines == ["stuck at 1"]
+
+    clock.advance(game_logger.rate_limit_interval)
+    game_logger.log('COLLECTOR', 'ERROR', "stuck at %d", 1, location=(1, 1))
+    assert lines == ["stuck at 1", "stuck at 1 (4 more suppressed)"]
+
+
+def test_locations_and_actions_are_limited_separately(log):
+    game_logger, _, lines = log
+    game_logger.log('COLLECTOR', 'ERROR', "a", location=(1, 1))
+    game_logger.log('COLLECTOR', 'ERROR', "b", location=(2, 2))
+    game_logger.log('COLLECTOR', 'GATHER', "c", location=(1, 1))
+    game_logger.log('COLLECTOR', 'ERROR', "d")
+    game_logger.log('COLLECTOR', 'ERROR', "d")
+    assert lines == ["a", "b", "c", "d", "d"]
+
+
+def test_flush_reports_pending_bursts_once(log):
+    game_logger, clock, lines = log
+    game_logger.log('COLLECTOR', 'ERROR', "stuck %d", 0, location=(1, 1))
+    for i in range(1, 4):
+        clock.advance(1)
+        game_logger.log('COLLECTOR', 'ERROR', "stuck %d", i, location=(1, 1))
+    game_logger.log('COLLECTOR', 'ERROR', "single", location=(5, 5))
+
+    game_logger.flush_suppressed()
+    # The last dropped record stands for its burst
+    assert lines == ["stuck 0", "single", "stuck 3 (2 more suppressed)"]
+    game_logger.flush_suppressed()
+    assert len(lines) == 3
+
+
+def test_flush_forgets_expired_limits(log):
+    game_logger, clock, lines = log
+    game_logger.log('COLLECTOR', 'ERROR', "old", location=(1, 1))
+    clock.advance(game_logger.rate_limit_interval)
+    game_logger.log('COLLECTOR', 'ERROR', "recent", location=(2, 2))
+    game_logger.log('COLLECTOR', 'ERROR', "dropped", location=(2, 2))
+
+    game_logger.flush_suppressed()
+    assert list(game_logger.rate_limits) == [('COLLECTOR', 'ERROR', (2, 2))]
+    # The remaining limit still applies
+    game_logger.log('COLLECTOR', 'ERROR', "dropped", location=(2, 2))
+    game_logger.log('COLLECTOR', 'ERROR', "new", location=(1, 1))
+    assert lines == ["old", "recent", "dropped", "new"]
+
+
+def test_console_output_follows_console_level(log, capsys):
+    game_logger, _, _ = log
+    game_logger.console_level = WARNING
+    game_logger.log('PLAYER', 'BUY', "quiet", level=INFO)
+    game_logger.log('PLAYER', 'ERROR', "loud")
+    assert capsys.readouterr().out == "[PLAYER] [ERROR] loud\n"
+
+
+def test_messages_are_bounded(log):
+    game_logger, _, _ = log
+    game_logger.show['ai'] = False
+    for i in range(50):
+        game_logger.log('PLAYER', 'BUY', "player %d", i)
+        game_logger.log('AI-0', 'BUY', "ai %d", i)
+    assert len(game_logger.messages) == game_logger.max_messages
+    assert game_logger.messages[-1]['message'] == "[AI-0] [BUY] ai 49"
+    # Only shown categories reach the on-screen log
+    assert len(game_logger.visible) == game_logger.max_messages
+    assert game_logger.visible[-1]['message'] == "[PLAYER] [BUY] player 49"
+    assert logger.LEVELS['WARNING'] == WARNING
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from config import MARKET_PRICE_ADJUSTMENT_FACTOR, MARKET_MIN_PRICE_MULTIPLIER, MARKET_MAX_PRICE_MULTIPLIER
+from economy import MarketBatch
+
+
+def old_update(prices, base_prices, supply, demand, sell_volume, buy_volume, draws):
+    """The per-resource loop of the old Market.update_prices for one market, fed the given draws
+
+    Returns new (prices, supply, demand) lists.
+    """
+    volatility, event, global_draw, randomness, supply_drift, demand_drift = draws
+    market_volatility = volatility
+    global_modifier = 1.0
+    if event < 0.10:
+        global_modifier = global_draw
+
+    new_prices = []
+    for r in range(len(prices)):
+        ratio = max(1, demand[r]) / max(1, supply[r])
+        trading_pressure = 0
+        total_volume = sell_volume[r] + buy_volume[r]
+        if total_volume > 0:
+            trading_pressure = (buy_volume[r] - sell_volume[r]) / total_volume
+        adjustment = MARKET_PRICE_ADJUSTMENT_FACTOR * market_volatility
+        if ratio > 1:
+            supply_demand_change = min(adjustment, ratio - 1)
+        else:
+            supply_demand_change = max(-adjustment, ratio - 1)
+        trading_change = trading_pressure * adjustment
+        change = ((supply_demand_change + trading_change) / 2 + randomness[r]) * global_modifier
+        new_prices.append(max(base_prices[r] * MARKET_MIN_PRICE_MULTIPLIER,
+                              min(base_prices[r] * MARKET_MAX_PRICE_MULTIPLIER, prices[r] * (1 + change))))
+    new_supply = [max(5, supply[r] + supply_drift[r]) for r in range(len(prices))]
+    new_demand = [max(5, demand[r] + demand_drift[r]) for r in range(len(prices))]
+    return new_prices, new_supply, new_demand
+
+
+def step_draws(rng, num_markets, num_resources):
+    """The random draws of one step_markets call, in its draw order, split per market"""
+    volatility = rng.uniform(0.8, 1.5, num_markets)
+    event = rng.random(num_markets)
+    global_draw = rng.uniform(0.9, 1.1, num_markets)
+    shape = (num_markets, num_resources)
+    randomness = rng.uniform(-0.02, 0.02, shape)
+    supply_drift = rng.uniform(-10, 10, shape)
+    demand_drift = rng.uniform(-10, 10, shape)
+    return [(volatility[m], event[m], global_draw[m], randomness[m], supply_drift[m], demand_drift[m])
+            for m in range(num_markets)]
+
+
+@pytest.mark.parametrize('num_markets', [1, 4])
+def test_step_matches_per_resource_update(num_markets):
+    batch = MarketBatch(num_markets, np.random.default_rng(42))
+    trades = np.random.default_rng(7)
+    for _ in range(20):
+        # Some trading so the pressure term is exercised (in both directions and not at all)
+        batch.sell_volume[:] = trades.integers(0, 3, batch.prices.shape) * trades.integers(0, 20, batch.prices.shape)
+        batch.buy_volume[:] = trades.integers(0, 3, batch.prices.shape) * trades.integers(0, 20, batch.prices.shape)
+        replay = np.random.default_rng()
+        replay.bit_generator.state = batch.rng.bit_generator.state
+        draws = step_draws(replay, *batch.prices.shape)
+        expected = [old_update(batch.prices[m].tolist(), batch.base_prices[m].tolist(),
+                               batch.supply[m].tolist(), batch.demand[m].tolist(),
+                               batch.sell_volume[m].tolist(), batch.buy_volume[m].tolist(), draws[m])
+                    for m in range(num_markets)]
+
+        batch.step()
+
+        for m, (prices, supply, demand) in enumerate(expected):
+            np.testing.assert_allclose(batch.prices[m], prices, rtol=1e-12)
+            np.testing.assert_allclose(batch.supply[m], supply, rtol=1e-12)
+            np.testing.assert_allclose(batch.demand[m], demand, rtol=1e-12)
+        assert not batch.sell_volume.any() and not batch.buy_volume.any()
+        # Draws were consumed in exactly the replayed order
+        assert replay.bit_generator.state == batch.rng.bit_generator.state
+
+
+def test_fixed_seed_is_pinned():
+    batch = MarketBatch(1, np.random.default_rng(2024))
+    for _ in range(3):
+        batch.step()
+    # Resource id order (see resources.RESOURCE_NAMES); EMPTY has no price
+    np.testing.assert_allclose(batch.prices[0], [
+        0.0, 10.466179, 15.320848, 24.049845, 36.712603, 42.623583, 19.885619,
+        8.763499, 45.32083, 48.418988, 108.625694, 28.183139, 92.556582, 21.57919], atol=1e-6)
+    np.testing.assert_allclose(batch.supply[0], [
+        103.447844, 6.264728, 46.745369, 55.120348, 5.0, 139.20222, 95.566118,
+        112.241314, 21.678747, 52.394558, 30.054794, 13.048845, 10.60376, 5.0], atol=1e-6)
+    # Prices stay within the configured bounds of their base price
+    assert (batch.prices >= batch.base_prices * MARKET_MIN_PRICE_MULTIPLIER).all()
+    assert (batch.prices <= batch.base_prices * MARKET_MAX_PRICE_MULTIPLIER).all()
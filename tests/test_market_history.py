@@ -0,0 +1,86 @@
+import types
+
+import numpy as np
+import pytest
+
+from market_history import MarketHistory, load_history, record_dtype
+from resources import NUM_RESOURCES, RESOURCE_NAMES
+
+
+def make_market(step):
+    """Stand-in for Market exposing the per-resource arrays the history reads"""
+    return types.SimpleNamespace(
+        prices=types.SimpleNamespace(array=np.arange(NUM_RESOURCES) + step),
+        supply=types.SimpleNamespace(array=np.full(NUM_RESOURCES, 2.0 * step)),
+        demand=types.SimpleNamespace(array=np.full(NUM_RESOURCES, 3.0 * step)),
+    )
+
+
+def record(history, count, start_time=0.0):
+    for step in range(count):
+        history.record(start_time + 10 * step, make_market(step))
+
+
+def test_record_size():
+    assert record_dtype(NUM_RESOURCES).itemsize == 8 + 12 * NUM_RESOURCES
+
+
+def test_in_memory_history_grows(tmp_path):
+    history = MarketHistory(chunk_size=4)
+    record(history, 10)
+    samples = history.samples()
+    assert len(history) == 10
+    assert samples['time'].tolist() == [10.0 * step for step in range(10)]
+    assert samples['price'][7].tolist() == (np.arange(NUM_RESOURCES) + 7).tolist()
+    assert samples['demand'][3].tolist() == [9.0] * NUM_RESOURCES
+
+
+def test_file_round_trip(tmp_path):
+    path = str(tmp_path / "history.bin")
+    history = MarketHistory(path, start_time=100.0, chunk_size=4)
+    record(history, 10, start_time=100.0)
+
+    # Two full chunks are on disk, the rest is still buffered
+    assert history.flushed == 8
+    assert history.count == 2
+    resources, on_disk = load_history(path)
+    assert resources == RESOURCE_NAMES
+    assert len(on_disk) == 8
+
+    history.flush()
+    resources, on_disk = load_history(path)
+    assert on_disk['time'].tolist() == [10.0 * step for step in range(10)]
+    assert on_disk['supply'][9].tolist() == [18.0] * NUM_RESOURCES
+    assert (on_disk == history.samples()).all()
+
+
+def test_samples_prefix_does_not_flush(tmp_path):
+    path = str(tmp_path / "history.bin")
+    history = MarketHistory(path, chunk_size=4)
+    record(history, 6)
+
+    assert history.samples(3)['time'].tolist() == [0.0, 10.0, 20.0]
+    assert history.samples(6)['time'].tolist() == [10.0 * step for step in range(6)]
+    assert history.samples(100)['time'].tolist() == [10.0 * step for step in range(6)]
+    assert history.flushed == 4
+    assert len(load_history(path, 2)[1]) == 2
+
+
+def test_truncated_trailing_record_is_dropped(tmp_path):
+    path = str(tmp_path / "history.bin")
+    history = MarketHistory(path, chunk_size=4)
+    record(history, 3)
+    history.flush()
+
+    # Simulate a run killed in the middle of writing a record
+    with open(path, 'ab') as f:
+        f.write(b"\0" * (history.dtype.itemsize // 2))
+    _, samples = load_history(path)
+    assert samples['time'].tolist() == [0.0, 10.0, 20.0]
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a history\n")
+    with pytest.raises(ValueError):
+        load_history(str(path))
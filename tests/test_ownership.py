@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+import config
+
+OWNERS = ['player', 'ai_0', 'ai_1']
+
+
+@pytest.fixture
+def world(monkeypatch):
+    from world import World
+
+    monkeypatch.setattr(config, 'WORLD_SIZE', {'width': 12, 'height': 9})
+    return World()
+
+
+def brute_force_frontier(world, owner):
+    """Unowned tiles next to any tile of the owner, found by scanning the whole grid"""
+    owner_id = world.owner_id_map.get(owner)
+    frontier = set()
+    for x in range(world.width):
+        for y in range(world.height):
+            if world.owner_ids[x, y] != 0:
+                continue
+            for nx, ny in [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]:
+                if (nx, ny) in world.tiles and world.owner_ids[nx, ny] == owner_id:
+                    frontier.add((x, y))
+    return frontier
+
+
+def check_index(world, acquired):
+    for owner in OWNERS:
+        owned = [(tile.x, tile.y) for tile in world.get_owned_tiles(owner)]
+        # Same tiles as the grid, in order of acquisition
+        assert owned == acquired[owner]
+        assert all(world.tiles[pos].owner == owner for pos in owned)
+        assert world.get_frontier(owner) == brute_force_frontier(world, owner)
+        assert all(world.can_buy_tile(x, y, owner) for x, y in brute_force_frontier(world, owner))
+    assert sum(len(tiles) for tiles in acquired.values()) == (world.owner_ids != 0).sum()
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_ownership_index_matches_brute_force(world, seed):
+    rng = random.Random(seed)
+    acquired = {owner: [] for owner in OWNERS}
+
+    def set_owner(pos, owner):
+        previous = world.tiles[pos].owner
+        world.tiles[pos].owner = owner
+        if previous is not None:
+            acquired[previous].remove(pos)
+        if owner is not None:
+            acquired[owner].append(pos)
+
+    # Starting tiles, then a mix of buying, selling and tiles changing hands
+    for owner, pos in zip(OWNERS, [(1, 1), (10, 7), (6, 4)]):
+        set_owner(pos, owner)
+    check_index(world, acquired)
+    for _ in range(300):
+        owner = rng.choice(OWNERS)
+        action = rng.random()
+        if action < 0.6 and world.get_frontier(owner):
+            set_owner(rng.choice(sorted(world.get_frontier(owner))), owner)
+        elif action < 0.85 and acquired[owner]:
+            set_owner(rng.choice(acquired[owner]), None)
+        else:
+            others = [pos for other in OWNERS if other != owner for pos in acquired[other]]
+            if others:
+                set_owner(rng.choice(others), owner)
+        check_index(world, acquired)
+
+
+def test_setting_the_same_owner_changes_nothing(world):
+    world.tiles[(3, 3)].owner = 'player'
+    world.tiles[(3, 3)].owner = 'player'
+    assert [(tile.x, tile.y) for tile in world.get_owned_tiles('player')] == [(3, 3)]
+    assert world.get_frontier('player') == {(2, 3), (4, 3), (3, 2), (3, 4)}
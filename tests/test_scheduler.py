@@ -0,0 +1,139 @@
+from types import SimpleNamespace
+
+from scheduler import Scheduler
+from sim_clock import SimClock
+
+
+class Building:
+    """Any hashable object can be scheduled"""
+
+
+def test_due_buildings_pop_in_time_order():
+    clock = SimClock()
+    scheduler = Scheduler(clock)
+    first, second, third = Building(), Building(), Building()
+    scheduler.schedule(third, 3)
+    scheduler.schedule(first, 1)
+    scheduler.schedule(second, 2)
+    assert scheduler.pop_due(2) == [first, second]
+    assert scheduler.pop_due(10) == [third]
+    assert len(scheduler) == 0
+
+
+def test_same_time_keeps_scheduling_order():
+    scheduler = Scheduler(SimClock())
+    buildings = [Building() for _ in range(5)]
+    for building in buildings:
+        scheduler.schedule(building, 1)
+    assert scheduler.pop_due(1) == buildings
+
+
+def test_earlier_wake_replaces_later_one():
+    scheduler = Scheduler(SimClock())
+    building = Building()
+    scheduler.schedule(building, 5)
+    scheduler.schedule(building, 1)
+    assert len(scheduler) == 1
+    assert scheduler.pop_due(1) == [building]
+    # The replaced entry is still in the heap but is skipped
+    assert scheduler.pop_due(10) == []
+
+
+def test_later_wake_keeps_earlier_one():
+    scheduler = Scheduler(SimClock())
+    building = Building()
+    scheduler.schedule(building, 1)
+    scheduler.schedule(building, 5)
+    assert scheduler.pop_due(1) == [building]
+    assert scheduler.pop_due(10) == []
+
+
+def test_cancelled_wake_is_skipped():
+    scheduler = Scheduler(SimClock())
+    kept, cancelled = Building(), Building()
+    scheduler.schedule(kept, 1)
+    scheduler.schedule(cancelled, 1)
+    scheduler.cancel(cancelled)
+    assert scheduler.pop_due(1) == [kept]
+    assert len(scheduler) == 0
+
+
+def test_delay_is_relative_to_clock():
+    clock = SimClock()
+    scheduler = Scheduler(clock)
+    building = Building()
+    clock.advance(10)
+    scheduler.schedule(building, 2)
+    assert scheduler.pop_due(11) == []
+    assert scheduler.pop_due(12) == [building]
+
+
+def test_wake_after_pop_schedules_again():
+    scheduler = Scheduler(SimClock())
+    building = Building()
+    scheduler.schedule(building, 1)
+    assert scheduler.pop_due(1) == [building]
+    scheduler.schedule(building, 0)
+    assert scheduler.pop_due(1) == [building]
+
+
+def test_deposit_waiters_wake_in_insertion_order(monkeypatch):
+    import config
+    from world import World
+
+    monkeypatch.setattr(config, 'WORLD_SIZE', config.WORLD_SIZE_SMALL)
+    world = World()
+    waiters = [Building() for _ in range(4)]
+    for building in waiters:
+        building.tile = SimpleNamespace(owner='player')
+    other = Building()
+    other.tile = SimpleNamespace(owner='ai_0')
+    for building in reversed(waiters):
+        world.wait_for_deposits(building)
+    world.wait_for_deposits(other)
+
+    world.wake_deposit_waiters('player')
+    assert world.scheduler.pop_due(world.clock.now) == list(reversed(waiters))
+    # Waiters are woken once; other owners keep waiting
+    world.wake_deposit_waiters('player')
+    assert world.scheduler.pop_due(world.clock.now) == []
+    assert other in world.deposit_waiters['ai_0']
+
+
+class Countdown:
+    """Fires every `period` seconds, counting down the elapsed time it is given"""
+    type = 'COUNTDOWN'
+
+    def __init__(self, period):
+        self.tile = SimpleNamespace(x=0, y=0, owner='player')
+        self.period = self.remaining = period
+        self.fired = []
+        self.elapsed = 0
+
+    def update(self, dt):
+        self.elapsed += dt
+        self.remaining -= dt
+        if self.remaining <= 0:
+            self.fired.append(self.clock.now)
+            self.remaining += self.period
+        return self.remaining
+
+
+def test_world_passes_elapsed_time_without_slipping_events(monkeypatch):
+    import config
+    from world import World
+
+    monkeypatch.setattr(config, 'WORLD_SIZE', config.WORLD_SIZE_SMALL)
+    world = World()
+    building = Countdown(1.0)
+    building.clock = world.clock
+    world.register_building(building)
+    world.update(0)
+    # 0.1 steps add up to just under 1.0: the event is still due on the tenth step
+    for _ in range(30):
+        world.clock.advance(0.1)
+        world.update(0.1)
+    assert len(building.fired) == 3
+    assert building.fired[0] == sum([0.1] * 10)
+    # Elapsed times add up to the time the building has run, with no slack added
+    assert abs(building.elapsed - 3.0) < 1e-12
@@ -0,0 +1,91 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import config
+
+SESSION_FILES = ["player_logs.txt", "building_logs.txt", "market_history.bin", "world.md",
+                 "market.csv", "market.png", "world.png", "player_stats.txt"]
+
+
+@pytest.fixture
+def simulation(monkeypatch, tmp_path):
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+    monkeypatch.chdir(tmp_path)  # Sessions are saved under ./sessions
+    monkeypatch.setattr(config, 'WORLD_SIZE', config.WORLD_SIZE_SMALL)
+    from simulation import Simulation
+    from session_saver import SessionSaver
+
+    simulation = Simulation(seed=3)
+    simulation.logger.console_level = None
+    saver = SessionSaver(simulation)
+    simulation.set_session_saver(saver)
+    for _ in range(300):
+        simulation.step(0.1)
+    simulation.logger.log('PLAYER', 'BUY', "Bought %d %s", 1, 'WOOD')
+    yield simulation
+    saver.close()
+
+
+def owner_counts(world_md):
+    return {label: world_md.count(label) for label in ["(P)", "(AI-0)", "(AI-1)"]}
+
+
+def test_export_writes_a_snapshot_while_the_simulation_runs(simulation):
+    saver = simulation.session_saver
+    world = simulation.world
+    market_count = len(saver.market_history)
+    expected_owners = {"(P)": int((world.owner_ids == 1).sum()),
+                       "(AI-0)": int((world.owner_ids == world.owner_id_map.get('ai_0', -1)).sum()),
+                       "(AI-1)": int((world.owner_ids == world.owner_id_map.get('ai_1', -1)).sum())}
+
+    future = saver.save_session()
+    # Change the world under the export: the snapshot taken above is what gets saved
+    for x in range(world.width):
+        world.tiles[(x, 0)].owner = 'player'
+    while saver.is_exporting():
+        simulation.step(0.1)
+    future.result()
+    saver.close()
+    assert not saver.is_exporting()
+    assert saver.get_export_status() == f"Session saved to {saver.session_dir}"
+
+    for name in SESSION_FILES:
+        path = os.path.join(saver.session_dir, name)
+        assert os.path.getsize(path) > 0, name
+    with open(os.path.join(saver.session_dir, "world.md")) as f:
+        assert owner_counts(f.read()) == expected_owners
+    with open(os.path.join(saver.session_dir, "market.csv")) as f:
+        assert len(f.read().splitlines()) == 1 + market_count
+    with open(os.path.join(saver.session_dir, "player_logs.txt")) as f:
+        assert "| PLAYER | BUY | Bought 1 WOOD" in f.read()
+    # The history kept recording during the export and was flushed by close()
+    assert len(saver.market_history) >= market_count
+
+
+def test_exports_run_in_order(simulation):
+    saver = simulation.session_saver
+    first = saver.save_session()
+    simulation.step(0.1)
+    second = saver.save_session()
+    saver.close()
+    assert first.done() and second.done()
+    assert saver.exports == [first, second]
+
+
+def test_finish_session_draws_until_exports_finish(simulation):
+    import pygame
+    from game import Game
+
+    pygame.display.init()
+    try:
+        game = SimpleNamespace(session_saver=simulation.session_saver, draw=lambda: None,
+                               clock=SimpleNamespace(tick=lambda fps: None))
+        simulation.session_saver.save_session()
+        Game.finish_session(game)
+        assert not simulation.session_saver.is_exporting()
+        assert simulation.session_saver.log_writer.closed
+        assert os.path.exists(os.path.join(simulation.session_saver.session_dir, "world.png"))
+    finally:
+        pygame.display.quit()
@@ -0,0 +1,69 @@
+import pytest
+
+from sim_clock import SimClock
+
+
+def test_variable_steps_are_split_to_max_step():
+    clock = SimClock(time_scale=1.0, fixed_step=None)
+    clock.max_step = 0.1
+    steps = clock.tick(0.35)
+    assert len(steps) == 4
+    assert sum(steps) == pytest.approx(0.35)
+    assert all(step <= 0.1 for step in steps)
+
+
+def test_time_scale_multiplies_frame_time():
+    clock = SimClock(time_scale=10.0, fixed_step=None)
+    clock.max_step = 0.1
+    steps = clock.tick(0.05)
+    assert len(steps) == 5
+    assert sum(steps) == pytest.approx(0.5)
+
+
+def test_variable_steps_are_capped_per_tick():
+    clock = SimClock(time_scale=1.0, fixed_step=None)
+    clock.max_step = 0.1
+    clock.max_steps_per_tick = 3
+    steps = clock.tick(1.0)
+    assert len(steps) == 3
+    assert sum(steps) == pytest.approx(1.0)
+
+
+def test_paused_clock_runs_no_steps():
+    clock = SimClock(fixed_step=None)
+    clock.pause()
+    assert clock.tick(1.0) == []
+    clock.toggle_pause()
+    assert clock.tick(0.01) != []
+
+
+def test_fixed_steps_carry_leftover_time():
+    clock = SimClock(time_scale=1.0, fixed_step=0.1)
+    assert clock.tick(0.25) == [0.1, 0.1]
+    # 0.05 left over, plus 0.06, makes one more step
+    assert clock.tick(0.06) == [0.1]
+    assert clock.accumulator == pytest.approx(0.01)
+
+
+def test_fixed_step_accumulator_is_capped():
+    clock = SimClock(time_scale=1.0, fixed_step=0.1)
+    clock.max_steps_per_tick = 5
+    steps = clock.tick(10.0)
+    assert steps == [0.1] * 5
+    # Time that could not be caught up on is dropped, not carried forever
+    assert clock.accumulator <= 0.1
+
+
+def test_time_scale_is_clamped():
+    clock = SimClock()
+    clock.set_time_scale(1e9)
+    assert clock.time_scale == SimClock(time_scale=1e9).time_scale
+    clock.set_time_scale(0)
+    assert clock.time_scale >= 1.0
+
+
+def test_advance_moves_now():
+    clock = SimClock()
+    for step in clock.tick(0.5):
+        clock.advance(step)
+    assert clock.now == pytest.approx(0.5 * clock.time_scale)
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+import config
+import rng_streams
+import world as world_module
+from config import TILE_BASE_COST
+from resources import EMPTY_ID
+from world import World, random_bits
+
+WIDTH, HEIGHT = 20, 13
+BAND = 8  # Two full bands and a partial one
+
+
+@pytest.fixture
+def world(monkeypatch):
+    monkeypatch.setattr(config, 'WORLD_SIZE', {'width': WIDTH, 'height': HEIGHT})
+    monkeypatch.setattr(world_module, 'PRICE_PROPAGATION_BAND', BAND)
+    rng_streams.reset(5)
+    return World()
+
+
+def band_draws(rng, width, height):
+    """The 16-bit random draws of propagate_tile_prices, as {(band start, offset): draws}"""
+    offsets = [(dx, dy) for dx in range(-3, 4) for dy in range(-3, 4) if 0 < abs(dx) + abs(dy) <= 3]
+    draws = {}
+    for x0 in range(0, width, BAND):
+        rows = min(BAND, width - x0)
+        for offset in offsets:
+            draws[x0, offset] = random_bits(rng, (rows, height))
+    return draws
+
+
+def per_tile_propagation(world, draws):
+    """The per-tile loop propagate_tile_prices replaced, fed the same random draws
+
+    Arithmetic is float32 like the vectorized version: influence =
+    int(factor * (base * 0.7 + base * 0.6 / 65536 * u)), i.e. base * factor * (0.7 to 1.3).
+    """
+    prices = world.prices.copy()
+    price_influences = {(x, y): 0 for x in range(world.width) for y in range(world.height)}
+    for x in range(world.width):
+        for y in range(world.height):
+            if world.resource_ids[x, y] == EMPTY_ID:
+                continue
+            base_influence = np.float32(prices[x, y] - TILE_BASE_COST)
+            if base_influence <= 0:
+                continue
+            low = base_influence * np.float32(0.7)
+            step = base_influence * np.float32(0.6 / 65536)
+            for distance in range(1, 4):
+                influence_factor = np.float32(0.7 ** distance)
+                for dx in range(-distance, distance + 1):
+                    for dy in range(-distance, distance + 1):
+                        if abs(dx) + abs(dy) != distance:
+                            continue
+                        nx, ny = x + dx, y + dy
+                        if (nx, ny) in price_influences:
+                            x0 = x - x % BAND
+                            u = np.float32(draws[x0, (dx, dy)][x - x0, y])
+                            price_influences[(nx, ny)] += int((step * u + low) * influence_factor)
+    for (x, y), influence in price_influences.items():
+        if influence > 0:
+            prices[x, y] += influence
+    return prices
+
+
+def test_propagation_matches_per_tile_loop(world):
+    world.initialize_tile_prices()
+    # Replay the world's own stream from here on
+    replay = np.random.Generator(type(world.rng.bit_generator)(0))
+    replay.bit_generator.state = world.rng.bit_generator.state
+    draws = band_draws(replay, WIDTH, HEIGHT)
+    expected = per_tile_propagation(world, draws)
+
+    world.propagate_tile_prices()
+
+    assert (world.prices > TILE_BASE_COST).sum() > (world.resource_ids != EMPTY_ID).sum()
+    np.testing.assert_array_equal(world.prices, expected)
+
+
+def test_generation_is_deterministic(monkeypatch):
+    monkeypatch.setattr(config, 'WORLD_SIZE', {'width': WIDTH, 'height': HEIGHT})
+    grids = []
+    for _ in range(2):
+        rng_streams.reset(11)
+        world = World()
+        grids.append((world.resource_ids.copy(), world.durability.copy(), world.prices.copy()))
+    for first, second in zip(*grids):
+        np.testing.assert_array_equal(first, second)
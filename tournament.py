@@ -0,0 +1,151 @@
+"""Headless AI factory tournament
+
+Plays many headless games (every combination of the given seeds, AI difficulties,
+AI player counts and world sizes) in parallel worker processes and writes a JSON
+report with each AI's money curve and building counts, plus a summary per setting.
+
+Usage:
+    python tournament.py [--games 8] [--seed 0] [--difficulty NORMAL ...]
+                         [--ai-players 3 ...] [--world-size MEDIUM ...]
+                         [--duration 3600] [--dt 0.1] [--sample-interval 60]
+                         [--workers N] [--output tournament.json]
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import config
+
+WORLD_SIZES = {
+    'SMALL': config.WORLD_SIZE_SMALL,
+    'MEDIUM': config.WORLD_SIZE_MEDIUM,
+    'LARGE': config.WORLD_SIZE_LARGE,
+}
+
+
+def play_game(seed, difficulty, num_ai_players, world_size, duration, dt, sample_interval):
+    """Play one headless game in this process and return its results as plain data"""
+    # Same settings the configuration screen changes
+    config.AI_DIFFICULTY = difficulty
+    config.NUM_AI_PLAYERS = num_ai_players
+    config.WORLD_SIZE = WORLD_SIZES[world_size]
+    config.MASTER_SEED = seed
+
+    from simulation import Simulation
+
+    start = time.perf_counter()
+    # Game logs go to the console; a tournament only wants the results
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        simulation = Simulation()
+        money_curves = [[ai.money] for ai in simulation.ai_factories]
+        samples = max(1, int(round(duration / sample_interval)))
+        for _ in range(samples):
+            simulation.run(duration / samples, dt)
+            for curve, ai in zip(money_curves, simulation.ai_factories):
+                curve.append(ai.money)
+
+    factories = []
+    for ai, curve in zip(simulation.ai_factories, money_curves):
+        buildings = {}
+        for tile in ai.owned_tiles:
+            if tile.building and tile.building != 'CENTRAL':
+                buildings[tile.building] = buildings.get(tile.building, 0) + 1
+        factories.append({
+            'id': ai.id,
+            'final_money': ai.money,
+            'tiles': len(ai.owned_tiles),
+            'buildings': buildings,
+            'money_curve': curve,
+        })
+
+    return {
+        'seed': seed,
+        'difficulty': difficulty,
+        'ai_players': num_ai_players,
+        'world_size': world_size,
+        'duration': duration,
+        'sample_interval': duration / samples,
+        'wall_time': time.perf_counter() - start,
+        'factories': factories,
+    }
+
+
+def summarize(games):
+    """Aggregate results per (difficulty, AI players, world size) setting"""
+    groups = {}
+    for game in games:
+        key = (game['difficulty'], game['ai_players'], game['world_size'])
+        groups.setdefault(key, []).extend(game['factories'])
+
+    summary = []
+    for (difficulty, num_ai_players, world_size), factories in sorted(groups.items()):
+        money = [f['final_money'] for f in factories]
+        building_types = sorted({b for f in factories for b in f['buildings']})
+        summary.append({
+            'difficulty': difficulty,
+            'ai_players': num_ai_players,
+            'world_size': world_size,
+            'factories': len(factories),
+            'mean_money': statistics.mean(money),
+            'median_money': statistics.median(money),
+            'max_money': max(money),
+            'mean_tiles': statistics.mean(f['tiles'] for f in factories),
+            'mean_buildings': {b: statistics.mean(f['buildings'].get(b, 0) for f in factories)
+                               for b in building_types},
+        })
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a headless AI factory tournament")
+    parser.add_argument('--games', type=int, default=8, help="seeds to play for every setting")
+    parser.add_argument('--seed', type=int, default=0, help="first seed")
+    parser.add_argument('--difficulty', nargs='+', default=[config.AI_DIFFICULTY],
+                        choices=list(config.AI_DIFFICULTY_LEVELS))
+    parser.add_argument('--ai-players', nargs='+', type=int, default=[config.NUM_AI_PLAYERS])
+    parser.add_argument('--world-size', nargs='+', default=['MEDIUM'], choices=list(WORLD_SIZES))
+    parser.add_argument('--duration', type=float, default=3600, help="simulated seconds per game")
+    parser.add_argument('--dt', type=float, default=0.1, help="simulated seconds per step")
+    parser.add_argument('--sample-interval', type=float, default=60, help="simulated seconds between money samples")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--output', default='tournament.json')
+    args = parser.parse_args()
+
+    settings = list(itertools.product(range(args.seed, args.seed + args.games),
+                                      args.difficulty, args.ai_players, args.world_size))
+    print(f"Playing {len(settings)} games on {args.workers} workers")
+
+    start = time.perf_counter()
+    games = []
+    # One game per task: games take seconds, so scheduling overhead is negligible
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(play_game, seed, difficulty, num_ai_players, world_size,
+                                   args.duration, args.dt, args.sample_interval)
+                   for seed, difficulty, num_ai_players, world_size in settings]
+        for future in as_completed(futures):
+            game = future.result()
+            games.append(game)
+            print(f"  [{len(games)}/{len(settings)}] seed {game['seed']} {game['difficulty']} "
+                  f"{game['ai_players']} AI {game['world_size']}: {game['wall_time']:.1f}s")
+    elapsed = time.perf_counter() - start
+
+    games.sort(key=lambda g: (g['difficulty'], g['ai_players'], g['world_size'], g['seed']))
+    summary = summarize(games)
+    with open(args.output, 'w') as f:
+        json.dump({'summary': summary, 'games': games}, f, indent=2)
+
+    print(f"Finished in {elapsed:.1f}s, report written to {args.output}")
+    for row in summary:
+        buildings = ', '.join(f"{b} {n:.1f}" for b, n in row['mean_buildings'].items())
+        print(f"  {row['difficulty']:<7}{row['ai_players']} AI {row['world_size']:<7}"
+              f"money mean {row['mean_money']:9.0f} median {row['median_money']:9.0f}  "
+              f"tiles {row['mean_tiles']:5.1f}  {buildings}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 import pygame
 from config import *
 from economy import PriceManager
+import utils
 
 class UI:
     def __init__(self, screen_width, screen_height):
@@ -10,9 +11,9 @@ class UI:
             screen_width - UI_PANEL_WIDTH, 0, 
             UI_PANEL_WIDTH, screen_height
         )
-        self.font_large = pygame.font.SysFont('Arial', 24)
-        self.font = pygame.font.SysFont('Arial', 18)
-        self.font_small = pygame.font.SysFont('Arial', 14)
+        self.font_large = utils.get_font('Arial', 24)
+        self.font = utils.get_font('Arial', 18)
+        self.font_small = utils.get_font('Arial', 14)
         
         # UI states
         self.selected_tile = None
@@ -334,16 +335,14 @@ class UI:
         
         # List available deposits
         self.menu_buttons.clear()
-        for pos, tile_obj in Game.instance.world.tiles.items():
-            if (tile_obj.owner == self.selected_tile.owner and 
-                tile_obj.building == 'DEPOSIT'):
-                rect = pygame.Rect(x + 20, y, width - 40, 25)
-                pygame.draw.rect(surface, LIGHT_GRAY if tile_obj == target else WHITE, rect)
-                pygame.draw.rect(surface, BLACK, rect, 1)
-                self.draw_text(surface, f"Deposit at ({tile_obj.x}, {tile_obj.y})", 
-                             (rect.x + 5, rect.y + 3), self.font_small)
-                self.menu_buttons[f'deposit_{tile_obj.x}_{tile_obj.y}'] = (rect, tile_obj)
-                y += 30
+        for tile_obj in Game.instance.world.get_building_tiles(self.selected_tile.owner, 'DEPOSIT'):
+            rect = pygame.Rect(x + 20, y, width - 40, 25)
+            pygame.draw.rect(surface, LIGHT_GRAY if tile_obj == target else WHITE, rect)
+            pygame.draw.rect(surface, BLACK, rect, 1)
+            self.draw_text(surface, f"Deposit at ({tile_obj.x}, {tile_obj.y})", 
+                         (rect.x + 5, rect.y + 3), self.font_small)
+            self.menu_buttons[f'deposit_{tile_obj.x}_{tile_obj.y}'] = (rect, tile_obj)
+            y += 30
     
     def draw_deposit_menu(self, surface, tile, market):
         """Draw menu for deposit buildings"""
@@ -812,8 +811,7 @@ class UI:
 
     def draw_text(self, surface, text, position, font, color=WHITE):
         """Helper to draw text on the UI"""
-        text_surface = font.render(str(text), True, color)
-        surface.blit(text_surface, position)
+        utils.draw_text(surface, text, position, font, color)
     
     def handle_click(self, pos, player, world):
         """Handle mouse click on UI elements"""
@@ -883,6 +881,7 @@ class UI:
                         # Set collection station target
                         if hasattr(self.selected_tile, 'building_instance') and self.selected_tile.building_instance:
                             self.selected_tile.building_instance.target_deposit = data
+                            self.selected_tile.building_instance.wake()
                     elif button_id.startswith('sell_all_'):
                         # Sell all of a resource and completely remove it from deposit
                         resource = data
@@ -896,8 +895,7 @@ class UI:
                             if player.sell_resources(self.selected_tile.building_instance, resource, amount, price):
                                 # Completely remove the resource from the dictionary to free up slot
                                 if hasattr(self.selected_tile, 'building_instance') and self.selected_tile.building_instance:
-                                    if resource in self.selected_tile.building_instance.resources:
-                                        del self.selected_tile.building_instance.resources[resource]
+                                    self.selected_tile.building_instance.clear_resource(resource)
                                 Game.instance.logger.log('PLAYER', 'SELL', 
                                     f'Sold all {amount} {resource} for ${amount * price} and removed from deposit')
                     elif button_id.startswith('input_'):
@@ -926,12 +924,14 @@ class UI:
                         if hasattr(self.selected_tile, 'building_instance') and self.selected_tile.building_instance and hasattr(self.selected_tile.building_instance, 'autosell'):
                             current_value = self.selected_tile.building_instance.autosell.get(resource, False)
                             self.selected_tile.building_instance.autosell[resource] = not current_value
+                            self.selected_tile.building_instance.wake()
                     elif button_id == 'toggle_active':
                         # Toggle processing building active state
                         if hasattr(self.selected_tile, 'building_instance') and self.selected_tile.building_instance:
                             if not hasattr(self.selected_tile.building_instance, 'is_inactive'):
                                 self.selected_tile.building_instance.is_inactive = False
                             self.selected_tile.building_instance.is_inactive = not self.selected_tile.building_instance.is_inactive
+                            self.selected_tile.building_instance.wake()
                             active_state = "inactive" if self.selected_tile.building_instance.is_inactive else "active"
                             Game.instance.logger.log('PROCESSING', 'TOGGLE', 
                                 f'Set processing building to {active_state} at ({self.selected_tile.x}, {self.selected_tile.y})')
@@ -954,9 +954,11 @@ class UI:
                             # 2. The building is inactive (regardless of state)
                             if building_instance.selected_recipe is not None and hasattr(self.selected_tile.building_instance, 'is_inactive') and self.selected_tile.building_instance.is_inactive:
                                 building_instance.selected_recipe = None
+                                building_instance.wake()
                             elif building_instance.processing_state == "idle" or building_instance.is_inactive:
                                 recipe_name = data
                                 building_instance.selected_recipe = recipe_name
+                                building_instance.wake()
                                 Game.instance.logger.log('PROCESSING', 'SELECT', 
                                     f'Selected recipe {recipe_name} at ({self.selected_tile.x}, {self.selected_tile.y})')
                             else:
@@ -1,17 +1,66 @@
-import pygame
-import random
+from collections import OrderedDict
+
+# Shared fonts, keyed by (name, size)
+_fonts = {}
+
+def get_font(name='Arial', size=18):
+    """Return the shared font for a name and size, creating it on first use"""
+    font = _fonts.get((name, size))
+    if font is None:
+        import pygame  # Only the rendering shell draws text
+        font = pygame.font.SysFont(name, size)
+        _fonts[(name, size)] = font
+    return font
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (text, font, color)"""
+    def __init__(self, max_size=None):
+        from config import TEXT_CACHE_SIZE
+        self.max_size = max_size or TEXT_CACHE_SIZE
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def render(self, text, font, color=(255, 255, 255)):
+        """Return the rendered surface for the text, rendering only on a cache miss"""
+        key = (text, font, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)  # Evict the least recently used text
+        return surface
+    
+    def clear(self):
+        """Drop all cached surfaces and reset the counters"""
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+# Shared by every screen
+text_cache = TextCache()
+
+def render_text(text, font, color=(255, 255, 255)):
+    """Render text through the shared cache"""
+    return text_cache.render(str(text), font, color)
 
 def draw_text(surface, text, pos, font, color=(255, 255, 255)):
     """Helper to draw text on a surface"""
-    text_surface = font.render(text, True, color)
-    surface.blit(text_surface, pos)
+    surface.blit(render_text(text, font, color), pos)
 
 def get_adjacent_coords(x, y):
     """Return coordinates of adjacent tiles"""
     return [(x+1, y), (x-1, y), (x, y+1), (x, y-1)]
 
-def get_resource_durability(resource_type):
-    """Return a random durability value for the given resource type based on its rarity"""
+def get_resource_durability(resource_type, rng):
+    """Return a random durability value for the given resource type based on its rarity
+    (rng is the random.Random stream to draw from)"""
     from config import RESOURCE_DISTRIBUTION, RESOURCE_RARITY
     
     if resource_type == 'EMPTY':
@@ -19,15 +68,12 @@ def get_resource_durability(resource_type):
     
     rarity_type = RESOURCE_DISTRIBUTION.get(resource_type, {}).get('rarity', 'NORMAL')
     durability_range = RESOURCE_RARITY[rarity_type]['durability_range']
-    return random.randint(durability_range[0], durability_range[1])
+    return rng.randint(durability_range[0], durability_range[1])
 
-def random_resource():
-    """Return a random resource type based on rarity settings"""
-    from config import RESOURCE_TYPES, RESOURCE_DISTRIBUTION, RESOURCE_RARITY
-    
-    # First decide if empty or not (30% chance of empty)
-    if random.random() < 0.3:
-        return 'EMPTY'
+def get_resource_weights():
+    """Return (resources, probabilities) for picking a tile's resource based on rarity settings
+    (30% of tiles are empty, the rest are weighted by rarity multiplier)"""
+    from config import RESOURCE_DISTRIBUTION, RESOURCE_RARITY
     
     # Create weighted distribution of resources based on rarity
     resource_weights = {}
@@ -36,9 +82,7 @@ def random_resource():
             rarity_type = data['rarity']
             resource_weights[resource] = RESOURCE_RARITY[rarity_type]['multiplier']
     
-    # Get weighted random choice
     total_weight = sum(resource_weights.values())
-    resources = list(resource_weights.keys())
-    weights = [resource_weights[r]/total_weight for r in resources]
-    
-    return random.choices(resources, weights=weights, k=1)[0]
+    resources = ['EMPTY'] + list(resource_weights.keys())
+    probabilities = [0.3] + [0.7 * weight / total_weight for weight in resource_weights.values()]
+    return resources, probabilities
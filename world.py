@@ -1,21 +1,124 @@
-import random
+import rng_streams
+import numpy as np
 from config import *
 import utils
-import pygame
-from entities import Building
+from entities import create_building
+from deposit_index import DepositIndex
+from scheduler import Scheduler
+from resources import RESOURCE_NAMES, RESOURCE_IDS, EMPTY_ID
+
+# Building type ids stored in the world grid (0 means no building)
+BUILDING_NAMES = [None] + list(BUILDINGS)
+BUILDING_IDS = {name: i for i, name in enumerate(BUILDING_NAMES)}
+
+def random_bits(rng, shape):
+    """Uniform 16-bit integers, four from each raw 64-bit draw of the generator
+
+    Several times cheaper than Generator.random per value; world generation only needs
+    coarse randomness (resource picks, durability, price factors) over whole grids.
+    """
+    count = int(np.prod(shape))
+    raw = rng.bit_generator.random_raw(-(-count // 4))
+    return raw.astype('<u8', copy=False).view('<u2')[:count].reshape(shape)
+
+def random_fractions(rng, shape, dtype=np.float64):
+    """Uniform floats in [0, 1) with 16-bit resolution (see random_bits)"""
+    fractions = random_bits(rng, shape).astype(dtype)
+    fractions *= 1 / 65536
+    return fractions
+
+def get_sprite_key(border_color, resource_type, building, surveyed):
+    """(border color, resource color, building color) describing how a tile looks"""
+    resource_color = None
+    # Resources are shown if surveyed or owned
+    if (surveyed or (border_color is not None)) and resource_type != 'EMPTY':
+        resource_color = RESOURCE_TYPES[resource_type]['color']
+    building_color = BUILDINGS[building]['color'] if building else None
+    return (border_color, resource_color, building_color)
 
 class Tile:
-    def __init__(self, x, y, resource_type='EMPTY', owner=None):
+    """Lightweight view of one cell of the world grid
+
+    All tile state lives in the World's NumPy arrays; a Tile only remembers its
+    coordinates, so views can be created on demand and compare equal by position.
+    """
+    __slots__ = ('world', 'x', 'y')
+    
+    def __init__(self, world, x, y):
+        self.world = world
         self.x = x
         self.y = y
-        self.resource_type = resource_type
-        self.owner = owner
-        self.building = None
-        self.building_instance = None
-        self.surveyed = False
-        self.world = None  # Set by World class
-        self.durability = 0  # Resource durability (how many times resources can be collected)
-        self.price = TILE_BASE_COST  # Default price, will be updated based on resource
+    
+    def __eq__(self, other):
+        if not isinstance(other, Tile):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y and self.world is other.world
+    
+    def __hash__(self):
+        return hash((self.x, self.y))
+    
+    def __repr__(self):
+        return f"Tile({self.x}, {self.y})"
+    
+    @property
+    def resource_type(self):
+        return RESOURCE_NAMES[self.world.resource_ids[self.x, self.y]]
+    
+    @resource_type.setter
+    def resource_type(self, resource_type):
+        self.world.resource_ids[self.x, self.y] = RESOURCE_IDS[resource_type]
+        self.world.mark_dirty(self.x, self.y)
+    
+    @property
+    def owner(self):
+        return self.world.owner_names[self.world.owner_ids[self.x, self.y]]
+    
+    @owner.setter
+    def owner(self, owner):
+        self.world.set_tile_owner(self.x, self.y, owner)
+    
+    @property
+    def building(self):
+        return BUILDING_NAMES[self.world.building_ids[self.x, self.y]]
+    
+    @building.setter
+    def building(self, building_type):
+        self.world.building_ids[self.x, self.y] = BUILDING_IDS[building_type]
+        self.world.mark_dirty(self.x, self.y)
+    
+    @property
+    def building_instance(self):
+        return self.world.building_instances[self.x, self.y]
+    
+    @building_instance.setter
+    def building_instance(self, building):
+        self.world.building_instances[self.x, self.y] = building
+    
+    @property
+    def surveyed(self):
+        return bool(self.world.surveyed[self.x, self.y])
+    
+    @surveyed.setter
+    def surveyed(self, surveyed):
+        self.world.surveyed[self.x, self.y] = surveyed
+        self.world.mark_dirty(self.x, self.y)
+    
+    @property
+    def durability(self):
+        """Resource durability (how many times resources can be collected)"""
+        return int(self.world.durability[self.x, self.y])
+    
+    @durability.setter
+    def durability(self, durability):
+        self.world.durability[self.x, self.y] = durability
+    
+    @property
+    def price(self):
+        return int(self.world.prices[self.x, self.y])
+    
+    @price.setter
+    def price(self, price):
+        self.world.prices[self.x, self.y] = price
     
     def update(self, dt):
         """Update tile state"""
@@ -37,8 +140,10 @@ class Tile:
     def set_building(self, building_type):
         """Set the building type and create its instance"""
         self.building = building_type
+        # Drop any previous instance from the world's active-building registry
+        self.world.unregister_building(self)
         if building_type:
-            self.building_instance = Building(self, building_type)
+            self.building_instance = create_building(self, building_type)
             
             # Enable autosell by default for AI deposit buildings
             if building_type == 'DEPOSIT' and self.owner and self.owner.startswith('ai_'):
@@ -47,6 +152,8 @@ class Tile:
                 for resource in RESOURCE_TYPES:
                     if resource != 'EMPTY':
                         self.building_instance.autosell[resource] = True
+            
+            self.world.register_building(self.building_instance)
         else:
             self.building_instance = None
 
@@ -56,66 +163,14 @@ class Tile:
             return self.building_instance.get_total_resources()
         return 0
 
-    def draw(self, surface, camera_offset=(0, 0)):
-        """Draw the tile on the surface"""
-        rect = pygame.Rect(
-            self.x * TILE_SIZE - camera_offset[0],
-            self.y * TILE_SIZE - camera_offset[1],
-            TILE_SIZE,
-            TILE_SIZE
-        )
-        
-        # Draw base tile
-        if self.owner is None:
-            # Unowned tile
-            pygame.draw.rect(surface, LIGHT_GRAY, rect)
-        else:
-            # Owned tile
-            if self.owner == 'player':
-                border_color = BLUE
-            elif self.owner and self.owner.startswith('ai_'):
-                # Get the AI instance from game and use its color
-                from game import Game
-                if Game.instance and hasattr(Game.instance, 'ai_factories'):
-                    ai_id = int(self.owner.split('_')[1])
-                    if 0 <= ai_id < len(Game.instance.ai_factories):
-                        border_color = Game.instance.ai_factories[ai_id].color
-                    else:
-                        border_color = RED  # Fallback color if AI not found
-                else:
-                    border_color = RED  # Fallback color if Game instance not available
-            else:
-                border_color = RED
-            pygame.draw.rect(surface, WHITE, rect)
-            pygame.draw.rect(surface, border_color, rect, 2)
-            
-        # Draw resource if surveyed
-        if (self.surveyed or (self.owner is not None)) and self.resource_type != 'EMPTY':
-            resource_color = RESOURCE_TYPES[self.resource_type]['color']
-            resource_rect = rect.inflate(-20, -20)
-            pygame.draw.rect(surface, resource_color, resource_rect)
-            
-            # # Draw durability indicator if resource is not empty
-            # if self.durability > 0:
-            #     # Create a font for showing durability
-            #     font = pygame.font.SysFont(None, 20)
-            #     text = font.render(str(self.durability), True, WHITE)
-            #     text_rect = text.get_rect(center=(
-            #         rect.centerx - camera_offset[0],
-            #         rect.centery - camera_offset[1]
-            #     ))
-            #     surface.blit(text, text_rect)
-        
-        # Draw building if present
-        if self.building:
-            building_color = BUILDINGS[self.building]['color']
-            building_rect = pygame.Rect(
-                rect.centerx - TILE_SIZE//4,
-                rect.centery - TILE_SIZE//4,
-                TILE_SIZE//2,
-                TILE_SIZE//2
-            )
-            pygame.draw.rect(surface, building_color, building_rect)
+    def get_border_color(self):
+        """Color of the owner's border, or None for unowned tiles"""
+        return self.world.get_owner_color(self.owner)
+    
+    def get_sprite_key(self):
+        """(border color, resource color, building color) describing how this tile looks"""
+        return get_sprite_key(self.get_border_color(), self.resource_type, self.building, self.surveyed)
+    
     def get_tile_cost(self):
         """Calculate the cost to buy this tile using dynamic pricing"""
         # Get current multiplier from PriceManager
@@ -131,112 +186,281 @@ class Tile:
         
         return int(self.price * multiplier)
 
+class TileGrid:
+    """Dict-style access to the world grid: (x, y) -> Tile view"""
+    def __init__(self, world):
+        self.world = world
+    
+    def __contains__(self, pos):
+        x, y = pos
+        return 0 <= x < self.world.width and 0 <= y < self.world.height
+    
+    def __getitem__(self, pos):
+        if pos not in self:
+            raise KeyError(pos)
+        return Tile(self.world, pos[0], pos[1])
+    
+    def get(self, pos, default=None):
+        if pos not in self:
+            return default
+        return Tile(self.world, pos[0], pos[1])
+    
+    def __len__(self):
+        return self.world.width * self.world.height
+    
+    def __iter__(self):
+        return iter(self.keys())
+    
+    def keys(self):
+        return ((x, y) for x in range(self.world.width) for y in range(self.world.height))
+    
+    def values(self):
+        return (Tile(self.world, x, y) for x, y in self.keys())
+    
+    def items(self):
+        return (((x, y), Tile(self.world, x, y)) for x, y in self.keys())
+
 class World:
-    def __init__(self):
+    def __init__(self, clock=None):
+        # Shared simulation clock (read by buildings for cooldowns)
+        from sim_clock import SimClock
+        self.clock = clock or SimClock()
         # Use the configured world size from config
         from config import WORLD_SIZE
         self.width = WORLD_SIZE['width']
         self.height = WORLD_SIZE['height']
-        self.tiles = {}
+        # World generation and starting areas draw from their own seeded stream
+        self.random = rng_streams.get_random('world')
+        self.rng = rng_streams.get_generator('world')  # For whole-grid draws
+        
+        # Struct-of-arrays tile storage, indexed [x, y]
+        shape = (self.width, self.height)
+        self.resource_ids = np.full(shape, EMPTY_ID, dtype=np.int8)
+        self.owner_ids = np.zeros(shape, dtype=np.int16)  # 0 = unowned, see owner_names
+        self.building_ids = np.zeros(shape, dtype=np.int8)  # 0 = no building, see BUILDING_NAMES
+        self.building_instances = np.full(shape, None, dtype=object)
+        self.durability = np.zeros(shape, dtype=np.int32)
+        self.prices = np.full(shape, TILE_BASE_COST, dtype=np.int32)
+        self.surveyed = np.zeros(shape, dtype=bool)
+        
+        # Registry of building instances that need updating, keyed by (x, y)
+        self.active_buildings = {}
+        # Buildings run only when their next event is due
+        self.scheduler = Scheduler(self.clock)
+        # Owner -> processing buildings sleeping until one of the owner's deposits changes
+        # (dicts used as ordered sets so wake-up order does not depend on object addresses)
+        self.deposit_waiters = {}
+        # Deposits per owner, for routing collectors and processors to storage
+        self.deposit_index = DepositIndex(self.width, self.height)
+        
+        # Render chunks whose tiles changed since they were last drawn (see WorldRenderer)
+        self.dirty_chunks = set()
+        
+        # Owner ids are assigned on first use ('player', 'ai_0', ...)
+        self.owner_names = [None, 'player']
+        self.owner_id_map = {None: 0, 'player': 1}
+        
+        # Ownership index, maintained on every owner change
+        self.owned_tiles = {}  # Owner -> list of owned tile views, in order of acquisition
+        self.frontiers = {}  # Owner -> set of (x, y) of unowned tiles adjacent to its territory
+        
+        self.tiles = TileGrid(self)
         self.generate_world()
+    
+    def get_owner_id(self, owner):
+        """Return the grid id for an owner name, registering new owners"""
+        owner_id = self.owner_id_map.get(owner)
+        if owner_id is None:
+            owner_id = len(self.owner_names)
+            self.owner_names.append(owner)
+            self.owner_id_map[owner] = owner_id
+        return owner_id
+        
+    def get_owner_color(self, owner):
+        """Border color of an owner's tiles, or None for unowned tiles"""
+        if owner is None:
+            return None
+        if owner == 'player':
+            return BLUE
+        if owner.startswith('ai_'):
+            # Get the AI instance from the simulation and use its color
+            from simulation import Simulation
+            if Simulation.instance and hasattr(Simulation.instance, 'ai_factories'):
+                ai_id = int(owner.split('_')[1])
+                if 0 <= ai_id < len(Simulation.instance.ai_factories):
+                    return Simulation.instance.ai_factories[ai_id].color
+        return RED  # Fallback color if the AI is not found
+    
+    def mark_dirty(self, x, y):
+        """Flag the render chunk containing (x, y) for redrawing"""
+        self.dirty_chunks.add((x // WORLD_CHUNK_SIZE, y // WORLD_CHUNK_SIZE))
+    
+    def get_owned_tiles(self, owner):
+        """Return the tiles owned by `owner` (a live list kept up to date by the world, do not modify)"""
+        return self.owned_tiles.setdefault(owner, [])
+    
+    def get_frontier(self, owner):
+        """Return the set of (x, y) unowned tiles `owner` could expand into (live, do not modify)"""
+        return self.frontiers.setdefault(owner, set())
+    
+    def set_tile_owner(self, x, y, owner):
+        """Change a tile's owner and update the ownership index and frontiers"""
+        previous = self.owner_names[self.owner_ids[x, y]]
+        if previous == owner:
+            return
+        self.owner_ids[x, y] = self.get_owner_id(owner)
+        self.mark_dirty(x, y)
+        
+        neighbours = [pos for pos in utils.get_adjacent_coords(x, y) if pos in self.tiles]
+        
+        if previous is not None:
+            owned = self.owned_tiles[previous]
+            owned.remove(Tile(self, x, y))
+            # Unowned neighbours may have lost their only link to the previous owner
+            for nx, ny in neighbours:
+                if self.owner_ids[nx, ny] == 0 and not self._borders_owner(nx, ny, previous):
+                    self.frontiers[previous].discard((nx, ny))
+        
+        if owner is None:
+            # The tile is buyable again by whoever owns a neighbour
+            for nx, ny in neighbours:
+                neighbour_owner = self.owner_names[self.owner_ids[nx, ny]]
+                if neighbour_owner is not None:
+                    self.get_frontier(neighbour_owner).add((x, y))
+            return
+        
+        # The tile is no longer buyable by anyone
+        for frontier in self.frontiers.values():
+            frontier.discard((x, y))
+        self.get_owned_tiles(owner).append(Tile(self, x, y))
+        frontier = self.get_frontier(owner)
+        for nx, ny in neighbours:
+            if self.owner_ids[nx, ny] == 0:
+                frontier.add((nx, ny))
+    
+    def _borders_owner(self, x, y, owner):
+        """Check if any tile adjacent to (x, y) belongs to `owner`"""
+        owner_id = self.owner_id_map.get(owner)
+        return any(self.owner_ids[nx, ny] == owner_id
+                   for nx, ny in utils.get_adjacent_coords(x, y) if (nx, ny) in self.tiles)
+    
+    def get_building_tiles(self, owner, building_type):
+        """Return views of all `building_type` tiles owned by `owner`"""
+        owner_id = self.owner_id_map.get(owner)
+        if owner_id is None:
+            return []
+        mask = (self.owner_ids == owner_id) & (self.building_ids == BUILDING_IDS[building_type])
+        xs, ys = np.nonzero(mask)
+        return [Tile(self, x, y) for x, y in zip(xs.tolist(), ys.tolist())]
         
     def generate_world(self):
         """Generate the world with resources"""
-        # First pass: create tiles with resources
-        for x in range(self.width):
-            for y in range(self.height):
-                resource = utils.random_resource()
-                tile = Tile(x, y, resource)
-                tile.world = self  # Set reference to world
-                
-                # Set durability based on resource rarity
-                tile.durability = utils.get_resource_durability(resource)
-                
-                self.tiles[(x, y)] = tile
+        # First pass: pick resources for every tile in one weighted draw
+        resources, probabilities = utils.get_resource_weights()
+        resource_ids = np.array([RESOURCE_IDS[r] for r in resources], dtype=self.resource_ids.dtype)
+        # Inverse CDF sampling: count the cumulative probability thresholds each draw passes
+        # (one cheap comparison per resource type beats a per-tile binary search)
+        draws = random_fractions(self.rng, self.resource_ids.shape, np.float32)
+        picks = np.zeros(self.resource_ids.shape, dtype=np.int8)
+        for threshold in np.cumsum(probabilities)[:-1]:
+            picks += draws >= threshold
+        self.resource_ids[:] = resource_ids[picks]
         
-        # Second pass: set initial prices based on resource rarity
+        # Second pass: set durability and initial prices based on resource rarity
         self.initialize_tile_prices()
         
         # Third pass: propagate prices to neighboring tiles
         self.propagate_tile_prices()
     
     def initialize_tile_prices(self):
-        """Set initial tile prices based on resource rarity"""
+        """Set initial tile durability and prices based on resource rarity"""
         from config import RESOURCE_DISTRIBUTION, RESOURCE_RARITY, TILE_BASE_COST, TILE_COST_MULTIPLIER
         
-        for coords, tile in self.tiles.items():
-            resource_type = tile.resource_type
-            rarity = RESOURCE_DISTRIBUTION.get(resource_type, {}).get('rarity', 'NORMAL')
-            multiplier = RESOURCE_RARITY.get(rarity, {}).get('multiplier', 1.0)
-            
-            # Calculate base price based on rarity
-            base_price = TILE_BASE_COST / (multiplier or 0.1)  # Avoid division by zero
-            tile.price = int(base_price)
-            
-            # Set durability based on rarity
-            durability_range = RESOURCE_RARITY.get(rarity, {}).get('durability_range', (10, 20))
-            tile.durability = random.randint(durability_range[0], durability_range[1])
-            resource = tile.resource_type
-            
-            # Base price starts at TILE_BASE_COST
-            base_price = TILE_BASE_COST
-            
-            # Adjust price based on resource rarity
+        # Price multipliers based on rarity
+        rarity_multipliers = {
+            'COMMON': 1.5,  # 50% higher than base
+            'NORMAL': 2.0,  # 100% higher than base
+            'RARE': 3.0,    # 200% higher than base
+            'VERY_RARE': 4.0 # 300% higher than base
+        }
+        
+        # Per resource id lookup tables: durability range and price multiplier
+        durability_low = np.zeros(len(RESOURCE_NAMES), dtype=np.int64)
+        durability_high = np.zeros(len(RESOURCE_NAMES), dtype=np.int64)
+        price_multiplier = np.ones(len(RESOURCE_NAMES))
+        for resource_id, resource in enumerate(RESOURCE_NAMES):
+            rarity = RESOURCE_DISTRIBUTION.get(resource, {}).get('rarity', 'NORMAL')
+            durability_low[resource_id], durability_high[resource_id] = \
+                RESOURCE_RARITY.get(rarity, {}).get('durability_range', (10, 20))
             if resource != 'EMPTY':
-                rarity = RESOURCE_DISTRIBUTION.get(resource, {}).get('rarity', 'NORMAL')
-                
-                # Price multipliers based on rarity
-                rarity_multipliers = {
-                    'COMMON': 1.5,  # 50% higher than base
-                    'NORMAL': 2.0,  # 100% higher than base
-                    'RARE': 3.0,    # 200% higher than base
-                    'VERY_RARE': 4.0 # 300% higher than base
-                }
-                
-                # Apply rarity multiplier
-                rarity_multiplier = rarity_multipliers.get(rarity, 1.0)
-                
-                # Add some randomness (±20% variation)
-                random_factor = 0.8 + (random.random() * 0.4)  # 0.8 to 1.2
-                
-                # Calculate final price
-                tile.price = int(base_price * rarity_multiplier * random_factor * TILE_COST_MULTIPLIER)
-            else:
-                # Empty tiles are cheaper
-                tile.price = int(base_price * TILE_COST_MULTIPLIER)
+                price_multiplier[resource_id] = rarity_multipliers.get(rarity, 1.0)
+        
+        ids = self.resource_ids
+        # Uniform integer in [low, high] per tile
+        durability_span = durability_high - durability_low + 1
+        # One draw for both per-tile factors (durability, then price)
+        fractions = random_fractions(self.rng, (2,) + ids.shape, np.float32)
+        durability = fractions[0]
+        durability *= durability_span.astype(np.float32)[ids]
+        self.durability[:] = durability_low[ids] + durability.astype(np.int64)
+        
+        # Resource tiles get some randomness (±20% variation); empty tiles are cheaper
+        random_factor = fractions[1]
+        random_factor *= 0.4
+        random_factor += 0.8
+        random_factor[ids == EMPTY_ID] = 1.0
+        random_factor *= (TILE_BASE_COST * TILE_COST_MULTIPLIER * price_multiplier).astype(np.float32)[ids]
+        self.prices[:] = random_factor
     
     def propagate_tile_prices(self):
-        """Propagate resource tile prices to neighboring tiles within 3 tiles distance"""
-        # Make a copy of current prices to avoid affecting the propagation during iteration
-        price_influences = {coords: 0 for coords in self.tiles.keys()}
-        
-        for (x, y), tile in self.tiles.items():
-            if tile.resource_type != 'EMPTY':
-                base_influence = tile.price - TILE_BASE_COST
-                if base_influence <= 0:
-                    continue
+        """Propagate resource tile prices to neighboring tiles within 3 tiles distance
+
+        Works as a convolution with the diamond-shaped kernel of every offset within
+        Manhattan distance 3: each offset adds the shifted influence grid, weighted by
+        0.7 ** distance and a fresh random factor per tile pair. Each pair's influence is
+        truncated to an integer, as the original per-tile loop did.
+        """
+        reach = 3
+        offsets = [(dx, dy) for dx in range(-reach, reach + 1) for dy in range(-reach, reach + 1)
+                   if 0 < abs(dx) + abs(dy) <= reach]
+        
+        # Influence of each resource tile: how much its price exceeds the base cost
+        base_influence = np.where(self.resource_ids != EMPTY_ID,
+                                  np.maximum(self.prices - TILE_BASE_COST, 0), 0).astype(np.float32)
+        
+        # Accumulate influences separately to avoid affecting the propagation during iteration.
+        # The accumulator has a margin of `reach` tiles so influence falling off the map is simply dropped
+        price_influences = np.zeros((self.width + 2 * reach, self.height + 2 * reach), dtype=np.int32)
+        
+        # Work through bands of rows so each band stays in cache across all offsets.
+        # With u the 16-bit random draw of a tile pair, the influence is
+        #   base * factor * (0.7 + 0.6 * u / 65536) = factor * (low + step * u)
+        # where low and step are computed once per band; scratch buffers are reused.
+        # float32 halves the memory traffic of every pass (prices are whole numbers anyway)
+        band_shape = (min(PRICE_PROPAGATION_BAND, self.width), self.height)
+        influence_buffer = np.empty(band_shape, dtype=np.float32)
+        truncated_buffer = np.empty(band_shape, dtype=np.int32)
+        for x0 in range(0, self.width, PRICE_PROPAGATION_BAND):
+            source = base_influence[x0:x0 + PRICE_PROPAGATION_BAND]
+            rows = source.shape[0]
+            low = source * np.float32(0.7)
+            step = source * np.float32(0.6 / 65536)
+            influence = influence_buffer[:rows]
+            truncated = truncated_buffer[:rows]
+            for dx, dy in offsets:
+                influence_factor = 0.7 ** (abs(dx) + abs(dy))  # Decrease by distance (0.7, 0.49, 0.343)
                 
-                # Propagate price influence to neighbors up to 3 tiles away
-                for distance in range(1, 4):  # 1, 2, 3 tiles distance
-                    influence_factor = 0.7 ** distance  # Decrease by distance (0.7, 0.49, 0.343)
-                    
-                    # Get all tiles at this distance
-                    for dx in range(-distance, distance + 1):
-                        for dy in range(-distance, distance + 1):
-                            # Only consider tiles exactly at 'distance' away (Manhattan distance)
-                            if abs(dx) + abs(dy) == distance:
-                                nx, ny = x + dx, y + dy
-                                if (nx, ny) in self.tiles:
-                                    # Apply influence with some randomness
-                                    random_factor = 0.7 + (random.random() * 0.6)  # 0.7 to 1.3
-                                    influence = int(base_influence * influence_factor * random_factor)
-                                    price_influences[(nx, ny)] += influence
-        
-        # Apply the calculated influences to all tiles
-        for coords, influence in price_influences.items():
-            tile = self.tiles[coords]
-            if influence > 0:
-                tile.price += influence
+                # Apply influence with some randomness (0.7 to 1.3 per tile pair)
+                np.multiply(step, random_bits(self.rng, source.shape), out=influence)
+                influence += low
+                influence *= np.float32(influence_factor)
+                np.copyto(truncated, influence, casting='unsafe')  # Truncates like int()
+                x, y = x0 + reach + dx, reach + dy
+                price_influences[x:x + rows, y:y + self.height] += truncated
+        
+        # Apply the positive influences to all tiles at once
+        inside = price_influences[reach:reach + self.width, reach:reach + self.height]
+        self.prices += np.maximum(inside, 0).astype(self.prices.dtype)
     
     def setup_player_start(self, player):
         """Set up the player's starting area"""
@@ -261,9 +485,9 @@ class World:
                 self.tiles[(x, y)].surveyed = True
                 tile_count += 1
                 if not resource_placed:
-                    resource_type = random.choice(['WOOD', 'STONE', 'IRON_ORE'])
+                    resource_type = self.random.choice(['WOOD', 'STONE', 'IRON_ORE'])
                     self.tiles[(x, y)].resource_type = resource_type
-                    self.tiles[(x, y)].durability = utils.get_resource_durability(resource_type)
+                    self.tiles[(x, y)].durability = utils.get_resource_durability(resource_type, self.random)
                     resource_placed = True
         
         # Set up the 5th tile
@@ -276,10 +500,10 @@ class World:
                 break
         
         # Update initial stats
-        from game import Game
-        if Game.instance and hasattr(Game.instance, 'stats'):
-            Game.instance.stats.tiles_owned = tile_count
-            Game.instance.stats.num_buildings = 1  # Starting with central building
+        from simulation import Simulation
+        if Simulation.instance and hasattr(Simulation.instance, 'stats'):
+            Simulation.instance.stats.tiles_owned = tile_count
+            Simulation.instance.stats.num_buildings = 1  # Starting with central building
     
     def setup_ai_factories(self):
         """Set up AI factories in the world using the configured number of AI players"""
@@ -288,8 +512,8 @@ class World:
         for i in range(NUM_AI_PLAYERS):
             # Find a location away from the player
             while True:
-                x = random.randint(0, self.width - 1)
-                y = random.randint(0, self.height - 1)
+                x = self.random.randint(0, self.width - 1)
+                y = self.random.randint(0, self.height - 1)
                 # Ensure it's far enough from player start
                 if abs(x - self.width//2) + abs(y - self.height//2) > 10:
                     break
@@ -312,33 +536,66 @@ class World:
                     
                     # Ensure AI has at least one resource to start with
                     if not resource_placed:
-                        resource_type = random.choice(['WOOD', 'STONE', 'IRON_ORE'])
+                        resource_type = self.random.choice(['WOOD', 'STONE', 'IRON_ORE'])
                         self.tiles[(adj_x, adj_y)].resource_type = resource_type
-                        self.tiles[(adj_x, adj_y)].durability = utils.get_resource_durability(resource_type)
+                        self.tiles[(adj_x, adj_y)].durability = utils.get_resource_durability(resource_type, self.random)
                         resource_placed = True
     
     def can_buy_tile(self, x, y, owner):
         """Check if a tile can be bought by the owner"""
-        if (x, y) not in self.tiles:
-            return False
-            
-        tile = self.tiles[(x, y)]
-        if tile.owner is not None:
-            return False
-            
-        # Check if adjacent to any owned tiles
-        for adj_x, adj_y in utils.get_adjacent_coords(x, y):
-            if (adj_x, adj_y) in self.tiles and self.tiles[(adj_x, adj_y)].owner == owner:
-                return True
-                
-        return False
+        # The frontier holds exactly the unowned tiles adjacent to the owner's territory
+        return (x, y) in self.get_frontier(owner)
+    
+    def register_building(self, building):
+        """Add a building instance to the registry and schedule its first update"""
+        self.active_buildings[(building.tile.x, building.tile.y)] = building
+        building.last_update_time = self.clock.now
+        self.scheduler.schedule(building, 0)
+        if building.type == 'DEPOSIT':
+            self.deposit_index.add(building)
+            self.wake_deposit_waiters(building.tile.owner)
+    
+    def unregister_building(self, tile):
+        """Remove the building on a tile from the registry and drop its scheduled events"""
+        building = self.active_buildings.pop((tile.x, tile.y), None)
+        if building:
+            self.scheduler.cancel(building)
+            if building.type == 'DEPOSIT':
+                self.deposit_index.remove(building)
+    
+    def wait_for_deposits(self, building):
+        """Let a building sleep until a deposit of its owner is built or changes storage"""
+        self.deposit_waiters.setdefault(building.tile.owner, {})[building] = True
+    
+    def wake_deposit_waiters(self, owner):
+        """Schedule every building waiting on this owner's deposits for the next step"""
+        waiters = self.deposit_waiters.get(owner)
+        if waiters:
+            for building in waiters:
+                self.scheduler.schedule(building, 0)
+            waiters.clear()
     
     def update(self, dt):
-        """Update all tiles"""
-        for tile in self.tiles.values():
-            tile.update(dt)
-    
-    def draw(self, surface, camera_offset=(0, 0)):
-        """Draw the world on the surface"""
-        for tile in self.tiles.values():
-            tile.draw(surface, camera_offset)
+        """Run the buildings whose next scheduled event is due (idle buildings cost nothing)"""
+        now = self.clock.now
+        for wake_time, building in self.scheduler.pop_due_entries(now):
+            # Skip buildings removed since they were scheduled
+            if self.active_buildings.get((building.tile.x, building.tile.y)) is not building:
+                continue
+            # A building woken while the clock is a rounding error short of its event runs
+            # up to the event, so its countdown reaches zero instead of slipping a whole step
+            update_time = max(now, wake_time)
+            elapsed = update_time - building.last_update_time
+            building.last_update_time = update_time
+            delay = building.update(elapsed)
+            # Buildings can remove themselves (e.g. depleted collectors)
+            if delay is not None and self.active_buildings.get((building.tile.x, building.tile.y)) is building:
+                self.scheduler.schedule(building, delay)
+    
+    def get_visible_tile_range(self, camera_offset, view_width, view_height, tile_size=TILE_SIZE):
+        """Return (x0, y0, x1, y1), the half-open range of tiles intersecting a view (pixels at tile_size)"""
+        x0 = max(0, int(camera_offset[0] // tile_size))
+        y0 = max(0, int(camera_offset[1] // tile_size))
+        x1 = min(self.width, int(-(-(camera_offset[0] + view_width) // tile_size)))
+        y1 = min(self.height, int(-(-(camera_offset[1] + view_height) // tile_size)))
+        return (x0, y0, max(x0, x1), max(y0, y1))
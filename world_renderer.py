@@ -0,0 +1,130 @@
+import pygame
+from config import *
+
+class TileSprites:
+    """Cache of pre-drawn tile sprites, one per tile size and look
+
+    Tiles are drawn at the camera's zoomed size directly from these sprites, so zooming
+    never has to scale a rendered frame.
+    """
+    def __init__(self):
+        self.sprites = {}  # (tile_size, border_color, resource_color, building_color) -> Surface
+
+    def get(self, tile_size, border_color, resource_color, building_color):
+        """Return the sprite for a tile look at the given size, drawing it on first use"""
+        key = (tile_size, border_color, resource_color, building_color)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self.render(tile_size, border_color, resource_color, building_color)
+            self.sprites[key] = sprite
+        return sprite
+
+    def render(self, tile_size, border_color, resource_color, building_color):
+        """Draw one tile sprite (proportions match the TILE_SIZE artwork)"""
+        scale = tile_size / TILE_SIZE
+        sprite = pygame.Surface((tile_size, tile_size))
+        rect = sprite.get_rect()
+
+        # Draw base tile
+        if border_color is None:
+            # Unowned tile
+            sprite.fill(LIGHT_GRAY)
+        else:
+            # Owned tile
+            sprite.fill(WHITE)
+            pygame.draw.rect(sprite, border_color, rect, max(1, round(2 * scale)))
+
+        # Draw resource
+        if resource_color is not None:
+            inset = round(10 * scale)
+            pygame.draw.rect(sprite, resource_color, rect.inflate(-2 * inset, -2 * inset))
+
+        # Draw building
+        if building_color is not None:
+            building_rect = pygame.Rect(
+                rect.centerx - tile_size // 4,
+                rect.centery - tile_size // 4,
+                tile_size // 2,
+                tile_size // 2
+            )
+            pygame.draw.rect(sprite, building_color, building_rect)
+        return sprite
+
+# Shared by every tile and renderer
+TILE_SPRITES = TileSprites()
+
+class WorldRenderer:
+    """Draws the world from cached chunk surfaces
+
+    Each chunk (WORLD_CHUNK_SIZE x WORLD_CHUNK_SIZE tiles) is rendered once into its own
+    surface and kept until the world marks it dirty (a tile in it changed owner, building,
+    resource or survey state). A frame is then just a handful of chunk blits.
+    Chunks are rendered at the current zoomed tile size and rebuilt when the zoom changes.
+    """
+    def __init__(self, world, chunk_size=WORLD_CHUNK_SIZE):
+        self.world = world
+        self.chunk_size = chunk_size
+        self.tile_size = TILE_SIZE  # Tile size the cached chunks were rendered at
+        self.chunks = {}  # (chunk_x, chunk_y) -> cached Surface
+
+    def invalidate_dirty_chunks(self):
+        """Drop cached chunks the world has marked dirty since the last frame"""
+        for key in self.world.dirty_chunks:
+            self.chunks.pop(key, None)
+        self.world.dirty_chunks.clear()
+
+    def render_chunk(self, chunk_x, chunk_y):
+        """Render the tiles of one chunk into a new surface"""
+        x0 = chunk_x * self.chunk_size
+        y0 = chunk_y * self.chunk_size
+        x1 = min(x0 + self.chunk_size, self.world.width)
+        y1 = min(y0 + self.chunk_size, self.world.height)
+
+        surface = pygame.Surface(((x1 - x0) * self.tile_size, (y1 - y0) * self.tile_size))
+        surface.fill(BLACK)
+        # Tiles are drawn relative to the chunk's top-left corner
+        self.draw_tiles(surface, (x0 * self.tile_size, y0 * self.tile_size), (x0, y0, x1, y1), self.tile_size)
+        return surface
+
+    def draw_tiles(self, surface, camera_offset, tile_range, tile_size):
+        """Draw each tile in tile_range from its cached sprite"""
+        x0, y0, x1, y1 = tile_range
+        tiles = self.world.tiles
+        for x in range(x0, x1):
+            for y in range(y0, y1):
+                sprite = TILE_SPRITES.get(tile_size, *tiles[(x, y)].get_sprite_key())
+                surface.blit(sprite, (int(x * tile_size - camera_offset[0]), int(y * tile_size - camera_offset[1])))
+
+    def get_chunk(self, chunk_x, chunk_y):
+        """Return the cached surface for a chunk, rendering it if needed"""
+        key = (chunk_x, chunk_y)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.render_chunk(chunk_x, chunk_y)
+            self.chunks[key] = chunk
+        return chunk
+
+    def draw(self, surface, camera_offset=(0, 0), tile_range=None, tile_size=TILE_SIZE):
+        """Blit the chunks covering the visible tiles
+
+        camera_offset is in pixels at tile_size (i.e. already multiplied by the zoom).
+        """
+        self.invalidate_dirty_chunks()
+        if tile_size != self.tile_size:
+            # Zoom changed: cached chunks are the wrong size
+            self.chunks.clear()
+            self.tile_size = tile_size
+
+        offset_x, offset_y = int(camera_offset[0]), int(camera_offset[1])
+        if tile_range is None:
+            tile_range = self.world.get_visible_tile_range(camera_offset, surface.get_width(), surface.get_height(), tile_size)
+        x0, y0, x1, y1 = tile_range
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        # Only chunks containing visible tiles are blitted (or rendered, if not cached yet)
+        chunk_pixels = self.chunk_size * tile_size
+        for chunk_x in range(x0 // self.chunk_size, (x1 - 1) // self.chunk_size + 1):
+            for chunk_y in range(y0 // self.chunk_size, (y1 - 1) // self.chunk_size + 1):
+                surface.blit(self.get_chunk(chunk_x, chunk_y),
+                             (chunk_x * chunk_pixels - offset_x, chunk_y * chunk_pixels - offset_y))